@@ -0,0 +1,184 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Find and summarise the Charmhub libraries that a charm provides.
+
+A charm's own libraries are in ``lib/charms/<charm_name>/v<API>/``, where the
+charm name has underscores rather than dashes. Each library module is parsed
+(but not imported) to find its docstring, and the ``LIBID``, ``LIBAPI``,
+and ``LIBPATCH`` values that Charmcraft needs to publish it.
+
+The summary of each module is stored in the result cache (see
+`result_cache`), keyed by the hash of the module's content, so unchanged
+libraries aren't parsed again.
+"""
+
+import ast
+import dataclasses
+import json
+import pathlib
+import re
+from typing import Any
+
+from . import file_index, result_cache
+
+# Bump this whenever `parse_lib` changes, so that cached summaries from the
+# previous implementation aren't reused.
+PARSER_VERSION = 3
+
+_API_DIR_RE = re.compile(r'v\d+')
+_LIB_FIELDS = ('LIBID', 'LIBAPI', 'LIBPATCH')
+# The parts of the ops API that only a library dealing with relations needs.
+# Classes can be used by name or as attributes (``ops.RelationChangedEvent``),
+# but the other names only count as attributes (``self.model.relations``), so
+# that a local variable called ``relations`` doesn't make a library look like
+# an interface library.
+_RELATION_CLASSES = frozenset({
+    'Relation',
+    'RelationBrokenEvent',
+    'RelationChangedEvent',
+    'RelationCreatedEvent',
+    'RelationData',
+    'RelationDataContent',
+    'RelationDepartedEvent',
+    'RelationEvent',
+    'RelationJoinedEvent',
+    'RelationMeta',
+})
+_RELATION_ATTRIBUTES = frozenset({'get_relation', 'relations'})
+# Relation events, either ``charm.on[name].relation_changed`` or
+# ``charm.on.db_relation_changed``.
+_RELATION_EVENT_RE = re.compile(r'(\w+_)?relation_(created|joined|changed|departed|broken)')
+
+
+@dataclasses.dataclass(frozen=True)
+class CharmLib:
+    """A summary of a Charmhub library module."""
+
+    path: str  # Relative to the charm directory.
+    docstring: str = ''
+    libid: str | None = None
+    libapi: int | None = None
+    libpatch: int | None = None
+    # Whether the library deals with relations, which means it is (very
+    # likely) an interface library rather than a general one.
+    uses_relations: bool = False
+    error: str = ''  # Why the module couldn't be parsed, if it couldn't.
+
+    @property
+    def name(self) -> str:
+        """The name of the library, as used in ``charmcraft fetch-lib``."""
+        return pathlib.PurePosixPath(self.path).stem
+
+    def publishing_problems(self) -> list[str]:
+        """Why Charmcraft would refuse to publish the library, if it would."""
+        problems = []
+        if not self.libid:
+            problems.append('`LIBID` is missing, or is not a string.')
+        api_dir = pathlib.PurePosixPath(self.path).parent.name
+        if self.libapi is None or self.libapi < 0:
+            problems.append('`LIBAPI` is missing, or is not a non-negative integer.')
+        elif _API_DIR_RE.fullmatch(api_dir) and api_dir != f'v{self.libapi}':
+            problems.append(f'`LIBAPI` is {self.libapi}, but the library is in `{api_dir}`.')
+        if self.libpatch is None or self.libpatch < 0:
+            problems.append('`LIBPATCH` is missing, or is not a non-negative integer.')
+        return problems
+
+
+def _uses_relation_api(node: ast.AST) -> bool:
+    if isinstance(node, ast.Name):
+        return node.id in _RELATION_CLASSES
+    if isinstance(node, ast.alias):
+        return node.name.rsplit('.', 1)[-1] in _RELATION_CLASSES
+    if isinstance(node, ast.Attribute):
+        return (
+            node.attr in _RELATION_CLASSES
+            or node.attr in _RELATION_ATTRIBUTES
+            or bool(_RELATION_EVENT_RE.fullmatch(node.attr))
+        )
+    return False
+
+
+def parse_lib(source: bytes, path: str) -> CharmLib:
+    """Summarise the library module with the given source."""
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError) as e:
+        return CharmLib(path, error=str(e))
+    values: dict[str, Any] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+        for target in targets:
+            if isinstance(target, ast.Name) and target.id in _LIB_FIELDS:
+                try:
+                    values[target.id] = ast.literal_eval(value)
+                except (ValueError, TypeError, SyntaxError):
+                    pass
+    uses_relations = any(_uses_relation_api(node) for node in ast.walk(tree))
+    return CharmLib(
+        path,
+        docstring=ast.get_docstring(tree) or '',
+        libid=values['LIBID'] if isinstance(values.get('LIBID'), str) else None,
+        libapi=values['LIBAPI'] if isinstance(values.get('LIBAPI'), int) else None,
+        libpatch=values['LIBPATCH'] if isinstance(values.get('LIBPATCH'), int) else None,
+        uses_relations=uses_relations,
+    )
+
+
+def _summarise(
+    files: file_index.FileIndex, charm_dir: pathlib.Path, module: pathlib.Path
+) -> CharmLib:
+    path = module.relative_to(charm_dir).as_posix()
+
+    def compute() -> str:
+        summary = dataclasses.asdict(parse_lib(module.read_bytes(), path))
+        del summary['path']
+        return json.dumps(summary)
+
+    # The key only includes the module's file name and content, so the same
+    # library vendored in several charms is only parsed once.
+    cached = result_cache.cache().run(
+        'charm_lib', PARSER_VERSION, module.parent, [module.name], compute, file_hash=files.hash
+    )
+    return CharmLib(path, **json.loads(cached))
+
+
+def _modules(
+    files: file_index.FileIndex, charm_dir: pathlib.Path, charm_name: str
+) -> list[pathlib.Path]:
+    lib_dir = charm_dir / 'lib' / 'charms' / charm_name.replace('-', '_')
+    return [
+        lib_dir / api_dir / name
+        for api_dir in files.listdir(lib_dir)
+        if _API_DIR_RE.fullmatch(api_dir)
+        for name in files.listdir(lib_dir / api_dir)
+        if name.endswith('.py')
+        and name != '__init__.py'
+        and files.is_file(lib_dir / api_dir / name)
+    ]
+
+
+def index_libs(charm_dir: pathlib.Path, charm_name: str) -> list[CharmLib]:
+    """Summarise each of the libraries that the charm provides, sorted by path."""
+    files = file_index.lookup(charm_dir)
+    # Parsing is pure Python, so threads wouldn't help, and charms only have a
+    # handful of libraries, so it isn't worth starting processes either.
+    return [
+        _summarise(files, charm_dir, module) for module in _modules(files, charm_dir, charm_name)
+    ]
@@ -0,0 +1,170 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A merged view of a charm's metadata, wherever it is defined.
+
+Current charms define everything in ``charmcraft.yaml``, but older charms keep
+their metadata in ``metadata.yaml``, their actions in ``actions.yaml``, and
+their config options in ``config.yaml``. `CharmMetadata` presents all of
+these as a single mapping with the ``charmcraft.yaml`` keys: each key is
+taken from ``charmcraft.yaml`` if it is defined there, and otherwise from
+the file (and key) that older charms used for it (see `LEGACY_KEYS`). The
+view records where each value came from, so the report can say so.
+
+Each file is only loaded when a key that might be in it is first asked for,
+and at most once. Views are shared (see `view`) for as long as the content of
+the files is unchanged, so the checks of a charm load each file only once
+between them.
+"""
+
+import functools
+import pathlib
+import threading
+from typing import Any
+
+import yaml
+
+from . import file_index, yaml_loader
+
+CHARMCRAFT_FILE = 'charmcraft.yaml'
+METADATA_FILES = (CHARMCRAFT_FILE, 'metadata.yaml', 'actions.yaml', 'config.yaml')
+
+# The file and key that older charms use for each charmcraft.yaml key. A key
+# of None means that the whole file is the value.
+LEGACY_KEYS: dict[str, tuple[str, str | None]] = {
+    'name': ('metadata.yaml', 'name'),
+    'title': ('metadata.yaml', 'display-name'),
+    'summary': ('metadata.yaml', 'summary'),
+    'description': ('metadata.yaml', 'description'),
+    'assumes': ('metadata.yaml', 'assumes'),
+    'containers': ('metadata.yaml', 'containers'),
+    'resources': ('metadata.yaml', 'resources'),
+    'storage': ('metadata.yaml', 'storage'),
+    'subordinate': ('metadata.yaml', 'subordinate'),
+    'requires': ('metadata.yaml', 'requires'),
+    'provides': ('metadata.yaml', 'provides'),
+    'peers': ('metadata.yaml', 'peers'),
+    'actions': ('actions.yaml', None),
+    'config': ('config.yaml', None),
+}
+# metadata.yaml has the links as top-level keys, with different names.
+LEGACY_LINKS = {
+    'documentation': 'docs',
+    'issues': 'issues',
+    'source': 'source',
+    'website': 'website',
+    'contact': 'maintainers',
+}
+
+
+class CharmMetadata:
+    """The metadata of the charm in ``charm_dir``, merged from all of its files."""
+
+    def __init__(self, charm_dir: pathlib.Path):
+        self.charm_dir = charm_dir
+        self._documents: dict[str, dict[Any, Any] | None] = {}
+        self._lock = threading.Lock()
+
+    def document(self, name: str) -> dict[Any, Any] | None:
+        """The content of one of the `METADATA_FILES`.
+
+        This is ``None`` if the file doesn't exist or isn't a valid YAML
+        mapping.
+        """
+        with self._lock:
+            if name not in self._documents:
+                self._documents[name] = self._load(name)
+            return self._documents[name]
+
+    def _load(self, name: str) -> dict[Any, Any] | None:
+        path = self.charm_dir / name
+        if not file_index.lookup(self.charm_dir).is_file(path):
+            return None
+        try:
+            data = yaml_loader.load_file(path)
+        except (yaml.YAMLError, OSError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _resolve(self, key: str) -> tuple[Any, str | None]:
+        charmcraft = self.document(CHARMCRAFT_FILE)
+        if charmcraft is not None and key in charmcraft:
+            return charmcraft[key], CHARMCRAFT_FILE
+        if key == 'links':
+            metadata = self.document('metadata.yaml')
+            if metadata is None:
+                return None, None
+            links = {
+                link: metadata[legacy]
+                for link, legacy in LEGACY_LINKS.items()
+                if legacy in metadata
+            }
+            return (links, 'metadata.yaml') if links else (None, None)
+        if key not in LEGACY_KEYS:
+            return None, None
+        name, legacy_key = LEGACY_KEYS[key]
+        document = self.document(name)
+        if document is None:
+            return None, None
+        if legacy_key is None:
+            return document, name
+        if legacy_key in document:
+            return document[legacy_key], name
+        return None, None
+
+    def __contains__(self, key: str) -> bool:
+        return self._resolve(key)[1] is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """The value of the charmcraft.yaml ``key``, from whichever file defines it."""
+        value, source = self._resolve(key)
+        return default if source is None else value
+
+    def source(self, key: str) -> str | None:
+        """The file that ``key`` comes from, or ``None`` if it isn't defined."""
+        return self._resolve(key)[1]
+
+    def describe_source(self, key: str) -> str | None:
+        """Where ``key`` comes from, for the report, if it isn't from charmcraft.yaml.
+
+        For example, "`title` is the `display-name` in metadata.yaml".
+        """
+        source = self.source(key)
+        if source is None or source == CHARMCRAFT_FILE:
+            return None
+        if key == 'links':
+            return '`links` are from the top-level `docs`, `issues`, and so on in metadata.yaml'
+        legacy_key = LEGACY_KEYS[key][1]
+        if legacy_key is None:
+            return f'`{key}` is from {source}'
+        if legacy_key != key:
+            return f'`{key}` is the `{legacy_key}` in {source}'
+        return f'`{key}` is from {source}'
+
+
+@functools.lru_cache(maxsize=64)
+def _view(charm_dir: pathlib.Path, hashes: tuple[str | None, ...]) -> CharmMetadata:
+    # The hashes are only part of the cache key, so that a changed file gets
+    # a new view.
+    return CharmMetadata(charm_dir)
+
+
+def view(charm_dir: pathlib.Path) -> CharmMetadata:
+    """The merged metadata of the charm in ``charm_dir``.
+
+    The same view is returned while the content of the files is unchanged.
+    """
+    files = file_index.lookup(charm_dir)
+    hashes = tuple(files.hash(charm_dir / name) for name in METADATA_FILES)
+    return _view(charm_dir.resolve(), hashes)
@@ -0,0 +1,317 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Find the broken links in a charm's README, contributing guide, and docs.
+
+The documents are the ``README`` and ``CONTRIBUTING`` files (in Markdown or
+reStructuredText) and everything in Markdown or reStructuredText under the
+``docs`` directory. Each document is read line by line, and the links are
+extracted as the lines go by, so that even a large documentation tree is
+never held in memory:
+
+* Markdown: inline links and images (``[text](url)``), reference definitions
+  (``[name]: url``), autolinks (``<url>``), and bare URLs, other than those in
+  code spans and fenced code blocks.
+* reStructuredText: embedded links (```text <url>`_``), hyperlink targets
+  (``.. _name: url``), and bare URLs, other than those in inline literals and
+  literal blocks.
+
+Links to other documents in the repository are checked against the file
+index. Only links to Markdown and reStructuredText files are checked, since
+those are the only files that are always available (see
+``evaluate._fetch_archive``). External links are checked with the shared
+`links.checker`, which checks them concurrently, with a limit on the requests
+to each host at once. To keep the time bounded on huge documentation trees,
+at most `max_links_per_host` different URLs are checked for each host; the
+rest are counted, so the report can say they weren't checked.
+
+Links that resolve are stored in the result cache (see `result_cache`) for
+`CACHE_TTL` seconds, so reviewing the charm again (or another charm that
+links to the same pages) doesn't request them again. Broken links aren't
+stored, so a fixed link is noticed straight away.
+"""
+
+import collections
+import dataclasses
+import hashlib
+import json
+import os
+import pathlib
+import posixpath
+import re
+import time
+import urllib.parse
+from collections.abc import Iterable, Iterator, Sequence
+
+from . import file_index, links, result_cache
+
+# Bump this whenever the way links are checked changes, so that cached
+# results from the previous implementation aren't reused.
+CACHE_VERSION = 1
+CACHE_TTL = 24 * 60 * 60
+DOC_STEMS = ('README', 'CONTRIBUTING')
+DOC_SUFFIXES = ('.md', '.markdown', '.rst')
+DOCS_DIR = 'docs'
+MAX_LINKS_PER_HOST = 20
+MAX_LINKS_PER_HOST_ENV = 'CHARMHUB_LISTING_REVIEW_MAX_LINKS_PER_HOST'
+
+_MD_CODE_SPAN_RE = re.compile(r'(`+).+?\1')
+_MD_FENCE_RE = re.compile(r'^\s{0,3}(`{3,}|~{3,})')
+_MD_INLINE_RE = re.compile(r'\]\(\s*<?([^()\s<>]+(?:\([^()\s]*\)[^()\s<>]*)*)>?')
+_MD_REFERENCE_RE = re.compile(r'^\s{0,3}\[[^\]]+\]:\s*<?([^\s>]+)>?')
+_MD_AUTOLINK_RE = re.compile(r'<([A-Za-z][A-Za-z0-9+.-]*:[^<>\s]+)>')
+_RST_LITERAL_RE = re.compile(r'``.+?``')
+_RST_EMBEDDED_RE = re.compile(r'`[^`]*<([^`<>]+)>`__?')
+_RST_TARGET_RE = re.compile(r'^\s*\.\.\s+_[^:]+:\s+(\S+)')
+_RST_CODE_DIRECTIVE_RE = re.compile(r'^\s*\.\.\s+(?:code|code-block|sourcecode)::')
+_BARE_URL_RE = re.compile(r'https?://[^\s<>()\[\]"\'`]+')
+_SCHEME_RE = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*:')
+
+
+@dataclasses.dataclass(frozen=True)
+class DocLink:
+    """A link in one of the documents."""
+
+    path: str  # The document, relative to the root of the repository.
+    line: int
+    target: str
+
+
+@dataclasses.dataclass(frozen=True)
+class BrokenLink:
+    """A link that doesn't resolve, and why."""
+
+    link: DocLink
+    reason: str
+
+    def describe(self) -> str:
+        """A short description of the problem, for the report."""
+        return f'{self.link.path}:{self.link.line}: {self.link.target} ({self.reason})'
+
+
+@dataclasses.dataclass(frozen=True)
+class LinkReport:
+    """The result of checking the links in the documents."""
+
+    documents: int
+    checked: int  # The number of different links that were checked.
+    broken: list[BrokenLink]
+    # The number of different URLs that weren't checked, by host.
+    skipped: dict[str, int]
+
+
+def is_doc_path(relative: pathlib.PurePath) -> bool:
+    """Whether the path (relative to the repository or charm) is a document to check."""
+    if relative.suffix.lower() not in DOC_SUFFIXES:
+        return False
+    parts = relative.parts
+    if len(parts) == 1 or (len(parts) == 2 and parts[0] == '.github'):
+        return relative.name.split('.', 1)[0].upper() in DOC_STEMS
+    return parts[0] == DOCS_DIR
+
+
+def documents(search_dirs: Sequence[pathlib.Path]) -> list[pathlib.Path]:
+    """The documents in each of ``search_dirs`` whose links should be checked."""
+    found: dict[pathlib.Path, None] = {}
+    for directory in search_dirs:
+        files = file_index.lookup(directory)
+        candidates = [directory / name for name in files.listdir(directory)]
+        candidates.extend(
+            directory / '.github' / name for name in files.listdir(directory / '.github')
+        )
+        candidates.extend(sorted(files.files(directory / DOCS_DIR)))
+        for path in candidates:
+            if files.is_file(path) and is_doc_path(path.relative_to(directory)):
+                found.setdefault(path.resolve(), None)
+    return list(found)
+
+
+def _markdown_targets(line: str) -> list[str]:
+    line = _MD_CODE_SPAN_RE.sub(lambda m: ' ' * len(m.group()), line)
+    targets = []
+    for pattern in (_MD_REFERENCE_RE, _MD_INLINE_RE, _MD_AUTOLINK_RE):
+        targets.extend(match.group(1) for match in pattern.finditer(line))
+        # Blank out what was found, so the bare URLs don't find it again
+        # (or a truncated copy of it).
+        line = pattern.sub(lambda m: ' ' * len(m.group()), line)
+    targets.extend(match.group().rstrip('.,;:!?*_') for match in _BARE_URL_RE.finditer(line))
+    return targets
+
+
+def _rst_targets(line: str) -> list[str]:
+    line = _RST_LITERAL_RE.sub(lambda m: ' ' * len(m.group()), line)
+    targets = []
+    for pattern in (_RST_TARGET_RE, _RST_EMBEDDED_RE):
+        for match in pattern.finditer(line):
+            target = match.group(1).strip()
+            # A target ending in '_' refers to another target, not a URL.
+            if not target.endswith('_'):
+                targets.append(target)
+        line = pattern.sub(lambda m: ' ' * len(m.group()), line)
+    targets.extend(match.group().rstrip('.,;:!?*_') for match in _BARE_URL_RE.finditer(line))
+    return targets
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip())
+
+
+def extract(path: str, lines: Iterable[str]) -> Iterator[DocLink]:
+    """Yield the links in a document as its lines are read.
+
+    ``path`` is used for the results, and to decide whether the document is
+    Markdown or reStructuredText (by its suffix).
+    """
+    rst = path.lower().endswith('.rst')
+    fence: str | None = None
+    # The indentation of the line that started a reStructuredText literal block.
+    literal_indent: int | None = None
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if rst:
+            if literal_indent is not None:
+                if not line.strip() or _indent(line) > literal_indent:
+                    continue
+                literal_indent = None
+            stripped = line.rstrip()
+            directive = stripped.lstrip().startswith('.. ')
+            if _RST_CODE_DIRECTIVE_RE.match(line) or (stripped.endswith('::') and not directive):
+                literal_indent = _indent(line)
+            targets = _rst_targets(line)
+        else:
+            if match := _MD_FENCE_RE.match(line):
+                marker = match.group(1)
+                if fence is None:
+                    fence = marker
+                elif marker[0] == fence[0] and len(marker) >= len(fence):
+                    fence = None
+                continue
+            if fence is not None:
+                continue
+            targets = _markdown_targets(line)
+        for target in dict.fromkeys(targets):
+            yield DocLink(path, number, target)
+
+
+def iter_links(paths: Iterable[pathlib.Path], root: pathlib.Path) -> Iterator[DocLink]:
+    """Yield the links in each of the documents, one document at a time."""
+    for path in paths:
+        try:
+            with path.open(encoding='utf-8', errors='replace') as f:
+                yield from extract(path.relative_to(root).as_posix(), f)
+        except OSError:
+            continue
+
+
+def max_links_per_host() -> int:
+    """The most different URLs on a single host that will be checked.
+
+    This is `MAX_LINKS_PER_HOST`, unless the environment variable is set to a
+    positive number.
+    """
+    try:
+        value = int(os.environ.get(MAX_LINKS_PER_HOST_ENV, ''))
+    except ValueError:
+        return MAX_LINKS_PER_HOST
+    return value if value > 0 else MAX_LINKS_PER_HOST
+
+
+def _local_target(link: DocLink, files: file_index.FileIndex) -> pathlib.Path | None:
+    """The file a relative link points at, if it is a document that should be checked."""
+    target = urllib.parse.unquote(link.target.split('#', 1)[0].split('?', 1)[0])
+    if not target or pathlib.PurePosixPath(target).suffix.lower() not in DOC_SUFFIXES:
+        return None
+    # GitHub resolves absolute paths from the root of the repository.
+    base = '' if target.startswith('/') else posixpath.dirname(link.path)
+    relative = posixpath.normpath(posixpath.join(base, target.lstrip('/')))
+    if relative == '..' or relative.startswith('../'):
+        return None
+    return files.root / relative
+
+
+def _cache_key(url: str) -> str:
+    material = json.dumps(['doc_link', CACHE_VERSION, url])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def check_urls(urls: Iterable[str]) -> dict[str, links.LinkStatus]:
+    """Check the URLs, using the cached result of those that resolved recently."""
+    cache = result_cache.cache()
+    results = {}
+    unchecked = []
+    now = time.time()
+    for url in dict.fromkeys(urls):
+        entry = cache.get(_cache_key(url))
+        if entry is not None and now - entry.get('created', 0) < CACHE_TTL:
+            results[url] = links.LinkStatus(**json.loads(entry['result']))
+        else:
+            unchecked.append(url)
+    for url, status in links.checker().check_all(unchecked).items():
+        results[url] = status
+        if status.ok:
+            cache.put(
+                _cache_key(url),
+                'doc_link',
+                CACHE_VERSION,
+                {},
+                json.dumps(dataclasses.asdict(status)),
+            )
+    return results
+
+
+def review(search_dirs: Sequence[pathlib.Path], max_per_host: int | None = None) -> LinkReport:
+    """Check the links in the documents in ``search_dirs``.
+
+    At most ``max_per_host`` (by default, `max_links_per_host`) different URLs
+    are checked on each host.
+    """
+    max_per_host = max_links_per_host() if max_per_host is None else max_per_host
+    paths = documents(search_dirs)
+    if not paths:
+        return LinkReport(0, 0, [], {})
+    # Documents are named relative to a directory that holds all of them, even
+    # when one search directory is inside another.
+    files = file_index.lookup(os.path.commonpath([path.resolve() for path in search_dirs]))
+    broken = []
+    external: dict[str, list[DocLink]] = {}
+    per_host: collections.Counter[str] = collections.Counter()
+    skipped: dict[str, set[str]] = {}
+    local_checked = set()
+    for link in iter_links(paths, files.root):
+        if links.is_url(link.target):
+            if link.target not in external:
+                host = urllib.parse.urlsplit(link.target).netloc.lower()
+                if per_host[host] >= max_per_host:
+                    skipped.setdefault(host, set()).add(link.target)
+                    continue
+                per_host[host] += 1
+            external.setdefault(link.target, []).append(link)
+        elif not link.target.startswith('#') and not _SCHEME_RE.match(link.target):
+            target = _local_target(link, files)
+            if target is None:
+                continue
+            local_checked.add(target)
+            if not files.is_file(target):
+                broken.append(BrokenLink(link, 'no such file in the repository'))
+    statuses = check_urls(external)
+    for url, found in external.items():
+        if not statuses[url].ok:
+            broken.extend(BrokenLink(link, statuses[url].describe()) for link in found)
+    broken.sort(key=lambda problem: (problem.link.path, problem.link.line))
+    return LinkReport(
+        len(paths),
+        len(external) + len(local_checked),
+        broken,
+        {host: len(urls) for host, urls in skipped.items()},
+    )
@@ -23,43 +23,113 @@ for the reviewer, and is also a way for charm publishers to check their charm
 against the listing requirements before submitting a listing request.
 """
 
+import concurrent.futures
 import fnmatch
 import hashlib
 import math
+import os
 import pathlib
 import re
 import shutil
 import subprocess  # noqa: S404
-import tempfile
+import tarfile
+import threading
+import time
 import tomllib
 import urllib.error
 import urllib.request
-import xml.etree.ElementTree as ET  # noqa: S405
+from collections.abc import Callable, Sequence
 from typing import Any
 
-import yaml
-
-
-def _url_ok(url: str, *, method: str = 'HEAD', timeout: int = 5) -> bool:
-    """Whether ``url`` resolves with a successful (non-error) status."""
+from . import (
+    charm_libs,
+    charm_metadata,
+    doc_links,
+    file_index,
+    icons,
+    licenses,
+    links,
+    lock_files,
+    result_cache,
+    tooling,
+    workspace,
+)
+
+
+def _url_ok(url: str) -> bool:
+    """Whether ``url`` resolves with a successful (non-error) status (see `links`)."""
+    return links.checker().check(url).ok
+
+
+# Documents fetched over HTTP are read in chunks, and abandoned if they are
+# larger than this, or aren't text, so that a URL that points at something
+# unexpected (a large binary, or an endless stream) can't exhaust memory.
+FETCH_CHUNK_BYTES = 64 * 1024
+MAX_FETCH_BYTES = 1024 * 1024
+TEXT_CONTENT_TYPES = ('text/', 'application/json', 'application/xml', 'application/xhtml+xml')
+
+
+def _stream_url(
+    url: str,
+    consume: Callable[[bytes], bool],
+    *,
+    timeout: int = 5,
+    max_bytes: int = MAX_FETCH_BYTES,
+    content_types: Sequence[str] = TEXT_CONTENT_TYPES,
+) -> bool:
+    """Stream the body of ``url`` to ``consume``, a chunk at a time.
+
+    ``consume`` returns true once it has all it needs, which stops the
+    download early. The download is abandoned (and this returns false) if the
+    request fails, the status is an error, the content type doesn't start
+    with one of ``content_types`` (a missing content type is allowed), or the
+    body is larger than ``max_bytes``. Otherwise, this returns true.
+    """
     try:
-        request = urllib.request.Request(url, method=method)  # noqa: S310
+        request = urllib.request.Request(url, method='GET')  # noqa: S310
         with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
-            return response.status < 400
+            if response.status >= 400:
+                return False
+            content_type = response.headers.get_content_type()
+            if response.headers.get('Content-Type') and not content_type.startswith(
+                tuple(content_types)
+            ):
+                return False
+            length = response.headers.get('Content-Length')
+            if length and length.isdigit() and int(length) > max_bytes:
+                return False
+            received = 0
+            while chunk := response.read(min(FETCH_CHUNK_BYTES, max_bytes + 1 - received)):
+                received += len(chunk)
+                if received > max_bytes:
+                    return False
+                if consume(chunk):
+                    break
+            return True
     except (urllib.error.URLError, OSError, ValueError):
         return False
 
 
-def _fetch_url(url: str, *, timeout: int = 5) -> str | None:
-    """Fetch ``url`` as text, or return ``None`` on any error or non-2xx/3xx status."""
-    try:
-        request = urllib.request.Request(url, method='GET')  # noqa: S310
-        with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
-            if response.status >= 400:
-                return None
-            return response.read().decode('utf-8', errors='replace')
-    except (urllib.error.URLError, OSError, ValueError):
+def _fetch_url(url: str, *, timeout: int = 5, max_bytes: int = MAX_FETCH_BYTES) -> str | None:
+    """Fetch ``url`` as text, or return ``None`` on any error or non-2xx/3xx status.
+
+    ``None`` is also returned if the body isn't text, or is larger than
+    ``max_bytes`` (see `_stream_url`).
+    """
+    chunks: list[bytes] = []
+    binary = False
+
+    def consume(chunk: bytes) -> bool:
+        nonlocal binary
+        # Text doesn't contain NUL bytes, so there is no point reading more
+        # of something that does.
+        binary = b'\0' in chunk
+        chunks.append(chunk)
+        return binary
+
+    if not _stream_url(url, consume, timeout=timeout, max_bytes=max_bytes) or binary:
         return None
+    return b''.join(chunks).decode('utf-8', errors='replace')
 
 
 def evaluate(
@@ -71,6 +141,8 @@ def evaluate(
     security_url: str,
     branch: str = '',
     charm_dir: str = '.',
+    commit: str = '',
+    run_tooling: bool = True,
 ) -> list[str]:
     """Evaluate the charm for listing on Charmhub.
 
@@ -88,39 +160,415 @@ def evaluate(
     The ``charm_dir`` parameter allows specifying a relative path to the charm
     directory within the repository, defaulting to '.' (repository root). This
     is useful for monorepos where charms live in subdirectories.
+
+    The ``commit`` parameter pins the evaluation to a specific commit SHA. If
+    it is not provided, the tip of ``branch`` (or the default branch) is
+    resolved to a commit before fetching, so that the evaluation is of a
+    single, reproducible commit. Callers that want to report which commit was
+    evaluated should resolve it themselves, with `resolve_commit` (the result
+    is shared, so the remote is not contacted again).
+
+    If ``run_tooling`` is false, the charm's format, lint and unit test
+    commands are not run, only checked for. This means that the repository
+    doesn't need to be cloned: for GitHub repositories, only the files that the
+    checks read are downloaded.
     """
-    results: list[str] = []
+    _check_charm_dir(charm_dir)
+    if not commit:
+        remote = remote_repository(repository_url)
+        remote.check()
+        commit = remote.commit(branch) or ''
+    repo_dir = _fetch_source(repository_url, branch, commit, [charm_dir], run_tooling)
+    try:
+        return _evaluate_tree(
+            repo_dir,
+            charm_name,
+            repository_url,
+            linting_url,
+            contribution_url,
+            license_url,
+            security_url,
+            charm_dir=charm_dir,
+            run_tooling=run_tooling,
+        )
+    finally:
+        # Deleting a large clone can take a while, so it's done in the background.
+        workspace.manager().release(repo_dir)
+
+
+def evaluate_path(
+    charm_name: str,
+    path: pathlib.Path | str,
+    repository_url: str = '',
+    linting_url: str = '',
+    contribution_url: str = '',
+    license_url: str = '',
+    security_url: str = '',
+    charm_dir: str = '.',
+    run_tooling: bool = True,
+) -> list[str]:
+    """Evaluate a charm in a local directory, such as a working tree.
+
+    This is the same as `evaluate`, except that the checks run directly
+    against ``path``, including any uncommitted changes, rather than a fresh
+    clone of the repository. Nothing in ``path`` is modified or removed.
+
+    ``repository_url`` is only used for checking the name of the repository;
+    `local_repository` can find it from the git metadata in ``path``.
+    """
+    _check_charm_dir(charm_dir)
+    return _evaluate_tree(
+        pathlib.Path(path),
+        charm_name,
+        repository_url,
+        linting_url,
+        contribution_url,
+        license_url,
+        security_url,
+        charm_dir=charm_dir,
+        run_tooling=run_tooling,
+    )
+
+
+def _check_charm_dir(charm_dir: str):
     charm_dir_path = pathlib.PurePosixPath(charm_dir)
     if charm_dir_path.is_absolute() or '..' in charm_dir_path.parts:
         raise ValueError(
             f"charm_dir must be a relative path without '..' components, got: {charm_dir!r}"
         )
-    repo_dir = _clone_repo(repository_url, branch)
+
+
+def _evaluate_tree(
+    repo_dir: pathlib.Path,
+    charm_name: str,
+    repository_url: str,
+    linting_url: str,
+    contribution_url: str,
+    license_url: str,
+    security_url: str,
+    charm_dir: str = '.',
+    run_tooling: bool = True,
+) -> list[str]:
+    """Run all of the checks against the repository in ``repo_dir``."""
+    charm_path = _charm_path(repo_dir, charm_dir)
+    # The checks look files up in an index, rather than each going to disk.
+    with file_index.indexed(repo_dir):
+        results = _repository_checks(
+            linting_url,
+            contribution_url,
+            license_url,
+            security_url,
+            repository_url,
+            [repo_dir, charm_path],
+        )
+        results.extend(_charm_checks(charm_path, charm_name, repository_url, run_tooling))
+    return results
+
+
+def _charm_path(repo_dir: pathlib.Path, charm_dir: str) -> pathlib.Path:
+    charm_path = (repo_dir / charm_dir).resolve()
+    if not charm_path.is_dir():
+        raise ValueError(f'charm_dir does not exist or is not a directory: {charm_dir!r}')
+    if not charm_path.is_relative_to(repo_dir.resolve()):
+        raise ValueError(f'charm_dir resolves outside the repository: {charm_dir!r}')
+    return charm_path
+
+
+def _repository_checks(
+    linting_url: str,
+    contribution_url: str,
+    license_url: str,
+    security_url: str,
+    repository_url: str = '',
+    search_dirs: Sequence[pathlib.Path] = (),
+) -> list[str]:
+    """The checks that apply to the repository as a whole.
+
+    The contribution guidelines, license, and security policy are looked for
+    in ``search_dirs`` first (see `find_document`). The URLs are only fetched
+    if the document isn't found locally, and the URL is not in the repository
+    itself (in which case the local copy is the same document). The links in
+    the documentation in ``search_dirs`` are also checked.
+    """
+    documents = []
+    for url, stems in (
+        (contribution_url, CONTRIBUTING_NAMES),
+        (license_url, LICENSE_NAMES),
+        (security_url, SECURITY_NAMES),
+    ):
+        local_path = find_document(search_dirs, stems)
+        if local_path is not None or (search_dirs and _in_repository(url, repository_url)):
+            url = ''
+        documents.append((url, local_path))
+    return [
+        coding_conventions(linting_url),
+        contribution_guidelines(*documents[0]),
+        license_statement(*documents[1]),
+        security_doc(*documents[2]),
+        documentation_links(search_dirs),
+    ]
+
+
+# The names (ignoring case and extension) of the documents that are looked for
+# in the repository, and the places they are looked for, following GitHub's
+# conventions for community health files.
+CONTRIBUTING_NAMES = ('CONTRIBUTING', 'CONTRIBUTE')
+LICENSE_NAMES = ('LICENSE', 'LICENCE', 'COPYING')
+SECURITY_NAMES = ('SECURITY',)
+DOCUMENT_EXTENSIONS = ('', '.md', '.markdown', '.rst', '.txt')
+DOCUMENT_SUBDIRS = ('', '.github', 'docs')
+
+
+def documentation_links(search_dirs: Sequence[pathlib.Path]) -> str:
+    """The links in the README, contributing guide, and docs resolve.
+
+    Broken links make the documentation harder to use, and suggest that it
+    isn't maintained. The documents in ``search_dirs`` are read once, and
+    every link is checked (see `doc_links`), with each broken link reported
+    with the file and line it is on. There is a limit on how many links to
+    each host are checked, which can be set with the
+    ``CHARMHUB_LISTING_REVIEW_MAX_LINKS_PER_HOST`` environment variable.
+    """
+    report = doc_links.review(search_dirs)
+    # An empty result means that there is no documentation to check, so no
+    # items are included.
+    if not report.documents or not (report.checked or report.skipped):
+        return ''
+    lines = [
+        'The links in the README, contributing guide, and `docs` directory were checked:',
+    ]
+    if report.broken:
+        lines.append('* [ ] These links are broken:')
+        lines.extend(f'  * {problem.describe()}' for problem in report.broken)
+    else:
+        lines.append(f'* [x] All {report.checked} of the checked links resolve.')
+    for host, count in sorted(report.skipped.items()):
+        lines.append(
+            f'  * Only the first {doc_links.max_links_per_host()} links to {host} were checked '
+            f'(skipped {count} more).'
+        )
+    return '\n'.join(lines)
+
+
+def _is_document_name(name: str, stems: Sequence[str]) -> bool:
+    stem, dot, extension = name.partition('.')
+    return stem.upper() in stems and (dot + extension).lower() in DOCUMENT_EXTENSIONS
+
+
+def find_document(
+    directories: Sequence[pathlib.Path], stems: Sequence[str]
+) -> pathlib.Path | None:
+    """Find a document such as the license in a local copy of the repository.
+
+    Each of ``directories`` (for example, the repository root and the charm
+    directory) is searched in order, along with their ``.github`` and ``docs``
+    subdirectories, for a file whose name is one of ``stems`` (in any case)
+    with one of the `DOCUMENT_EXTENSIONS`.
+    """
+    for directory in directories:
+        files = file_index.lookup(directory)
+        for subdir in DOCUMENT_SUBDIRS:
+            for name in files.listdir(directory / subdir):
+                path = directory / subdir / name
+                if _is_document_name(name, stems) and files.is_file(path):
+                    return path
+    return None
+
+
+def _in_repository(url: str, repository_url: str) -> bool:
+    """Whether ``url`` is a page of the repository itself (such as a blob URL)."""
+    if not url or not repository_url:
+        return False
+    return url.startswith(repository_url.removesuffix('.git').rstrip('/') + '/')
+
+
+def _charm_checks(
+    charm_path: pathlib.Path, charm_name: str, repository_url: str, run_tooling: bool = True
+) -> list[str]:
+    """The checks that apply to an individual charm."""
+    return [
+        # The links are checked every time, so this isn't stored in the result
+        # cache, which only depends on the files.
+        metadata_links(charm_path),
+        check_charm_name(charm_name),
+        _cached(action_names, charm_path),
+        _cached(option_names, charm_path),
+        repository_name(repository_url, charm_name),
+        _cached(relations_includes_optional, charm_path),
+        charmcraft_tooling(charm_path, run_commands=run_tooling),
+        charm_plugin_strict_dependencies(charm_path),
+        _cached(python_requires_version, charm_path),
+        _cached(repo_has_lock_file, charm_path),
+        _cached(charm_has_icon, charm_path),
+        charm_lib_docs(charm_path),
+    ]
+
+
+def _cacheable(version: int, *inputs: str):
+    """Mark a check as only depending on the content of ``inputs``.
+
+    ``inputs`` are paths relative to the charm directory. The results of
+    these checks are stored in the result cache (see `result_cache`). Bump
+    ``version`` whenever the check (including its description) changes, so
+    that results from the previous implementation aren't reused.
+    """
+
+    def decorator(check: Callable[[pathlib.Path], str]) -> Callable[[pathlib.Path], str]:
+        check.cache_version = version  # type: ignore[attr-defined]
+        check.cache_inputs = inputs  # type: ignore[attr-defined]
+        return check
+
+    return decorator
+
+
+def _cached(check: Callable[[pathlib.Path], str], charm_path: pathlib.Path) -> str:
+    """Run a `_cacheable` check, using the cached result if the inputs are unchanged."""
+    return result_cache.cache().run(
+        check.__name__,
+        check.cache_version,  # type: ignore[attr-defined]
+        charm_path,
+        check.cache_inputs,  # type: ignore[attr-defined]
+        lambda: check(charm_path),
+        # Several checks share inputs, so the index's hashes save reading them again.
+        file_hash=file_index.lookup(charm_path).hash,
+    )
+
+
+# Directories that never contain the charms being reviewed.
+_DISCOVERY_SKIP_DIRS = {'node_modules', 'venv', 'build'}
+
+
+def discover_charms(repo_dir: pathlib.Path) -> list[str]:
+    """Find every charm in the repository, by looking for `charmcraft.yaml` files.
+
+    Returns the charm directories relative to ``repo_dir`` (with ``'.'`` for
+    a charm at the root), in sorted order. Hidden directories (such as
+    ``.git`` and ``.tox``) are not searched.
+    """
+    files = file_index.lookup(repo_dir)
+    charm_dirs: list[str] = []
+    for path in files.files(repo_dir):
+        relative = path.relative_to(repo_dir.resolve())
+        if relative.name != 'charmcraft.yaml':
+            continue
+        if any(
+            part.startswith('.') or part in _DISCOVERY_SKIP_DIRS for part in relative.parent.parts
+        ):
+            continue
+        charm_dirs.append(relative.parent.as_posix())
+    return sorted(charm_dirs)
+
+
+def evaluate_charms(
+    repository_url: str,
+    linting_url: str,
+    contribution_url: str,
+    license_url: str,
+    security_url: str,
+    branch: str = '',
+    charm_dirs: Sequence[str] | None = None,
+    commit: str = '',
+    run_tooling: bool = True,
+    max_workers: int | None = None,
+) -> dict[str, tuple[str, list[str]]]:
+    """Evaluate every charm in a repository that contains several of them.
+
+    This is the same as calling `evaluate` for each charm, except that the
+    repository is only fetched once, and the repository-wide checks (such as
+    the contribution guidelines and license) are only run once. The checks
+    for each charm are run in parallel.
+
+    If ``charm_dirs`` is not provided, every directory in the repository that
+    contains a `charmcraft.yaml` file is evaluated. The name of each charm is
+    read from its `charmcraft.yaml` file.
+
+    Returns the name of the charm in each charm directory, and its checklist
+    results, in the same form as `evaluate` returns them.
+    """
+    if charm_dirs is not None:
+        for charm_dir in charm_dirs:
+            _check_charm_dir(charm_dir)
+    if not commit:
+        remote = remote_repository(repository_url)
+        remote.check()
+        commit = remote.commit(branch) or ''
+    repo_dir = _fetch_source(repository_url, branch, commit, charm_dirs, run_tooling)
     try:
-        charm_path = (repo_dir / charm_dir).resolve()
-        if not charm_path.is_dir():
-            raise ValueError(f'charm_dir does not exist or is not a directory: {charm_dir!r}')
-        if not str(charm_path).startswith(str(repo_dir.resolve())):
-            raise ValueError(f'charm_dir resolves outside the repository: {charm_dir!r}')
-        results.append(coding_conventions(linting_url))
-        results.append(contribution_guidelines(contribution_url))
-        results.append(license_statement(license_url))
-        results.append(security_doc(security_url))
-        results.append(metadata_links(charm_path))
-        results.append(check_charm_name(charm_name))
-        results.append(action_names(charm_path))
-        results.append(option_names(charm_path))
-        results.append(repository_name(repository_url, charm_name))
-        results.append(relations_includes_optional(charm_path))
-        results.append(charmcraft_tooling(charm_path))
-        results.append(charm_plugin_strict_dependencies(charm_path))
-        results.append(python_requires_version(charm_path))
-        results.append(repo_has_lock_file(charm_path))
-        results.append(charm_has_icon(charm_path))
-        results.append(charm_lib_docs(charm_path))
+        # The repository is indexed once, for all of the charms in it.
+        with file_index.indexed(repo_dir):
+            if charm_dirs is None:
+                charm_dirs = discover_charms(repo_dir)
+            charm_paths = {charm_dir: _charm_path(repo_dir, charm_dir) for charm_dir in charm_dirs}
+            with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+                repository_results = executor.submit(
+                    _repository_checks,
+                    linting_url,
+                    contribution_url,
+                    license_url,
+                    security_url,
+                    repository_url,
+                    [repo_dir],
+                )
+                charm_names = {
+                    charm_dir: _charm_name(charm_path)
+                    for charm_dir, charm_path in charm_paths.items()
+                }
+                charm_results = {
+                    charm_dir: executor.submit(
+                        _charm_checks,
+                        charm_path,
+                        charm_names[charm_dir],
+                        repository_url,
+                        run_tooling,
+                    )
+                    for charm_dir, charm_path in charm_paths.items()
+                }
+                return {
+                    charm_dir: (
+                        charm_names[charm_dir],
+                        repository_results.result() + future.result(),
+                    )
+                    for charm_dir, future in charm_results.items()
+                }
     finally:
-        shutil.rmtree(str(repo_dir), ignore_errors=True)
-    return results
+        # Deleting a large clone can take a while, so it's done in the background.
+        workspace.manager().release(repo_dir)
+
+
+def _charm_name(charm_path: pathlib.Path) -> str:
+    """The charm's name from its metadata, or else the name of its directory."""
+    name = charm_metadata.view(charm_path).get('name')
+    return name if isinstance(name, str) and name else charm_path.name
+
+
+def local_repository(path: pathlib.Path | str) -> tuple[str, str]:
+    """Find the remote URL and current branch of a local git working tree.
+
+    The remote is the one the current branch tracks, or ``origin``. SSH URLs
+    for GitHub are converted to the equivalent HTTPS URL. Either value is an
+    empty string if it can't be determined (for example, if ``path`` is not a
+    git repository, or is in a detached ``HEAD`` state).
+    """
+
+    def git(*args: str) -> str:
+        try:
+            result = subprocess.run(
+                ['/usr/bin/git', '-C', str(path), *args],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=5,
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+            return ''
+        return result.stdout.strip()
+
+    branch = git('symbolic-ref', '--quiet', '--short', 'HEAD')
+    remote = (git('config', f'branch.{branch}.remote') if branch else '') or 'origin'
+    url = git('remote', 'get-url', remote)
+    if url.startswith('git@github.com:'):
+        url = 'https://github.com/' + url.removeprefix('git@github.com:')
+    return url.removesuffix('.git'), branch
 
 
 def coding_conventions(linting_url: str) -> str:
@@ -136,8 +584,8 @@ def coding_conventions(linting_url: str) -> str:
     return '* [ ] The charm implements coding conventions in CI.'
 
 
-def contribution_guidelines(contribution_url: str) -> str:
-    """The documentation for contribution resolves with a 2xx status code.
+def contribution_guidelines(contribution_url: str, local_path: pathlib.Path | None = None) -> str:
+    """The documentation for contribution exists, or resolves with a 2xx status code.
 
     The documentation for contributing to the charm should be separate from the
     documentation for developing or using the charm.
@@ -145,40 +593,65 @@ def contribution_guidelines(contribution_url: str) -> str:
     description = '* [ ] The charm provides contribution guidelines.'
     # Ideally, this would also check that the content of the URL is actually a
     # reasonable contribution guide, but that is more difficult to automate.
-    if _url_ok(contribution_url):
+    if local_path is not None or (contribution_url and _url_ok(contribution_url)):
         return description.replace('* [ ]', '* [x]')
     return description
 
 
+def _license_hash(text: str) -> str:
+    return hashlib.sha512(text.strip().encode('utf-8')).hexdigest()
+
+
+# The SHA-512 of the exact text of the bundled licenses, which avoids the
+# fuzzier comparison (see the licenses module) for the most common case.
 _known_licenses = {
-    'fdae7ed259455ca9fa45939e7f25cbb4de29831cda16d9151de25a5f6e9d9be43b053f4fd3b896026239fca77abce04f543d591c501ecf4ce18c854bc0a51660',  # Apache 2.0  # noqa: E501
-    '5ae83c5b0ac7ed6469b38ed11f33b3d1dfabc9eaee8fff6a2e3d5e23b45e5f899a2bec93865c33868e83d0c8e4bff2c0dd0ebf0c3a390903a1f4d9ac7d9ab29e',  # GPL 2  # noqa: E501
-    '56a2f53e2df8adf4b55edf328579a74b1358f7f177b5242bd97dd79a8d26bc93f9dcc96dbdd6854627a96b73deb9ccaada6862f581ad1c8f6a2f3fe0849db005',  # GPL 3  # noqa: E501
-    '0906b47a8ae8ec763c6e548f42582d82fd8c8fa62403cd2b00a94d547277c98e65ce9d505d476b707c10c8aacd2d8094c594ba1e12d3c67cd658981c4bd2fe83',  # LGPL 3  # noqa: E501
-    'f5a0456e775e047c6c91571cf004a42cd04b3962ee882bc7c23d62a9a4d95bb310bfaaeb6a16bd777990eb564cc6c9ef13d7b3028f0d62ed2636ca083de6439a',  # MPL 2.0  # noqa: E501
+    _license_hash(text): spdx_id for spdx_id, text in licenses.bundled_texts().items()
 }
 
 
-def license_statement(license_url: str) -> str:
-    """The charm's license statement resolves with a 2xx status code.
+# The longest of the known licenses is under 40 KB.
+MAX_LICENSE_BYTES = 256 * 1024
+
+
+def license_statement(license_url: str, local_path: pathlib.Path | None = None) -> str:
+    """The charm's license statement exists, or resolves with a 2xx status code.
 
     For the charm shared, OSS or not, the licensing terms of the charm are
     clarified (which also implies an identified authorship of the charm).
     """
     description = '* [ ] The charm provides a license statement.'
-    text = _fetch_url(license_url)
+    text = None
+    if local_path is not None:
+        try:
+            with local_path.open('rb') as f:
+                data = f.read(MAX_LICENSE_BYTES + 1)
+        except OSError:
+            data = b''
+        if 0 < len(data) <= MAX_LICENSE_BYTES:
+            text = data.decode('utf-8', errors='replace')
+    elif license_url:
+        text = _fetch_url(license_url, max_bytes=MAX_LICENSE_BYTES)
     if text is None:
         return description
-    # Check for known licenses, with a simple hash.
-    license_hash = hashlib.sha512(text.strip().encode('utf-8')).hexdigest()
+    license_hash = _license_hash(text)
     if license_hash in _known_licenses:
-        return description.replace('* [ ]', '* [x]')
-    # If it's another license, then let the reviewer decide if it's a license file.
-    return description
+        match = licenses.LicenseMatch(_known_licenses[license_hash], 1.0)
+    else:
+        match = licenses.identify(text)
+    if match is None:
+        # If it's another license, then let the reviewer decide if it's a license file.
+        return description
+    if match.accepted:
+        description = description.replace('* [ ]', '* [x]')
+        return f'{description}\n  * Identified as {match.spdx_id} ({match.score:.0%} match).'
+    return (
+        f'{description}\n  * Most similar to {match.spdx_id} ({match.score:.0%} match), '
+        'which is not close enough to be sure.'
+    )
 
 
-def security_doc(security_url: str) -> str:
-    """The charm's security documentation resolves with a 2xx status code.
+def security_doc(security_url: str, local_path: pathlib.Path | None = None) -> str:
+    """The charm's security documentation exists, or resolves with a 2xx status code.
 
     The charm's security documentation explains which versions are supported,
     and how to report security issues.
@@ -186,58 +659,504 @@ def security_doc(security_url: str) -> str:
     description = '* [ ] The charm provides a security statement.'
     # Ideally, this would also check some of the content of the security doc,
     # like that it has a section on how to report security issues.
-    if _url_ok(security_url):
+    if local_path is not None or (security_url and _url_ok(security_url)):
         return description.replace('* [ ]', '* [x]')
     return description
 
 
-def get_default_branch(repository_url: str) -> str:
-    """Get the default branch name for a repository using git ls-remote."""
-    try:
-        result = subprocess.run(
-            ['/usr/bin/git', 'ls-remote', '--symref', repository_url, 'HEAD'],
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=5,
-        )
+LS_REMOTE_TIMEOUT_SECONDS = 30
+# How long the branch tips from ``git ls-remote`` are shared for. This covers
+# a single evaluation (or poll of the issues), but a long-running service sees
+# new commits on the next one.
+REMOTE_TTL_SECONDS = 30
+# Failures are shared too, so that a missing repository fails fast rather than
+# timing out for every check, but for less time, so that a repository that was
+# briefly unreachable is tried again sooner.
+REMOTE_ERROR_TTL_SECONDS = 10
+
+
+class RemoteRepository:
+    """A remote git repository, resolved with a single ``git ls-remote``.
+
+    The default branch, and the commit at the tip of each branch, are all
+    looked up the first time any of them is needed. Use `remote_repository` to
+    get the instance shared by everything in the process that works with the
+    same repository, so that the remote is only contacted once for an
+    evaluation. Results are only shared for `REMOTE_TTL_SECONDS` (or
+    `REMOTE_ERROR_TTL_SECONDS`, if the lookup failed), so that later
+    evaluations see new commits, and a repository that was unreachable is
+    tried again.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.error: str | None = None
+        self._default_branch: str | None = None
+        self._refs: dict[str, str] = {}
+        self._resolved = False
+        self._resolved_at: float | None = None
+        self._lock = threading.Lock()
+
+    def _resolve(self):
+        with self._lock:
+            if self._resolved:
+                return
+            self._resolved = True
+            try:
+                self._ls_remote()
+            finally:
+                self._resolved_at = time.monotonic()
+
+    def _ls_remote(self):
+        try:
+            result = subprocess.run(
+                ['/usr/bin/git', 'ls-remote', '--symref', self.url, 'HEAD', 'refs/heads/*'],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=LS_REMOTE_TIMEOUT_SECONDS,
+                # Fail, rather than waiting for credentials that will never come.
+                env={**os.environ, 'GIT_TERMINAL_PROMPT': '0'},
+            )
+        except subprocess.CalledProcessError as e:
+            self.error = (e.stderr or '').strip() or str(e)
+            return
+        except subprocess.TimeoutExpired as e:
+            self.error = str(e)
+            return
         for line in result.stdout.splitlines():
-            if line.startswith('ref: refs/heads/'):
-                return line.split('refs/heads/')[1].split()[0]
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, IndexError, ValueError):
-        pass
-    return 'main'
+            if line.startswith('ref: '):
+                target, _, name = line.removeprefix('ref: ').partition('\t')
+                if name.strip() == 'HEAD' and target.startswith('refs/heads/'):
+                    self._default_branch = target.removeprefix('refs/heads/')
+                continue
+            sha, _, name = line.partition('\t')
+            if name:
+                self._refs[name.strip()] = sha
+
+    def stale(self) -> bool:
+        """Whether a new lookup is needed, because this one is too old."""
+        # Until the lookup has finished, the instance is still shared.
+        if self._resolved_at is None:
+            return False
+        ttl = REMOTE_TTL_SECONDS if self.error is None else REMOTE_ERROR_TTL_SECONDS
+        return time.monotonic() - self._resolved_at > ttl
+
+    @property
+    def exists(self) -> bool:
+        """Whether the repository could be reached."""
+        self._resolve()
+        return self.error is None
+
+    @property
+    def default_branch(self) -> str | None:
+        """The branch that the remote's ``HEAD`` points to, if it could be found."""
+        self._resolve()
+        return self._default_branch
+
+    @property
+    def refs(self) -> dict[str, str]:
+        """The commit SHA for ``HEAD`` and each branch (as ``refs/heads/<name>``)."""
+        self._resolve()
+        return dict(self._refs)
+
+    def commit(self, branch: str = '') -> str | None:
+        """The commit at the tip of ``branch`` (or the default branch), if it exists."""
+        return self.refs.get(f'refs/heads/{branch}' if branch else 'HEAD')
+
+    def check(self):
+        """Raise an error if the repository could not be reached.
+
+        Raises:
+            subprocess.CalledProcessError: with the output of ``git ls-remote``.
+        """
+        if not self.exists:
+            raise subprocess.CalledProcessError(
+                128, ['git', 'ls-remote', self.url], stderr=self.error
+            )
+
+    def blob_url(self, path: str, branch: str = '') -> str:
+        """The URL for viewing ``path`` on ``branch`` (or the default branch).
+
+        This assumes GitHub's URL layout, which other forges (such as GitLab)
+        also redirect from.
+        """
+        branch = branch or self.default_branch or 'main'
+        return f'{self.url.removesuffix(".git").rstrip("/")}/blob/{branch}/{path}'
+
+
+_remotes: dict[str, RemoteRepository] = {}
+_remotes_lock = threading.Lock()
 
 
-def _clone_repo(charm_repo_url: str, branch: str = '') -> pathlib.Path:
-    """Clone the charm repository to a temporary directory."""
-    temp_dir = tempfile.mkdtemp()
+def remote_repository(url: str) -> RemoteRepository:
+    """Get the shared `RemoteRepository` for ``url``.
+
+    A new instance is created if the shared one is older than
+    `REMOTE_TTL_SECONDS` (or `REMOTE_ERROR_TTL_SECONDS`, if it failed).
+    """
+    with _remotes_lock:
+        if url not in _remotes or _remotes[url].stale():
+            _remotes[url] = RemoteRepository(url)
+        return _remotes[url]
+
+
+def get_default_branch(repository_url: str) -> str:
+    """Get the default branch name for a repository, falling back to 'main'."""
+    return remote_repository(repository_url).default_branch or 'main'
+
+
+# Limits on fetching the charm repository, so that a huge or stalled
+# repository can't hold up (or fill the disk of) a shared runner.
+CLONE_TIMEOUT_SECONDS = 120
+MAX_CLONE_BYTES = 500 * 1024 * 1024
+# How much of the branch's history to fetch when the server won't let a
+# commit be fetched directly.
+COMMIT_FALLBACK_DEPTH = 50
+
+_SHA_RE = re.compile(r'[0-9a-f]{40}|[0-9a-f]{64}')
+
+
+def is_commit_sha(value: str) -> bool:
+    """Whether ``value`` is a full (lowercase) SHA-1 or SHA-256 commit SHA."""
+    return bool(_SHA_RE.fullmatch(value))
+
+
+def resolve_commit(repository_url: str, branch: str = '') -> str | None:
+    """Resolve the tip of ``branch`` (or the default branch) to a commit SHA.
+
+    Returns ``None`` if the repository or branch can't be found.
+    """
+    return remote_repository(repository_url).commit(branch)
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                # Git renames its temporary files as it goes.
+                pass
+    return total
+
+
+def _run_git_limited(
+    cmd: list[str],
+    watch_dir: str,
+    timeout: float,
+    max_bytes: int,
+    env: dict[str, str] | None = None,
+):
+    """Run a git command, killing it if it takes too long or writes too much.
+
+    If ``watch_dir`` is in a workspace, the workspace is charged for what it
+    uses as the command runs (see `workspace.WorkspaceManager.charge`), so
+    that the command is also stopped if the workspaces exceed their quota.
+
+    Raises:
+        subprocess.TimeoutExpired: if the command takes longer than ``timeout``.
+        subprocess.CalledProcessError: if the command fails, or ``watch_dir``
+            grows past ``max_bytes`` or the workspace quota.
+    """
+    deadline = time.monotonic() + timeout
+    with subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env
+    ) as proc:
+        while True:
+            try:
+                returncode = proc.wait(timeout=0.5)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if time.monotonic() > deadline:
+                proc.kill()
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            problem = _watch_problem(watch_dir, max_bytes)
+            if problem:
+                proc.kill()
+                raise subprocess.CalledProcessError(1, cmd, stderr=problem)
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    # Whatever the command wrote in its last moments counts too.
+    problem = _watch_problem(watch_dir, max_bytes)
+    if problem:
+        raise subprocess.CalledProcessError(1, cmd, stderr=problem)
+
+
+def _watch_problem(watch_dir: str, max_bytes: int) -> str:
+    try:
+        size = workspace.manager().charge(watch_dir)
+    except OSError as e:
+        return str(e)
+    if size is None:
+        size = _directory_size(watch_dir)
+    if size > max_bytes:
+        return f'repository is larger than {max_bytes} bytes'
+    return ''
+
+
+def _clone_repo(
+    charm_repo_url: str,
+    branch: str = '',
+    commit: str = '',
+    *,
+    timeout: float = CLONE_TIMEOUT_SECONDS,
+    max_bytes: int = MAX_CLONE_BYTES,
+) -> pathlib.Path:
+    """Clone the charm repository to a temporary directory.
+
+    If ``commit`` is provided, exactly that commit is fetched (with depth 1),
+    rather than whatever the tip of the branch is at the time of cloning. If
+    the server doesn't allow fetching a commit that no branch or tag points
+    to, the last `COMMIT_FALLBACK_DEPTH` commits of ``branch`` (or the default
+    branch) are fetched instead, and the commit is checked out from those.
+
+    The clone is made in a new workspace (see `workspace.manager`), which the
+    caller should release when done with it. The workspace is charged for
+    the space that the clone (including the checkout) uses, and if the
+    workspaces have a quota, the clone is stopped when it is exceeded.
+    """
+    workspaces = workspace.manager()
+    temp_dir = str(workspaces.create())
+    git = '/usr/bin/git'
+    # Abort transfers that stall, rather than waiting for the overall timeout.
+    env = {**os.environ, 'GIT_HTTP_LOW_SPEED_LIMIT': '1000', 'GIT_HTTP_LOW_SPEED_TIME': '30'}
     try:
-        cmd = ['/usr/bin/git', 'clone', '--depth', '1']
+        if commit:
+            if not _SHA_RE.fullmatch(commit):
+                raise ValueError(f'commit must be a full commit SHA, got: {commit!r}')
+            subprocess.run([git, 'init', '--quiet', temp_dir], check=True, env=env)
+            fetch = [git, '-C', temp_dir, 'fetch', '--quiet', '--no-tags']
+            try:
+                _run_git_limited(
+                    [*fetch, '--depth', '1', charm_repo_url, commit],
+                    temp_dir,
+                    timeout=timeout,
+                    max_bytes=max_bytes,
+                    env=env,
+                )
+            except subprocess.CalledProcessError as e:
+                if e.stderr:
+                    # The fetch was stopped for being too large.
+                    raise
+                # Many servers only allow fetching the commits that branches
+                # and tags point to, so look for the commit in the recent
+                # history of the branch instead.
+                _run_git_limited(
+                    [
+                        *fetch,
+                        '--depth',
+                        str(COMMIT_FALLBACK_DEPTH),
+                        charm_repo_url,
+                        branch or 'HEAD',
+                    ],
+                    temp_dir,
+                    timeout=timeout,
+                    max_bytes=max_bytes,
+                    env=env,
+                )
+            checkout = [git, '-C', temp_dir, 'checkout', '--quiet', '--detach', commit]
+            try:
+                _run_git_limited(checkout, temp_dir, timeout=timeout, max_bytes=max_bytes)
+            except subprocess.CalledProcessError as e:
+                if e.stderr:
+                    raise
+                raise subprocess.CalledProcessError(
+                    e.returncode,
+                    checkout,
+                    stderr=(
+                        f'commit {commit} could not be fetched directly, and is not in the '
+                        f'last {COMMIT_FALLBACK_DEPTH} commits of '
+                        f'{f"branch {branch}" if branch else "the default branch"}'
+                    ),
+                ) from e
+            return pathlib.Path(temp_dir)
+        cmd = [git, 'clone', '--quiet', '--depth', '1']
         if branch:
             cmd += ['--branch', branch]
         cmd += [charm_repo_url, temp_dir]
-        subprocess.run(
-            cmd,
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
+        _run_git_limited(cmd, temp_dir, timeout=timeout, max_bytes=max_bytes, env=env)
         return pathlib.Path(temp_dir)
-    except subprocess.CalledProcessError:
-        shutil.rmtree(temp_dir)
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, ValueError):
+        workspaces.release(temp_dir)
         raise
 
 
-def _get_charmcraft_yaml(repo_dir: pathlib.Path) -> dict[Any, Any] | None:
-    charmcraft_path = repo_dir / 'charmcraft.yaml'
-    if not charmcraft_path.is_file():
+# The files and directories (relative to the charm directory) that the checks
+# read, when not running the charm's own tooling. Only these are extracted from
+# an archive.
+ARCHIVE_FILES = (
+    *charm_metadata.METADATA_FILES,
+    'pyproject.toml',
+    'poetry.lock',
+    'uv.lock',
+    'icon.svg',
+    'Makefile',
+    'Justfile',
+    'tox.ini',
+)
+ARCHIVE_DIRS = ('lib/charms',)
+MAX_ARCHIVE_BYTES = 100 * 1024 * 1024
+# Where to download repository archives from. Can be overridden (for example,
+# with a local server for testing) with the environment variable.
+ARCHIVE_URL_ENV = 'CHARMHUB_LISTING_REVIEW_ARCHIVE_URL'
+DEFAULT_ARCHIVE_URL = 'https://codeload.github.com/{owner}/{repo}/tar.gz/{commit}'
+
+_GITHUB_REPO_RE = re.compile(r'https://github\.com/([^/]+)/([^/]+?)(?:\.git)?/?')
+
+
+class _LimitedReader:
+    """A file-like wrapper that refuses to read more than ``limit`` bytes."""
+
+    def __init__(self, f, limit: int):
+        self._f = f
+        self._remaining = limit
+        self._limit = limit
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self._remaining -= len(data)
+        if self._remaining < 0:
+            raise ValueError(f'archive is larger than {self._limit} bytes')
+        return data
+
+
+def _archive_url(repository_url: str, commit: str) -> str | None:
+    match = _GITHUB_REPO_RE.fullmatch(repository_url)
+    if match is None or not _SHA_RE.fullmatch(commit):
         return None
+    template = os.environ.get(ARCHIVE_URL_ENV, DEFAULT_ARCHIVE_URL)
+    return template.format(owner=match.group(1), repo=match.group(2), commit=commit)
+
+
+def _fetch_archive(
+    archive_url: str,
+    charm_dirs: Sequence[str] | None = ('.',),
+    *,
+    timeout: float = CLONE_TIMEOUT_SECONDS,
+    max_bytes: int = MAX_ARCHIVE_BYTES,
+) -> pathlib.Path:
+    """Download a repository tarball, extracting only the files the checks read.
+
+    The archive is streamed: members are looked at one at a time as they are
+    downloaded, and anything other than `ARCHIVE_FILES` and `ARCHIVE_DIRS`
+    (under one of ``charm_dirs``), the documents that `find_document`
+    looks for, and the documentation whose links are checked (see
+    `doc_links`), is skipped without being written to disk.
+    If ``charm_dirs`` is ``None``, they are extracted from every directory, so
+    that the charms in the repository can be discovered. Symbolic links and
+    other special members are never extracted. Like `_clone_repo`, the files
+    are extracted to a new workspace, which the caller should release.
+
+    Raises:
+        urllib.error.URLError: if the archive can't be downloaded.
+        tarfile.TarError: if the archive is not a valid tarball.
+        ValueError: if the archive is larger than ``max_bytes``.
+        OSError: with ``errno.ENOSPC``, if the workspaces exceed their quota.
+    """
+    prefixes = None if charm_dirs is None else [pathlib.PurePosixPath(d) for d in charm_dirs]
+    workspaces = workspace.manager()
+    root = workspaces.create()
+    budget = workspaces.budget(root)
+    if budget is not None:
+        max_bytes = min(max_bytes, budget)
     try:
-        with charmcraft_path.open() as f:
-            return yaml.safe_load(f)
-    except (yaml.YAMLError, OSError):
-        return None
+        request = urllib.request.Request(archive_url, method='GET')  # noqa: S310
+        with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
+            with tarfile.open(fileobj=_LimitedReader(response, max_bytes), mode='r|gz') as tar:
+                for member in tar:
+                    # GitHub archives have a single top-level '<repo>-<sha>' directory.
+                    parts = pathlib.PurePosixPath(member.name).parts[1:]
+                    if not parts or '..' in parts:
+                        continue
+                    path = pathlib.PurePosixPath(*parts)
+                    if member.isdir():
+                        if prefixes is not None and any(
+                            path.is_relative_to(prefix) for prefix in prefixes
+                        ):
+                            (root / path).mkdir(parents=True, exist_ok=True)
+                        continue
+                    if not member.isfile() or not _archive_path_wanted(
+                        path, path.parents if prefixes is None else prefixes
+                    ):
+                        continue
+                    source = tar.extractfile(member)
+                    if source is None:
+                        continue
+                    target = root / path
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    with source, target.open('wb') as f:
+                        shutil.copyfileobj(source, f)
+        workspaces.charge(root)
+    except BaseException:
+        workspaces.release(root)
+        raise
+    return root
+
+
+def _archive_path_wanted(
+    path: pathlib.PurePosixPath, charm_dirs: Sequence[pathlib.PurePosixPath]
+) -> bool:
+    if _is_document_name(path.name, CONTRIBUTING_NAMES + LICENSE_NAMES + SECURITY_NAMES) and any(
+        path.parent == directory / subdir
+        for directory in (pathlib.PurePosixPath('.'), *charm_dirs)
+        for subdir in DOCUMENT_SUBDIRS
+    ):
+        return True
+    if any(
+        path.is_relative_to(directory) and doc_links.is_doc_path(path.relative_to(directory))
+        for directory in (pathlib.PurePosixPath('.'), *charm_dirs)
+    ):
+        return True
+    for charm_dir in charm_dirs:
+        if not path.is_relative_to(charm_dir):
+            continue
+        relative = path.relative_to(charm_dir)
+        if relative.as_posix() in ARCHIVE_FILES or any(
+            relative.is_relative_to(directory) for directory in ARCHIVE_DIRS
+        ):
+            return True
+    return False
+
+
+def _fetch_source(
+    repository_url: str,
+    branch: str = '',
+    commit: str = '',
+    charm_dirs: Sequence[str] | None = ('.',),
+    run_tooling: bool = True,
+) -> pathlib.Path:
+    """Get the charm's source, as cheaply as the checks that will run allow.
+
+    When the charm's tooling will not be run, and the repository is on GitHub,
+    only the files the checks read are extracted from an archive of the
+    commit. Otherwise, or if the archive can't be fetched, the repository is
+    cloned.
+    """
+    archive_url = None if run_tooling else _archive_url(repository_url, commit)
+    if archive_url is not None:
+        try:
+            return _fetch_archive(archive_url, charm_dirs)
+        except (urllib.error.URLError, OSError, tarfile.TarError, ValueError):
+            pass
+    return _clone_repo(repository_url, branch, commit)
+
+
+def _get_charmcraft_yaml(repo_dir: pathlib.Path) -> dict[Any, Any] | None:
+    return charm_metadata.view(repo_dir).document(charm_metadata.CHARMCRAFT_FILE)
+
+
+def _with_sources(
+    result: str,
+    metadata: charm_metadata.CharmMetadata,
+    keys: Sequence[str],
+    details: Sequence[str] = (),
+) -> str:
+    """Add the ``details``, and a detail line for each key that isn't from charmcraft.yaml."""
+    sources = [f'{source}.' for key in keys if (source := metadata.describe_source(key))]
+    return '\n'.join([result, *(f'  * {detail}' for detail in [*details, *sources])])
 
 
 def metadata_links(repo_dir: pathlib.Path) -> str:
@@ -248,12 +1167,14 @@ def metadata_links(repo_dir: pathlib.Path) -> str:
     The repository contains a `charmcraft.yaml` file that includes fields for
     name, title, summary, and description that are not the default profile
     values. A links field includes fields for documentation, issues, source,
-    website, and contact, which all resolve with a 2xx status code.
+    and website, which all resolve with a 2xx status code, and a contact,
+    which is a URL that resolves or an email address. Older charms can have
+    these in `metadata.yaml` instead. The links are checked concurrently (see
+    `links`), and every problem is reported.
     """
     description = '* [ ] charmcraft.yaml includes required metadata.'
-    data = _get_charmcraft_yaml(repo_dir)
-    if not data:
-        return description
+    data = charm_metadata.view(repo_dir)
+    keys = ('name', 'title', 'summary', 'description', 'links')
     default_desc = """A single sentence that says what the charm is, concisely and memorably.
 
 A paragraph of one to three short sentences, that describe what the charm does.
@@ -267,24 +1188,43 @@ Finally, a paragraph that describes whom the charm is useful for.\n"""
         'summary': 'A very short one-line summary of the charm.',
         'description': default_desc,
     }
+    # Every problem is reported, so that they can all be fixed in one go.
+    problems = []
     for field, default in required_fields.items():
         value = data.get(field, '')
-        if not value or value == default:
-            return description
+        if not value:
+            problems.append(f'The `{field}` is missing.')
+        elif value == default:
+            problems.append(f"The `{field}` is the profile's default.")
 
-    links = data.get('links', {})
+    links_data = data.get('links') or {}
     link_fields = ['documentation', 'issues', 'source', 'website', 'contact']
+    urls: dict[str, list[str]] = {}
     for field in link_fields:
-        url = links.get(field)
-        # Contact only needs to be a string.
-        if field == 'contact':
+        value = links_data.get(field)
+        if not value:
+            problems.append(f'The `{field}` link is missing.')
             continue
-        if not url:
-            return description
-        if not _url_ok(url):
-            return description
+        # Apart from the documentation, links can be lists.
+        for item in value if isinstance(value, list) else [value]:
+            item = str(item)
+            # The contact can also be an email address.
+            if field == 'contact' and not links.is_url(item):
+                if not links.is_email(item):
+                    problems.append(f"The `contact` link ({item}) isn't a URL or email address.")
+                continue
+            urls.setdefault(field, []).append(item)
+    statuses = links.checker().check_all(url for items in urls.values() for url in items)
+    problems.extend(
+        f'The `{field}` link ({url}) failed: {statuses[url].describe()}.'
+        for field, items in urls.items()
+        for url in items
+        if not statuses[url].ok
+    )
 
-    return description.replace('* [ ]', '* [x]')
+    if not problems:
+        description = description.replace('* [ ]', '* [x]')
+    return _with_sources(description, data, keys, problems)
 
 
 def _validate_action_or_config_name(name: str) -> bool:
@@ -324,14 +1264,16 @@ def check_charm_name(charm_name: str) -> str:
     return description
 
 
+@_cacheable(2, *charm_metadata.METADATA_FILES)
 def action_names(repo_dir: pathlib.Path) -> str:
     """The charm's actions are named according to the best practices.
 
     The charm's actions are named using lowercase alphanumeric names, with
     hyphens (-) to separate words.
 
-    The repository contains a `charmcraft.yaml` file that includes an actions
-    field, and each action is named appropriately.
+    The repository contains a `charmcraft.yaml` file (or, for older charms, an
+    `actions.yaml` file) that includes an actions field, and each action is
+    named appropriately.
     """
     # This has to match the description in the Charmcraft documentation.
     description = re.sub(
@@ -344,26 +1286,27 @@ def action_names(repo_dir: pathlib.Path) -> str:
     some be underscored. See {external+charmcraft:ref}`actions <charmcraft-yaml-key-actions>`.
     """,
     ).strip()
-    data = _get_charmcraft_yaml(repo_dir)
-    if not data or 'actions' not in data:
+    data = charm_metadata.view(repo_dir)
+    if 'actions' not in data:
         # No actions means that everything is fine in terms of names.
         return description.replace('* [ ]', '* [x]')
-    actions = data.get('actions', {})
+    actions = data.get('actions') or {}
     for name in actions:
         if not _validate_action_or_config_name(name):
-            return description
-    return description.replace('* [ ]', '* [x]')
+            return _with_sources(description, data, ['actions'])
+    return _with_sources(description.replace('* [ ]', '* [x]'), data, ['actions'])
 
 
+@_cacheable(2, *charm_metadata.METADATA_FILES)
 def option_names(repo_dir: pathlib.Path) -> str:
     """The charm's config options are named according to the best practices.
 
     The charm's config options are named using lowercase alphanumeric names,
     with hyphens (-) to separate words.
 
-    The repository contains a `charmcraft.yaml` file that includes a config
-    field, itself containing an options field, and each option is named
-    appropriately.
+    The repository contains a `charmcraft.yaml` file (or, for older charms, a
+    `config.yaml` file) that includes a config field, itself containing an
+    options field, and each option is named appropriately.
     """
     # This has to match the description in the Charmcraft documentation.
     description = re.sub(
@@ -376,15 +1319,15 @@ def option_names(repo_dir: pathlib.Path) -> str:
     some be underscored. See {external+charmcraft:ref}`config <charmcraft-yaml-key-config>`.
     """,
     ).strip()
-    data = _get_charmcraft_yaml(repo_dir)
-    if not data or 'config' not in data:
+    data = charm_metadata.view(repo_dir)
+    if 'config' not in data:
         # No options means that everything is fine in terms of names.
         return description.replace('* [ ]', '* [x]')
-    options = data.get('config', {}).get('options', {})
+    options = (data.get('config') or {}).get('options') or {}
     for name in options:
         if not _validate_action_or_config_name(name):
-            return description
-    return description.replace('* [ ]', '* [x]')
+            return _with_sources(description, data, ['config'])
+    return _with_sources(description.replace('* [ ]', '* [x]'), data, ['config'])
 
 
 def repository_name(repository_url: str, charm_name: str) -> str:
@@ -418,6 +1361,7 @@ def repository_name(repository_url: str, charm_name: str) -> str:
     return description
 
 
+@_cacheable(2, *charm_metadata.METADATA_FILES)
 def relations_includes_optional(repo_dir: pathlib.Path) -> str:
     """The charm's relations include the optional key.
 
@@ -426,8 +1370,9 @@ def relations_includes_optional(repo_dir: pathlib.Path) -> str:
     enforced by Juju, including it makes it clear to users (and other tools)
     whether the relation is required.
 
-    The charm's relations are defined in the `charmcraft.yaml` file, in requires
-    and provides fields, and each relation includes the `optional` key.
+    The charm's relations are defined in the `charmcraft.yaml` file (or, for
+    older charms, the `metadata.yaml` file), in requires and provides fields,
+    and each relation includes the `optional` key.
     """
     # This has to match the description in the Charmcraft documentation.
     description = re.sub(
@@ -440,23 +1385,27 @@ def relations_includes_optional(repo_dir: pathlib.Path) -> str:
     required. See {external+charmcraft:ref}`<endpoint role> <charmcraft-yaml-key-requires>`.
     """,
     ).strip()
-    data = _get_charmcraft_yaml(repo_dir)
-    if not data:
+    data = charm_metadata.view(repo_dir)
+    if not any(data.document(name) for name in (charm_metadata.CHARMCRAFT_FILE, 'metadata.yaml')):
         return description
-    for section in ('requires', 'provides'):
-        endpoints = data.get(section, {})
+    keys = ('requires', 'provides')
+    for section in keys:
+        endpoints = data.get(section) or {}
         for config in endpoints.values():
             if not isinstance(config, dict) or 'optional' not in config:
-                return description
-    return description.replace('* [ ]', '* [x]')
+                return _with_sources(description, data, keys)
+    return _with_sources(description.replace('* [ ]', '* [x]'), data, keys)
 
 
-def charmcraft_tooling(repo_dir: pathlib.Path) -> str:
+def charmcraft_tooling(repo_dir: pathlib.Path, run_commands: bool = True) -> str:
     """The charm includes the expected tooling for linting and testing.
 
     The repository contains a Makefile, Justfile, or tox.ini that provides
     commands for formatting, linting, unit testing, and integration testing
-    (other commands can also be included).
+    (other commands can also be included). The commands other than
+    integration testing must also succeed, when run in the charm directory.
+    Nothing is run if any of the commands are missing, and the item is left
+    for the reviewer if ``run_commands`` is false.
     """
     # This has to match the description in the Charmcraft documentation.
     description = re.sub(
@@ -469,43 +1418,27 @@ def charmcraft_tooling(repo_dir: pathlib.Path) -> str:
     provides. See [Develop your charm](#develop-your-charm).
     """,
     ).strip()
-    tooling_files = ['Makefile', 'Justfile', 'tox.ini']
-    for filename in tooling_files:
-        if (repo_dir / filename).is_file():
-            break
-    else:
+    plan = tooling.plan(repo_dir)
+    if not plan.sources:
         return description
-
-    # Check for commands in the files
-    commands = {'format', 'lint', 'unit', 'integration'}
-    found_commands: set[str] = set()
-    commands_to_run: list[list[str]] = []
-    file_path = repo_dir / filename
-    with file_path.open('r', encoding='utf-8') as f:
-        content = f.read().lower()
-
-    if filename == 'Makefile' or filename == 'Justfile':
-        for command in commands:
-            if f'{command}:' in content or f'{command} (' in content:
-                found_commands.add(command)
-                if command != 'integration':
-                    commands_to_run.append(['make' if filename == 'Makefile' else 'just', command])
-    elif filename == 'tox.ini':
-        for command in commands:
-            if f'[testenv:{command}]' in content:
-                found_commands.add(command)
-                if command != 'integration':
-                    commands_to_run.append(['tox', '-e', command])
-
-    for command in commands_to_run:
+    if plan.missing:
+        names = ', '.join(f'`{name}`' for name in plan.missing)
+        sources = ', '.join(f'`{source}`' for source in plan.sources)
+        return f"{description}\n  * {sources} doesn't provide these commands: {names}."
+    if not run_commands:
+        return f'{description}\n  * The commands were found, but not run.'
+    for command in plan.to_run():
+        failure = tooling.run(command, repo_dir)
+        if failure is not None:
+            return f'{description}\n  * {failure}'
+        # The commands can create large environments (such as `.tox`), which
+        # count towards the workspace quota.
         try:
-            subprocess.check_output(command, stderr=subprocess.DEVNULL)
-        except subprocess.CalledProcessError:
-            return description
-
-    if all(command in found_commands for command in commands):
-        return description.replace('* [ ]', '* [x]')
-    return description
+            workspace.manager().charge(repo_dir)
+        except OSError as e:
+            shown = ' '.join(command.argv)
+            return f'{description}\n  * Stopped after `{shown}`: {e.strerror}.'
+    return description.replace('* [ ]', '* [x]')
 
 
 def charm_plugin_strict_dependencies(repo_dir: pathlib.Path) -> str:
@@ -534,6 +1467,7 @@ def charm_plugin_strict_dependencies(repo_dir: pathlib.Path) -> str:
     return description
 
 
+@_cacheable(1, 'pyproject.toml')
 def python_requires_version(repo_dir: pathlib.Path) -> str:
     """The charm's `pyproject.toml` specifies the required Python version.
 
@@ -557,7 +1491,7 @@ def python_requires_version(repo_dir: pathlib.Path) -> str:
     """,
     ).strip()
     pyproject_path = repo_dir / 'pyproject.toml'
-    if not pyproject_path.is_file():
+    if not file_index.lookup(repo_dir).is_file(pyproject_path):
         return description
     try:
         with pyproject_path.open('rb') as f:
@@ -575,11 +1509,14 @@ def python_requires_version(repo_dir: pathlib.Path) -> str:
     return description
 
 
+@_cacheable(2, 'pyproject.toml', *lock_files.LOCK_FILE_NAMES)
 def repo_has_lock_file(repo_dir: pathlib.Path) -> str:
     """Both the pyproject.toml and lock file should be present in the repository.
 
     This allows reproducible builds and ensures that the charm's dependencies
-    are clearly defined.
+    are clearly defined. The lock must also be up to date: it must include
+    every dependency in the pyproject.toml, and have been resolved for the
+    Python versions that the pyproject.toml requires.
     """
     # This has to match the description in the Charmcraft documentation.
     description = re.sub(
@@ -590,14 +1527,38 @@ def repo_has_lock_file(repo_dir: pathlib.Path) -> str:
     that exact versions of charms can be reproduced.
     """,
     ).strip()
-    lock_files = ['poetry.lock', 'uv.lock']
-    if not repo_dir / 'pyproject.toml':
+    files = file_index.lookup(repo_dir)
+    pyproject_path = repo_dir / 'pyproject.toml'
+    lock_paths = [
+        repo_dir / name for name in lock_files.LOCK_FILE_NAMES if files.is_file(repo_dir / name)
+    ]
+    if not files.is_file(pyproject_path) or not lock_paths:
         return description
-    if any((repo_dir / lock_file).is_file() for lock_file in lock_files):
-        return description.replace('* [ ]', '* [x]')
-    return description
+    try:
+        with pyproject_path.open('rb') as f:
+            pyproject = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        return f"{description}\n  * `pyproject.toml` can't be parsed: {e}"
+    details = [
+        problem
+        for lock_path in lock_paths
+        for problem in lock_files.inconsistencies(
+            pyproject, lock_files.summarise(lock_path), lock_path.name
+        )
+    ]
+    if details:
+        return '\n'.join([description, *(f'  * {detail}' for detail in details)])
+    return description.replace('* [ ]', '* [x]')
+
+
+# Best practice limits for icons: the logo should be at least this far (in
+# pixels) from the edge of the circle, and icons with more elements than this
+# are unlikely to be legible at small sizes.
+MIN_ICON_PADDING = 5
+MAX_SIMPLE_ICON_ELEMENTS = 100
 
 
+@_cacheable(2, 'icon.svg', 'charmcraft.yaml')
 def charm_has_icon(repo_dir: pathlib.Path) -> str:
     """The charm has an icon.
 
@@ -616,36 +1577,77 @@ def charm_has_icon(repo_dir: pathlib.Path) -> str:
        ensure its weight is consistent.
      * Do not use glossy materials unless they are parts of a logo that you are not allowed to
        modify.
+
+    Only the canvas size and the icon being packed decide whether the item is
+    ticked, but each requirement and best practice that can be measured (see
+    the icons module) is reported on its own line, for the reviewer.
     """
     description = '* [ ] The charm has an icon.'
     icon_path = repo_dir / 'icon.svg'
-    if not icon_path.is_file():
-        return description
-    tree = ET.parse(icon_path)  # noqa: S314
-    root = tree.getroot()
-    width = root.attrib.get('width')
-    height = root.attrib.get('height')
-    view_box = root.attrib.get('viewBox')
-    correct_size = False
-    if width and height:
-        width_val = float(width.replace('px', ''))
-        height_val = float(height.replace('px', ''))
-        correct_size = math.isclose(width_val, 100) and math.isclose(height_val, 100)
-    elif view_box:
-        parts = view_box.strip().split()
-        if len(parts) == 4:
-            correct_size = math.isclose(float(parts[2]), 100) and math.isclose(
-                float(parts[3]), 100
-            )
-    if not correct_size:
+    if not file_index.lookup(repo_dir).is_file(icon_path):
         return description
+    try:
+        summary = icons.analyse_icon(icon_path)
+    except (icons.IconError, OSError) as e:
+        return f'{description}\n  * icon.svg could not be read: {e}.'
+    details = _icon_details(summary)
+    correct_size = (
+        summary.width is not None
+        and summary.height is not None
+        and math.isclose(summary.width, 100)
+        and math.isclose(summary.height, 100)
+    )
     # Having a valid icon.svg file is not enough on its own: unless the charm
     # uses the `charm` plugin (which bundles icon.svg automatically), the icon
     # must be explicitly staged in a part, or it won't show up on the listing.
     data = _get_charmcraft_yaml(repo_dir)
-    if data is not None and not _icon_included_in_build(data):
-        return description
-    return description.replace('* [ ]', '* [x]')
+    included = data is None or _icon_included_in_build(data)
+    if not included:
+        details.append("icon.svg isn't staged in any part, so it won't be packed in the charm.")
+    if correct_size and included:
+        description = description.replace('* [ ]', '* [x]')
+    return '\n'.join([description, *(f'  * {detail}' for detail in details)])
+
+
+def _icon_details(summary: icons.IconSummary) -> list[str]:
+    """A line for each of the icon requirements and best practices."""
+    details = []
+    if summary.width is None or summary.height is None:
+        details.append('The canvas size is not set, but must be 100x100 pixels.')
+    else:
+        size = f'{summary.width:g}x{summary.height:g}'
+        if math.isclose(summary.width, 100) and math.isclose(summary.height, 100):
+            details.append(f'The canvas is {size} pixels.')
+        else:
+            details.append(f'The canvas is {size} pixels, but must be 100x100.')
+    circle = summary.circle
+    if circle is None:
+        details.append(
+            'No background circle was found: the icon must be a circle with a flat colour.'
+        )
+    elif circle.fill.startswith('url('):
+        details.append('The background circle is filled with a gradient, not a flat colour.')
+    else:
+        details.append(f'The background circle has a flat colour ({circle.fill}).')
+    padding = summary.padding
+    if padding is not None:
+        if padding >= MIN_ICON_PADDING:
+            details.append(f'The logo has {padding:.0f} pixels of padding inside the circle.')
+        else:
+            details.append(
+                f'The logo has {max(padding, 0):.0f} pixels of padding inside the circle; '
+                f'at least {MIN_ICON_PADDING} is recommended.'
+            )
+    if summary.uses_gradient:
+        details.append(
+            'The icon uses gradients: avoid glossy materials, unless they are part of a logo.'
+        )
+    complexity = f'The icon has {summary.elements} elements and {len(summary.fills)} colours'
+    if summary.elements > MAX_SIMPLE_ICON_ELEMENTS:
+        details.append(f'{complexity}, so may not be legible at small sizes.')
+    else:
+        details.append(f'{complexity}.')
+    return details
 
 
 def _icon_included_in_build(charmcraft: dict[Any, Any]) -> bool:
@@ -682,41 +1684,98 @@ def _icon_included_in_build(charmcraft: dict[Any, Any]) -> bool:
     return False
 
 
-def charm_lib_docs(repo_dir: pathlib.Path) -> str:
-    """If the charm contains Charmhub libraries, they are appropriately documented."""
-    # We don't actually automate checking this, we just provide (or not) the
-    # checks the reviewer is expected to do.
-    charmcraft_path = repo_dir / 'charmcraft.yaml'
-    if not charmcraft_path.exists():
-        return ''
-    try:
-        with charmcraft_path.open() as f:
-            data = yaml.safe_load(f)
-            charm_name = data.get('name', '')
-            if not charm_name:
-                return ''
-    except (yaml.YAMLError, OSError, KeyError):
-        return ''
-    if not (repo_dir / 'lib' / 'charms' / charm_name).glob('*/*.py'):
-        # The charm does not provide a Charmhub library, so skip including any items.
-        return ''
+# An item is only ticked when the library's module docstring has a section for
+# it (a heading that matches one of these patterns) or, for the guidance, an
+# example code block. Mentioning a keyword in passing isn't enough.
+_LIB_PURPOSE_RE = re.compile(
+    r'\b(purpose|overview|about|introduction|description|summary|what)\b', re.IGNORECASE
+)
+_LIB_INTERFACE_RE = re.compile(r'\b(interface|provid|requir)', re.IGNORECASE)
+_LIB_AUDIENCE_RE = re.compile(r'\b(audience|intended|who)\b', re.IGNORECASE)
+_LIB_GUIDANCE_RE = re.compile(
+    r'\b(usage|using|example|getting started|quick ?start|how to)', re.IGNORECASE
+)
+_MD_HEADING_RE = re.compile(r'#{1,6}\s+(.+?)[\s#]*')
+_RST_UNDERLINE_RE = re.compile(r'([=\-~^*+#])\1{2,}')
+_CODE_BLOCK_RE = re.compile(
+    # Fenced code, doctests, reStructuredText literal blocks, and indented code.
+    r'^\s*(```|~~~|>>> )|::\s*$|^( {4,}|\t)(from \S+ import|import \w|class \w|def \w|@\w)',
+    re.MULTILINE,
+)
+
+
+def _doc_headings(doc: str) -> list[str]:
+    """The Markdown and reStructuredText section headings in the docstring."""
+    headings = []
+    lines = doc.splitlines()
+    for line, underline in zip(lines, [*lines[1:], ''], strict=True):
+        if match := _MD_HEADING_RE.fullmatch(line.strip()):
+            headings.append(match.group(1))
+        elif line.strip() and _RST_UNDERLINE_RE.fullmatch(underline.strip()):
+            headings.append(line.strip())
+    return headings
+
+
+def _lib_doc_items(lib: charm_libs.CharmLib) -> list[tuple[str, bool]]:
+    """The items that the library's module docstring must cover, and whether it has a section."""
+    doc = lib.docstring
+    headings = _doc_headings(doc)
+
+    def has_section(pattern: re.Pattern[str]) -> bool:
+        return any(pattern.search(heading) for heading in headings)
+
+    guidance = has_section(_LIB_GUIDANCE_RE) or bool(_CODE_BLOCK_RE.search(doc))
     # fmt: off
-    description = (
-        re.sub(
-            r'\n^\n',
-            ' ',
-            """
-If the charm provides an interface library, the library's module docstring must contain the following information:
-* [ ] the interface(s) this library is for, and if it takes care of one or both of the providing/requiring sides
-* [ ] guidance on how to start when using the library to implement their end of the interface
-
-If the charm provides a general library, the library's module docstring must contain the following information:
-* [ ] the purpose of the library
-* [ ] the intended audience for the library: is this library intended for use only by the charm or the charming team, or is it a public library intended for anyone to use in their charm?
-* [ ] guidance on how to start using the library
-""".strip(),  # noqa: E501
-        )
-    )
+    if lib.uses_relations:
+        return [
+            ('the interface(s) this library is for, and if it takes care of one or both of the providing/requiring sides',  # noqa: E501
+             has_section(_LIB_INTERFACE_RE)),
+            ('guidance on how to start when using the library to implement their end of the interface',  # noqa: E501
+             guidance),
+        ]
+    return [
+        ('the purpose of the library', has_section(_LIB_PURPOSE_RE)),
+        ('the intended audience for the library: is this library intended for use only by the charm or the charming team, or is it a public library intended for anyone to use in their charm?',  # noqa: E501
+         has_section(_LIB_AUDIENCE_RE)),
+        ('guidance on how to start using the library', guidance),
+    ]
     # fmt: on
 
-    return description
+
+def charm_lib_docs(repo_dir: pathlib.Path) -> str:
+    """If the charm contains Charmhub libraries, they are appropriately documented.
+
+    Each library that the charm provides gets the items for either an
+    interface library (one that deals with relations) or a general library.
+    Items are only ticked when the module docstring has a section for them (or,
+    for the guidance, an example), and the reviewer should still check that
+    the content is useful. Libraries that Charmcraft would refuse to publish
+    get an extra item that says why.
+    """
+    charm_name = charm_metadata.view(repo_dir).get('name')
+    if not isinstance(charm_name, str) or not charm_name:
+        return ''
+    libs = charm_libs.index_libs(repo_dir, charm_name)
+    sections = []
+    for lib in libs:
+        if lib.error:
+            sections.append(f"The `{lib.path}` library couldn't be parsed: {lib.error}")
+            continue
+        kind = 'an interface' if lib.uses_relations else 'a general'
+        lines = [
+            f"The `{lib.path}` library looks like {kind} library, so the library's module "
+            'docstring must contain the following information:'
+        ]
+        for item, documented in _lib_doc_items(lib):
+            lines.append(f'* [{"x" if documented else " "}] {item}')
+        problems = lib.publishing_problems()
+        if problems:
+            lines.append(
+                '* [ ] The library sets the `LIBID`, `LIBAPI`, and `LIBPATCH` values that '
+                'Charmcraft needs to publish it.'
+            )
+            lines.extend(f'  * {problem}' for problem in problems)
+        sections.append('\n'.join(lines))
+    # An empty result means that the charm does not provide a Charmhub library,
+    # so no items are included.
+    return '\n\n'.join(sections)
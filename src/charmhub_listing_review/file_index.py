@@ -0,0 +1,200 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An index of the files in a repository, built with a single walk.
+
+The checks ask many small questions about the files in the charm ("is there a
+``tox.ini``?", "what is in ``lib/charms``?"). Rather than each check going to
+the filesystem, the repository is walked once at the start of an evaluation,
+and the checks look the answers up in the index. The content hash of a file
+is only calculated when it is first asked for, and is then kept.
+
+Version control and tooling directories (`IGNORED_DIRS`) are not indexed, so
+they don't appear to exist at all.
+"""
+
+import contextlib
+import dataclasses
+import hashlib
+import os
+import pathlib
+import threading
+from collections.abc import Generator, Iterator
+
+IGNORED_DIRS = frozenset({'.git', '.tox', '.venv', 'node_modules', '__pycache__'})
+
+
+@dataclasses.dataclass(frozen=True)
+class FileInfo:
+    """What the index knows about a file without reading it."""
+
+    size: int
+    mtime_ns: int
+
+
+class FileIndex:
+    """The files and directories under ``root``.
+
+    Paths passed to the methods can be absolute (under ``root``) or relative
+    to ``root``.
+    """
+
+    def __init__(
+        self,
+        root: pathlib.Path,
+        files: dict[str, FileInfo],
+        dirs: dict[str, list[str]],
+    ):
+        self.root = root
+        self._files = files
+        # The names of the entries in each directory, with '.' for the root.
+        self._dirs = dirs
+        self._hashes: dict[str, str] = {}
+        self._hashes_lock = threading.Lock()
+
+    @classmethod
+    def build(
+        cls, root: pathlib.Path | str, ignored: frozenset[str] = IGNORED_DIRS
+    ) -> 'FileIndex':
+        """Walk ``root`` and index everything in it, other than ``ignored`` directories.
+
+        Symbolic links to directories are not followed.
+        """
+        root = pathlib.Path(root).resolve()
+        files: dict[str, FileInfo] = {}
+        dirs: dict[str, list[str]] = {}
+        pending = ['.']
+        while pending:
+            key = pending.pop()
+            names = dirs[key] = []
+            try:
+                with os.scandir(root if key == '.' else root / key) as entries:
+                    for entry in entries:
+                        child = entry.name if key == '.' else f'{key}/{entry.name}'
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name in ignored:
+                                    continue
+                                pending.append(child)
+                            elif entry.is_file():
+                                stat = entry.stat()
+                                files[child] = FileInfo(stat.st_size, stat.st_mtime_ns)
+                            else:
+                                continue
+                        except OSError:
+                            continue
+                        names.append(entry.name)
+            except OSError:
+                pass
+            names.sort()
+        return cls(root, files, dirs)
+
+    def _key(self, path: pathlib.Path | str) -> str | None:
+        path = pathlib.Path(path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.root)
+            except ValueError:
+                # The path may reach the root through a symbolic link.
+                try:
+                    path = path.resolve().relative_to(self.root)
+                except ValueError:
+                    return None
+        key = path.as_posix()
+        return key.removeprefix('./') if key != '.' else key
+
+    def contains(self, path: pathlib.Path | str) -> bool:
+        """Whether ``path`` is somewhere under the root of the index."""
+        return self._key(path) is not None
+
+    def is_file(self, path: pathlib.Path | str) -> bool:
+        """Whether ``path`` is a (regular) file."""
+        return self._key(path) in self._files
+
+    def is_dir(self, path: pathlib.Path | str) -> bool:
+        """Whether ``path`` is a directory."""
+        return self._key(path) in self._dirs
+
+    def info(self, path: pathlib.Path | str) -> FileInfo | None:
+        """The size and modification time of the file, if it is one."""
+        key = self._key(path)
+        return None if key is None else self._files.get(key)
+
+    def listdir(self, path: pathlib.Path | str = '.') -> list[str]:
+        """The names of the entries in the directory, sorted, or empty if it isn't one."""
+        key = self._key(path)
+        return [] if key is None else list(self._dirs.get(key, ()))
+
+    def files(self, path: pathlib.Path | str = '.') -> Iterator[pathlib.Path]:
+        """Every file under the directory ``path``, as absolute paths."""
+        key = self._key(path)
+        if key is None:
+            return
+        prefix = '' if key == '.' else f'{key}/'
+        for file_key in self._files:
+            if file_key.startswith(prefix):
+                yield self.root / file_key
+
+    def hash(self, path: pathlib.Path | str) -> str | None:
+        """The SHA-256 of the file's content, or ``None`` if it isn't a file."""
+        key = self._key(path)
+        if key is None or key not in self._files:
+            return None
+        with self._hashes_lock:
+            if key in self._hashes:
+                return self._hashes[key]
+        try:
+            with (self.root / key).open('rb') as f:
+                digest = hashlib.file_digest(f, 'sha256').hexdigest()
+        except OSError:
+            return None
+        with self._hashes_lock:
+            self._hashes[key] = digest
+        return digest
+
+
+_indexes: dict[pathlib.Path, FileIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def indexed(root: pathlib.Path | str) -> Generator[FileIndex, None, None]:
+    """Index ``root``, and use that index for `lookup` until the context exits."""
+    index = FileIndex.build(root)
+    with _indexes_lock:
+        previous = _indexes.get(index.root)
+        _indexes[index.root] = index
+    try:
+        yield index
+    finally:
+        with _indexes_lock:
+            if previous is None:
+                _indexes.pop(index.root, None)
+            else:
+                _indexes[index.root] = previous
+
+
+def lookup(path: pathlib.Path | str) -> FileIndex:
+    """The index that covers ``path``.
+
+    This is the index from the innermost `indexed` context that contains
+    ``path``. If there isn't one (for example, when a check is run on its
+    own), ``path`` is indexed from scratch.
+    """
+    path = pathlib.Path(path).resolve()
+    with _indexes_lock:
+        for candidate in (path, *path.parents):
+            if candidate in _indexes:
+                return _indexes[candidate]
+    return FileIndex.build(path)
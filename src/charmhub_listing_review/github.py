@@ -0,0 +1,339 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Run GitHub CLI commands without tripping GitHub's rate limits.
+
+Every call to GitHub goes through `run` (for ``gh`` commands) or `api` (for
+``gh api`` requests), which:
+
+* pace all callers in the process through a shared token bucket, so that a
+  sweep over many issues, or several service workers, don't burst past
+  GitHub's secondary rate limits;
+* read the rate-limit headers of every response (`api` asks for them with
+  ``--include``, and `run` has ``gh`` log its HTTP traffic with
+  ``GH_DEBUG=api``);
+* retry calls that were rate limited (HTTP 403 or 429), waiting for the
+  ``retry-after`` or ``x-ratelimit-reset`` time when GitHub provides one, and
+  otherwise backing off exponentially with jitter;
+* keep track of the remaining API budget, for `report_budget`.
+"""
+
+import dataclasses
+import datetime
+import json
+import os
+import random
+import re
+import subprocess  # noqa: S404
+import sys
+import threading
+import time
+
+# GitHub allows bursts, but documents a limit of 80 content-creating requests
+# a minute before secondary rate limits apply.
+BUCKET_CAPACITY = 10
+BUCKET_RATE_PER_SECOND = 80 / 60
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 60
+# Never wait longer than this for a primary rate limit to reset: fail instead.
+MAX_RESET_WAIT_SECONDS = 10 * 60
+
+_RATE_LIMITED = re.compile(r'rate limit|HTTP 429|abuse detection', re.IGNORECASE)
+
+
+class TokenBucket:
+    """A thread-safe token bucket, for pacing calls."""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, waiting for one if necessary.
+
+        Returns how long the caller had to wait, in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = 0 if self._tokens >= 0 else -self._tokens / self.rate
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+@dataclasses.dataclass
+class Budget:
+    """The remaining budget for a GitHub API resource (such as ``core`` or ``graphql``)."""
+
+    remaining: int
+    limit: int
+    reset: int  # Unix timestamp.
+
+
+@dataclasses.dataclass
+class CallStats:
+    """Statistics about the GitHub calls made by this process."""
+
+    calls: int = 0
+    retries: int = 0
+    waited_seconds: float = 0
+
+
+bucket = TokenBucket(BUCKET_CAPACITY, BUCKET_RATE_PER_SECOND)
+stats = CallStats()
+budgets: dict[str, Budget] = {}
+_stats_lock = threading.Lock()
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt))  # noqa: S311
+
+
+def _sleep(seconds: float):
+    with _stats_lock:
+        stats.retries += 1
+        stats.waited_seconds += seconds
+    time.sleep(seconds)
+
+
+def _reset_wait(resource: str | None = None) -> float | None:
+    """How long until an exhausted primary rate limit resets, if one is exhausted."""
+    if resource is None:
+        fetch_budget()
+    exhausted = [
+        budget
+        for name, budget in budgets.items()
+        if budget.remaining == 0 and (resource is None or name == resource)
+    ]
+    if not exhausted:
+        return None
+    wait = max(budget.reset for budget in exhausted) - time.time() + 1
+    return max(0, min(wait, MAX_RESET_WAIT_SECONDS))
+
+
+def _retry_wait(attempt: int, headers: dict[str, str]) -> float:
+    """How long to wait before retrying a rate limited request."""
+    if 'retry-after' in headers:
+        try:
+            return min(float(headers['retry-after']), MAX_RESET_WAIT_SECONDS)
+        except ValueError:
+            pass
+    wait = _reset_wait(headers.get('x-ratelimit-resource', 'core'))
+    return _backoff(attempt) if wait is None else wait
+
+
+def _is_rate_limited(status: int, headers: dict[str, str], message: str) -> bool:
+    return status == 429 or (
+        status == 403
+        and (headers.get('x-ratelimit-remaining') == '0' or bool(_RATE_LIMITED.search(message)))
+    )
+
+
+def _split_debug_output(stderr: str) -> tuple[int, dict[str, str], str]:
+    """Split ``gh`` output with ``GH_DEBUG=api`` into the HTTP traffic and the rest.
+
+    The traffic is logged like ``curl -v``: ``*`` lines about the request,
+    ``>`` request and ``<`` response header lines, each followed by a blank
+    line and the body. The budget from every response is recorded.
+
+    Returns:
+        The status and headers of the last response (``0`` and empty, if
+        there wasn't one), and what ``gh`` itself wrote to ``stderr``.
+    """
+    status, headers = 0, {}
+    message = []
+    in_headers = in_body = False
+    for line in stderr.splitlines(keepends=True):
+        marker, _, content = line.rstrip('\r\n').partition(' ')
+        if marker in {'*', '>', '<'}:
+            if marker == '<' and (match := re.match(r'HTTP/\S+\s+(\d+)', content)):
+                if headers:
+                    _record_budget(headers)
+                status, headers = int(match.group(1)), {}
+            elif marker == '<' and ':' in content:
+                name, _, value = content.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            in_headers, in_body = marker != '*', False
+        elif not line.strip():
+            # A blank line ends the headers (and starts the body), or the body.
+            in_body = in_headers
+            in_headers = False
+        elif not in_body:
+            message.append(line)
+    if headers:
+        _record_budget(headers)
+    return status, headers, ''.join(message)
+
+
+def run(
+    cmd: list[str], *, capture_output: bool = False, check: bool = True
+) -> subprocess.CompletedProcess[str]:
+    """Run a ``gh`` command, retrying if GitHub rate limits it.
+
+    ``stderr`` is always captured, with ``gh`` logging its HTTP traffic to it,
+    so that the rate-limit headers can be read like they are by `api`. The
+    traffic is removed from the ``stderr`` that is returned, and if the command
+    fails for another reason than rate limiting, the rest is passed on to this
+    process's ``stderr``.
+    """
+    kwargs = {'capture_output': True} if capture_output else {'stderr': subprocess.PIPE}
+    env = {**os.environ, 'GH_DEBUG': 'api'}
+    for attempt in range(MAX_ATTEMPTS):
+        waited = bucket.acquire()
+        with _stats_lock:
+            stats.calls += 1
+            stats.waited_seconds += waited
+        try:
+            result = subprocess.run(cmd, check=True, text=True, env=env, **kwargs)
+        except subprocess.CalledProcessError as e:
+            status, headers, message = _split_debug_output(e.stderr or '')
+            if status:
+                rate_limited = _is_rate_limited(status, headers, message)
+            else:
+                # gh didn't log a response, so all there is to go on is its message.
+                rate_limited = bool(_RATE_LIMITED.search(message))
+            if rate_limited and attempt + 1 < MAX_ATTEMPTS:
+                if status:
+                    _sleep(_retry_wait(attempt, headers))
+                else:
+                    wait = _reset_wait()
+                    _sleep(_backoff(attempt) if wait is None else wait)
+                continue
+            sys.stderr.write(message)
+            if check:
+                raise subprocess.CalledProcessError(e.returncode, e.cmd, e.stdout, message) from e
+            return subprocess.CompletedProcess(e.cmd, e.returncode, e.stdout, message)
+        _, _, result.stderr = _split_debug_output(result.stderr or '')
+        return result
+    raise AssertionError('unreachable')
+
+
+def _parse_response(output: str) -> tuple[int, dict[str, str], str]:
+    """Split ``gh api --include`` output into the status, headers, and body."""
+    head, _, body = output.replace('\r\n', '\n').partition('\n\n')
+    lines = head.splitlines()
+    match = re.match(r'HTTP/\S+\s+(\d+)', lines[0]) if lines else None
+    if match is None:
+        # Not a response we understand, so treat it all as the body.
+        return 0, {}, output
+    headers: dict[str, str] = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return int(match.group(1)), headers, body
+
+
+def _record_budget(headers: dict[str, str]):
+    try:
+        budget = Budget(
+            remaining=int(headers['x-ratelimit-remaining']),
+            limit=int(headers['x-ratelimit-limit']),
+            reset=int(headers['x-ratelimit-reset']),
+        )
+    except (KeyError, ValueError):
+        return
+    with _stats_lock:
+        budgets[headers.get('x-ratelimit-resource', 'core')] = budget
+
+
+def api(args: list[str]) -> str:
+    """Make a request with ``gh api``, retrying if GitHub rate limits it.
+
+    ``args`` are the arguments after ``gh api`` (the endpoint, and any flags).
+    The response headers are read to track the remaining budget and to decide
+    how long to wait when rate limited. Returns the response body.
+
+    Raises:
+        subprocess.CalledProcessError: if the request fails, other than being
+            rate limited, or is still rate limited after ``MAX_ATTEMPTS``.
+    """
+    cmd = ['gh', 'api', '--include', *args]
+    for attempt in range(MAX_ATTEMPTS):
+        waited = bucket.acquire()
+        with _stats_lock:
+            stats.calls += 1
+            stats.waited_seconds += waited
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        status, headers, body = _parse_response(result.stdout)
+        _record_budget(headers)
+        if result.returncode == 0:
+            return body
+        if _is_rate_limited(status, headers, body) and attempt + 1 < MAX_ATTEMPTS:
+            _sleep(_retry_wait(attempt, headers))
+            continue
+        sys.stderr.write(result.stderr)
+        raise subprocess.CalledProcessError(result.returncode, cmd, body, result.stderr)
+    raise AssertionError('unreachable')
+
+
+def fetch_budget():
+    """Refresh the remaining budget for every API resource.
+
+    Checking the rate limit does not count against it. Failures are ignored,
+    since the budget is only informational.
+    """
+    try:
+        result = subprocess.run(
+            ['gh', 'api', 'rate_limit'], capture_output=True, text=True, check=True
+        )
+        resources = json.loads(result.stdout)['resources']
+    except (subprocess.CalledProcessError, OSError, ValueError, KeyError):
+        return
+    with _stats_lock:
+        for name in ('core', 'graphql', 'search'):
+            if name in resources:
+                budgets[name] = Budget(**{
+                    key: resources[name][key] for key in ('remaining', 'limit', 'reset')
+                })
+
+
+def budget_summary() -> str:
+    """A Markdown summary of the GitHub calls made and the remaining budget."""
+    lines = [
+        f'GitHub calls: {stats.calls} ({stats.retries} retried after rate limiting, '
+        f'{stats.waited_seconds:.1f}s spent waiting).'
+    ]
+    for name, budget in sorted(budgets.items()):
+        reset = datetime.datetime.fromtimestamp(budget.reset, datetime.UTC)
+        lines.append(
+            f'* `{name}`: {budget.remaining}/{budget.limit} remaining, '
+            f'resets at {reset:%H:%M:%S} UTC'
+        )
+    return '\n'.join(lines)
+
+
+def report_budget():
+    """Report the remaining GitHub API budget at the end of a run.
+
+    The report goes to ``stderr`` (so it doesn't mix with dry-run output) and,
+    when running in GitHub Actions, to the job summary. The budget is only
+    looked up if no response has already reported it.
+    """
+    if not budgets:
+        fetch_budget()
+    summary = budget_summary()
+    print(summary, file=sys.stderr)
+    summary_path = os.environ.get('GITHUB_STEP_SUMMARY')
+    if summary_path:
+        with open(summary_path, 'a', encoding='utf-8') as f:
+            f.write(f'### GitHub API budget\n\n{summary}\n')
@@ -0,0 +1,448 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Summarise the geometry of a charm icon, without rendering it.
+
+The icon is read with a streaming XML parser, so the size of the canvas is
+known from the root element alone, and the rest of the document is read in
+chunks, with limits on its size and number of elements. Entity declarations
+are rejected outright, since an icon has no need for them.
+
+The summary is approximate: bounding boxes include the control points of
+curves, and don't account for stroke widths or text, but that is enough to
+find the background circle and to see how much padding the logo has.
+"""
+
+import dataclasses
+import math
+import pathlib
+import re
+from xml.parsers import expat
+
+MAX_ICON_BYTES = 1024 * 1024
+MAX_ICON_ELEMENTS = 10_000
+READ_CHUNK_BYTES = 16 * 1024
+# Arcs in paths are measured at this many points along them.
+ARC_SAMPLES = 16
+# A shape is the background circle if its centre is within this fraction of
+# the canvas size from the centre of the canvas, and its radius is at least
+# this fraction of the canvas size.
+CIRCLE_CENTRE_TOLERANCE = 0.05
+CIRCLE_MIN_RADIUS = 0.4
+
+# The content of these elements is never drawn directly.
+_NOT_DRAWN = {
+    'clipPath',
+    'defs',
+    'desc',
+    'linearGradient',
+    'marker',
+    'mask',
+    'metadata',
+    'pattern',
+    'radialGradient',
+    'style',
+    'symbol',
+    'title',
+}
+_SHAPES = {'circle', 'ellipse', 'image', 'line', 'path', 'polygon', 'polyline', 'rect', 'use'}
+_NUMBER = r'[-+]?(?:\d*\.\d+|\d+\.?)(?:[eE][-+]?\d+)?'
+_NUMBER_RE = re.compile(_NUMBER)
+_PATH_TOKEN_RE = re.compile(rf'[MmZzLlHhVvCcSsQqTtAa]|{_NUMBER}')
+_TRANSFORM_RE = re.compile(r'(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)')
+_PATH_ARGUMENTS = {'M': 2, 'L': 2, 'T': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'A': 7, 'Z': 0}
+
+# An affine transform (a, b, c, d, e, f), as in SVG's matrix().
+Matrix = tuple[float, float, float, float, float, float]
+_IDENTITY: Matrix = (1, 0, 0, 1, 0, 0)
+
+
+class IconError(ValueError):
+    """The icon can't be analysed (it isn't valid, or is too large or complex)."""
+
+
+@dataclasses.dataclass(frozen=True)
+class Circle:
+    """A circle, in the icon's coordinates."""
+
+    cx: float
+    cy: float
+    r: float
+    fill: str
+
+
+@dataclasses.dataclass
+class IconSummary:
+    """The geometry of an icon."""
+
+    width: float | None = None
+    height: float | None = None
+    # The x, y, width and height of the area that the canvas shows.
+    view_box: tuple[float, float, float, float] | None = None
+    elements: int = 0
+    fills: set[str] = dataclasses.field(default_factory=set)
+    # Whether any shape is filled with a gradient (or pattern).
+    uses_gradient: bool = False
+    circle: Circle | None = None
+    # The bounding box (min x, min y, max x, max y) of everything other than
+    # the background circle, or None if it is empty.
+    logo_box: tuple[float, float, float, float] | None = None
+
+    @property
+    def padding(self) -> float | None:
+        """The smallest gap between the logo and the edge of the circle's box, in pixels.
+
+        The gap is scaled from the icon's coordinates to the canvas.
+        """
+        if self.circle is None or self.logo_box is None:
+            return None
+        c = self.circle
+        min_x, min_y, max_x, max_y = self.logo_box
+        gap = min(
+            min_x - (c.cx - c.r), min_y - (c.cy - c.r), c.cx + c.r - max_x, c.cy + c.r - max_y
+        )
+        scale = 1.0
+        if self.view_box is not None and self.width:
+            scale = self.width / self.view_box[2]
+        return gap * scale
+
+
+def _multiply(m: Matrix, n: Matrix) -> Matrix:
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (
+        a * a2 + c * b2,
+        b * a2 + d * b2,
+        a * c2 + c * d2,
+        b * c2 + d * d2,
+        a * e2 + c * f2 + e,
+        b * e2 + d * f2 + f,
+    )
+
+
+def _apply(m: Matrix, x: float, y: float) -> tuple[float, float]:
+    a, b, c, d, e, f = m
+    return a * x + c * y + e, b * x + d * y + f
+
+
+def parse_transform(value: str) -> Matrix:
+    """Parse an SVG ``transform`` attribute."""
+    if _TRANSFORM_RE.sub('', value).strip(' ,\t\r\n'):
+        raise IconError(f'invalid transform: {value!r}')
+    matrix = _IDENTITY
+    for name, args in _TRANSFORM_RE.findall(value):
+        n = [float(v) for v in _NUMBER_RE.findall(args)]
+        if name == 'matrix' and len(n) == 6:
+            step: Matrix = (n[0], n[1], n[2], n[3], n[4], n[5])
+        elif name == 'translate' and n:
+            step = (1, 0, 0, 1, n[0], n[1] if len(n) > 1 else 0)
+        elif name == 'scale' and n:
+            step = (n[0], 0, 0, n[1] if len(n) > 1 else n[0], 0, 0)
+        elif name == 'rotate' and n:
+            cos, sin = math.cos(math.radians(n[0])), math.sin(math.radians(n[0]))
+            step = (cos, sin, -sin, cos, 0, 0)
+            if len(n) == 3:
+                step = _multiply(
+                    _multiply((1, 0, 0, 1, n[1], n[2]), step), (1, 0, 0, 1, -n[1], -n[2])
+                )
+        elif name == 'skewX' and n:
+            step = (1, 0, math.tan(math.radians(n[0])), 1, 0, 0)
+        elif name == 'skewY' and n:
+            step = (1, math.tan(math.radians(n[0])), 0, 1, 0, 0)
+        else:
+            raise IconError(f'invalid transform: {value!r}')
+        matrix = _multiply(matrix, step)
+    return matrix
+
+
+def _arc_points(
+    x1: float,
+    y1: float,
+    rx: float,
+    ry: float,
+    angle: float,
+    large_arc: float,
+    sweep: float,
+    x2: float,
+    y2: float,
+    samples: int = ARC_SAMPLES,
+) -> list[tuple[float, float]]:
+    """Points along an elliptical arc, using the SVG specification's centre parameterisation."""
+    rx, ry = abs(rx), abs(ry)
+    if not rx or not ry or (x1, y1) == (x2, y2):
+        return [(x2, y2)]
+    cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    dx, dy = (x1 - x2) / 2, (y1 - y2) / 2
+    x1p, y1p = cos * dx + sin * dy, -sin * dx + cos * dy
+    # Radii that are too small are scaled up until the arc fits.
+    scale = x1p**2 / rx**2 + y1p**2 / ry**2
+    if scale > 1:
+        rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+    numerator = rx**2 * ry**2 - rx**2 * y1p**2 - ry**2 * x1p**2
+    denominator = rx**2 * y1p**2 + ry**2 * x1p**2
+    coefficient = math.sqrt(max(0, numerator / denominator)) if denominator else 0
+    if bool(large_arc) == bool(sweep):
+        coefficient = -coefficient
+    cxp, cyp = coefficient * rx * y1p / ry, -coefficient * ry * x1p / rx
+    cx = cos * cxp - sin * cyp + (x1 + x2) / 2
+    cy = sin * cxp + cos * cyp + (y1 + y2) / 2
+    ux, uy = (x1p - cxp) / rx, (y1p - cyp) / ry
+    vx, vy = (-x1p - cxp) / rx, (-y1p - cyp) / ry
+    start = math.atan2(uy, ux)
+    delta = math.atan2(ux * vy - uy * vx, ux * vx + uy * vy)
+    if not sweep and delta > 0:
+        delta -= 2 * math.pi
+    elif sweep and delta < 0:
+        delta += 2 * math.pi
+    points = []
+    for k in range(1, samples + 1):
+        t = start + delta * k / samples
+        points.append((
+            cos * rx * math.cos(t) - sin * ry * math.sin(t) + cx,
+            sin * rx * math.cos(t) + cos * ry * math.sin(t) + cy,
+        ))
+    return points
+
+
+def path_points(data: str) -> list[tuple[float, float]]:
+    """The end and control points of an SVG path, in absolute coordinates."""
+    tokens = _PATH_TOKEN_RE.findall(data)
+    points: list[tuple[float, float]] = []
+    x = y = start_x = start_y = 0.0
+    command = ''
+    i = 0
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+            if command in 'Zz':
+                x, y = start_x, start_y
+                continue
+        elif not command or command in 'Zz':
+            raise IconError(f'invalid path data: {data[:50]!r}')
+        count = _PATH_ARGUMENTS[command.upper()]
+        args = [float(v) for v in tokens[i : i + count]]
+        if len(args) < count:
+            raise IconError(f'invalid path data: {data[:50]!r}')
+        i += count
+        relative = command.islower()
+        upper = command.upper()
+        if upper == 'H':
+            x = args[0] + (x if relative else 0)
+            points.append((x, y))
+        elif upper == 'V':
+            y = args[0] + (y if relative else 0)
+            points.append((x, y))
+        elif upper == 'A':
+            end_x = args[5] + (x if relative else 0)
+            end_y = args[6] + (y if relative else 0)
+            points.extend(_arc_points(x, y, *args[:5], end_x, end_y))
+            x, y = end_x, end_y
+        else:
+            for j in range(0, count, 2):
+                px = args[j] + (x if relative else 0)
+                py = args[j + 1] + (y if relative else 0)
+                points.append((px, py))
+            x, y = points[-1]
+        if upper == 'M':
+            start_x, start_y = x, y
+            # Further pairs after a move are implicit lines.
+            command = 'l' if relative else 'L'
+    return points
+
+
+def _length(value: str | None) -> float | None:
+    """Parse a length in pixels (or user units); other units aren't supported."""
+    if value is None:
+        return None
+    value = value.strip().removesuffix('px')
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _style(attrs: dict[str, str]) -> dict[str, str]:
+    """The presentation attributes of the element, including those in ``style``."""
+    style = {name: value.strip() for name, value in attrs.items() if name in ('fill', 'transform')}
+    for declaration in attrs.get('style', '').split(';'):
+        name, _, value = declaration.partition(':')
+        if name.strip() == 'fill':
+            style['fill'] = value.strip()
+    return style
+
+
+class _Analyser:
+    def __init__(self):
+        self.summary = IconSummary()
+        # For each open element: its name, transform, fill, and whether it is drawn.
+        self.stack: list[tuple[str, Matrix, str, bool]] = []
+        # The bounding box of each shape that was measured, and the shape
+        # itself if it is a circle.
+        self.shapes: list[tuple[tuple[float, float, float, float], Circle | None]] = []
+
+    def start(self, name: str, attrs: dict[str, str]):
+        name = name.rpartition(':')[2]
+        summary = self.summary
+        summary.elements += 1
+        if summary.elements > MAX_ICON_ELEMENTS:
+            raise IconError(f'more than {MAX_ICON_ELEMENTS} elements')
+        if not self.stack:
+            self._root(name, attrs)
+        parent_matrix, parent_fill, parent_drawn = (
+            self.stack[-1][1:] if self.stack else (_IDENTITY, 'black', True)
+        )
+        style = _style(attrs)
+        matrix = parent_matrix
+        if 'transform' in style:
+            matrix = _multiply(parent_matrix, parse_transform(style['transform']))
+        fill = style.get('fill', parent_fill)
+        drawn = parent_drawn and name not in _NOT_DRAWN
+        self.stack.append((name, matrix, fill, drawn))
+        if not drawn or name not in _SHAPES:
+            return
+        if fill.startswith('url('):
+            summary.uses_gradient = True
+        elif fill != 'none':
+            summary.fills.add(fill.lower())
+        points = self._points(name, attrs)
+        if points:
+            points = [_apply(matrix, x, y) for x, y in points]
+            xs = [x for x, _ in points]
+            ys = [y for _, y in points]
+            box = (min(xs), min(ys), max(xs), max(ys))
+            self.shapes.append((box, self._circle(name, attrs, matrix, fill)))
+
+    def end(self, name: str):
+        self.stack.pop()
+
+    def _root(self, name: str, attrs: dict[str, str]):
+        if name != 'svg':
+            raise IconError(f'the root element is <{name}>, not <svg>')
+        summary = self.summary
+        summary.width = _length(attrs.get('width'))
+        summary.height = _length(attrs.get('height'))
+        parts = _NUMBER_RE.findall(attrs.get('viewBox', ''))
+        if len(parts) == 4:
+            x, y, w, h = (float(p) for p in parts)
+            summary.view_box = (x, y, w, h)
+            if summary.width is None or summary.height is None:
+                summary.width, summary.height = w, h
+
+    @staticmethod
+    def _points(name: str, attrs: dict[str, str]) -> list[tuple[float, float]]:
+        def number(key: str) -> float:
+            return _length(attrs.get(key)) or 0.0
+
+        if name == 'path':
+            return path_points(attrs.get('d', ''))
+        if name in ('polygon', 'polyline'):
+            values = [float(v) for v in _NUMBER_RE.findall(attrs.get('points', ''))]
+            return list(zip(values[::2], values[1::2], strict=False))
+        if name == 'line':
+            return [(number('x1'), number('y1')), (number('x2'), number('y2'))]
+        if name in ('rect', 'image'):
+            x, y = number('x'), number('y')
+            return [(x, y), (x + number('width'), y + number('height'))]
+        if name in ('circle', 'ellipse'):
+            cx, cy = number('cx'), number('cy')
+            rx = number('r') if name == 'circle' else number('rx')
+            ry = number('r') if name == 'circle' else number('ry')
+            return [(cx - rx, cy - ry), (cx + rx, cy + ry)]
+        # Other shapes, such as <use>, aren't measured.
+        return []
+
+    @staticmethod
+    def _circle(name: str, attrs: dict[str, str], matrix: Matrix, fill: str) -> Circle | None:
+        if name == 'circle':
+            rx = ry = _length(attrs.get('r')) or 0.0
+        elif name == 'ellipse':
+            rx, ry = _length(attrs.get('rx')) or 0.0, _length(attrs.get('ry')) or 0.0
+        else:
+            return None
+        a, b, c, d, _, _ = matrix
+        scale_x, scale_y = math.hypot(a, b), math.hypot(c, d)
+        rx, ry = rx * scale_x, ry * scale_y
+        if not rx or not math.isclose(rx, ry, rel_tol=0.01):
+            return None
+        cx, cy = _apply(matrix, _length(attrs.get('cx')) or 0.0, _length(attrs.get('cy')) or 0.0)
+        return Circle(cx, cy, rx, fill)
+
+    def finish(self) -> IconSummary:
+        summary = self.summary
+        if summary.view_box is not None:
+            x, y, w, h = summary.view_box
+        elif summary.width and summary.height:
+            x, y, w, h = 0, 0, summary.width, summary.height
+        else:
+            return summary
+        size = min(w, h)
+        centre_x, centre_y = x + w / 2, y + h / 2
+        background = None
+        for i, (_, circle) in enumerate(self.shapes):
+            if (
+                circle is not None
+                and math.hypot(circle.cx - centre_x, circle.cy - centre_y)
+                <= CIRCLE_CENTRE_TOLERANCE * size
+                and circle.r
+                >= max(CIRCLE_MIN_RADIUS * size, summary.circle.r if summary.circle else 0)
+            ):
+                background = i
+                summary.circle = circle
+        # The logo is everything other than the background circle.
+        logo = [box for i, (box, _) in enumerate(self.shapes) if i != background]
+        if logo:
+            summary.logo_box = (
+                min(b[0] for b in logo),
+                min(b[1] for b in logo),
+                max(b[2] for b in logo),
+                max(b[3] for b in logo),
+            )
+        return summary
+
+
+def analyse_icon(path: pathlib.Path) -> IconSummary:
+    """Summarise the icon at ``path``.
+
+    Raises:
+        IconError: if the icon isn't a valid SVG document, or is larger than
+            `MAX_ICON_BYTES`, or has more than `MAX_ICON_ELEMENTS` elements.
+        OSError: if the file can't be read.
+    """
+    analyser = _Analyser()
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = analyser.start
+    parser.EndElementHandler = analyser.end
+
+    def reject_entities(*args: object):
+        raise IconError('entity declarations are not allowed')
+
+    parser.EntityDeclHandler = reject_entities
+    parser.SetParamEntityParsing(expat.XML_PARAM_ENTITY_PARSING_NEVER)
+    read = 0
+    try:
+        with path.open('rb') as f:
+            while chunk := f.read(READ_CHUNK_BYTES):
+                read += len(chunk)
+                if read > MAX_ICON_BYTES:
+                    raise IconError(f'larger than {MAX_ICON_BYTES} bytes')
+                parser.Parse(chunk, False)
+            parser.Parse(b'', True)
+    except expat.ExpatError as e:
+        raise IconError(f'not valid XML ({expat.errors.messages[e.code]}, line {e.lineno})') from e
+    except ValueError as e:
+        if isinstance(e, IconError):
+            raise
+        raise IconError(str(e)) from e
+    return analyser.finish()
@@ -0,0 +1,335 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A small, durable queue of listing review jobs.
+
+A single listing request often gets ``opened`` and ``labeled`` events within
+seconds of each other. The queue collapses those into a single evaluation:
+
+* A job for an issue and commit that is already waiting is not added again.
+* A job for an issue and commit that is already running is not added again
+  either: the caller can wait for the running job's result instead.
+* Only one job per issue runs at a time, so two reviews never race to update
+  the same issue.
+
+The queue is stored in SQLite, so it survives restarts and can be shared by
+several processes on the same host. Start and finish times are recorded for
+every job, for capacity planning.
+"""
+
+import argparse
+import dataclasses
+import json
+import pathlib
+import sqlite3
+import statistics
+import threading
+import time
+from collections.abc import Callable
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# How long a job can run before another process may assume it was abandoned.
+STALE_AFTER_SECONDS = 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    issue INTEGER NOT NULL,
+    commit_sha TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_issue ON jobs (issue, commit_sha, state);
+CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, id);
+"""
+
+
+@dataclasses.dataclass(frozen=True)
+class Job:
+    """A listing review job."""
+
+    id: int
+    issue: int
+    commit_sha: str
+    state: str
+    enqueued_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has finished, successfully or not."""
+        return self.state in (DONE, FAILED)
+
+    @property
+    def duration(self) -> float | None:
+        """How long the job ran for, in seconds, if it has finished."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+class JobQueue:
+    """A queue of listing review jobs, stored in SQLite.
+
+    Jobs that have been running for longer than ``stale_after`` seconds are
+    assumed to have been abandoned by a process that stopped, and are returned
+    to the queue when the database is opened. The default is longer than any
+    review takes, so that jobs that other processes sharing the database are
+    still running are left alone. Pass ``None`` to never return running jobs,
+    or ``0`` to return all of them (only when nothing else can be using the
+    database).
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path | str = ':memory:',
+        stale_after: float | None = STALE_AFTER_SECONDS,
+    ):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            if stale_after is not None:
+                self._conn.execute(
+                    'UPDATE jobs SET state = ?, started_at = NULL '
+                    'WHERE state = ? AND started_at <= ?',
+                    (PENDING, RUNNING, time.time() - stale_after),
+                )
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def _transaction(self, operation: Callable[[sqlite3.Connection], Job | None]) -> Job | None:
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = operation(self._conn)
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+            return result
+
+    def enqueue(self, issue: int, commit_sha: str = '') -> tuple[Job, bool]:
+        """Add a job for the issue at the commit, unless one is already queued.
+
+        An empty ``commit_sha`` means whatever the tip of the branch is when the
+        job runs.
+
+        Returns the job, and whether it was newly added. If a job for the same
+        issue and commit is already pending or running, that job is returned
+        instead.
+        """
+        added = False
+
+        def operation(conn: sqlite3.Connection) -> Job | None:
+            nonlocal added
+            row = conn.execute(
+                'SELECT * FROM jobs WHERE issue = ? AND commit_sha = ? AND state IN (?, ?) '
+                'ORDER BY id LIMIT 1',
+                (issue, commit_sha, PENDING, RUNNING),
+            ).fetchone()
+            if row is not None:
+                return Job(**row)
+            cursor = conn.execute(
+                'INSERT INTO jobs (issue, commit_sha, state, enqueued_at) VALUES (?, ?, ?, ?)',
+                (issue, commit_sha, PENDING, time.time()),
+            )
+            added = True
+            return _get(conn, cursor.lastrowid)
+
+        job = self._transaction(operation)
+        assert job is not None
+        return job, added
+
+    def claim(self, job_id: int | None = None) -> Job | None:
+        """Mark a pending job as running, and return it.
+
+        If ``job_id`` is not given, the oldest pending job is claimed. Jobs for
+        an issue that already has a running job are skipped. Returns ``None``
+        if there is no job that can be claimed.
+        """
+
+        def operation(conn: sqlite3.Connection) -> Job | None:
+            query = (
+                'SELECT * FROM jobs WHERE state = ? AND issue NOT IN '
+                '(SELECT issue FROM jobs WHERE state = ?)'
+            )
+            params: tuple[object, ...] = (PENDING, RUNNING)
+            if job_id is not None:
+                query += ' AND id = ?'
+                params += (job_id,)
+            row = conn.execute(query + ' ORDER BY id LIMIT 1', params).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                'UPDATE jobs SET state = ?, started_at = ? WHERE id = ?',
+                (RUNNING, time.time(), row['id']),
+            )
+            return _get(conn, row['id'])
+
+        return self._transaction(operation)
+
+    def complete(self, job_id: int, error: str | None = None) -> Job:
+        """Record that a running job has finished, failing if ``error`` is given."""
+
+        def operation(conn: sqlite3.Connection) -> Job | None:
+            conn.execute(
+                'UPDATE jobs SET state = ?, finished_at = ?, error = ? WHERE id = ?',
+                (FAILED if error else DONE, time.time(), error, job_id),
+            )
+            return _get(conn, job_id)
+
+        job = self._transaction(operation)
+        assert job is not None
+        return job
+
+    def get(self, job_id: int) -> Job | None:
+        """Get the current state of a job."""
+        with self._lock:
+            return _get(self._conn, job_id)
+
+    def active_count(self) -> int:
+        """The number of pending and running jobs."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT COUNT(*) FROM jobs WHERE state IN (?, ?)', (PENDING, RUNNING)
+            ).fetchone()
+        return row[0]
+
+    def wait(self, job_id: int, timeout: float | None = None, interval: float = 0.5) -> Job:
+        """Wait for a job to finish, and return it.
+
+        The job may be run by another process sharing the database, so this
+        polls rather than waiting on an in-process event.
+
+        Raises:
+            TimeoutError: if the job has not finished within ``timeout`` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job.finished:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f'Job {job_id} did not finish within {timeout} seconds')
+            time.sleep(interval)
+
+    def stats(self) -> dict[str, float | int]:
+        """Summary statistics for finished jobs, for capacity planning."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT state, started_at, finished_at, enqueued_at FROM jobs '
+                'WHERE state IN (?, ?)',
+                (DONE, FAILED),
+            ).fetchall()
+        durations = sorted(row['finished_at'] - row['started_at'] for row in rows)
+        waits = sorted(row['started_at'] - row['enqueued_at'] for row in rows)
+        result: dict[str, float | int] = {
+            'finished': len(rows),
+            'failed': sum(1 for row in rows if row['state'] == FAILED),
+            'pending_or_running': self.active_count(),
+        }
+        if durations:
+            result['duration_mean'] = statistics.fmean(durations)
+            result['duration_p50'] = _percentile(durations, 50)
+            result['duration_p95'] = _percentile(durations, 95)
+            result['duration_max'] = durations[-1]
+            result['wait_p95'] = _percentile(waits, 95)
+        return result
+
+
+def _get(conn: sqlite3.Connection, job_id: int | None) -> Job | None:
+    row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    return None if row is None else Job(**row)
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """The nearest-rank percentile of already sorted ``values``."""
+    index = max(0, min(len(values) - 1, round(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+def run_job(
+    jobs: JobQueue,
+    issue: int,
+    review: Callable[[], object],
+    commit_sha: str = '',
+    timeout: float | None = None,
+    interval: float = 0.5,
+) -> Job:
+    """Run ``review`` for the issue through the queue.
+
+    If the same issue and commit is already being reviewed (for example, by
+    another process handling a near-simultaneous event), this waits for that
+    review to finish instead of running it again. If a review of a different
+    commit of the same issue is running, this waits for it to finish and then
+    runs the review.
+
+    Raises:
+        TimeoutError: if the job has not finished within ``timeout`` seconds.
+    """
+    job, _ = jobs.enqueue(issue, commit_sha)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        claimed = jobs.claim(job.id) if job.state == PENDING else None
+        if claimed is not None:
+            break
+        current = jobs.get(job.id)
+        assert current is not None
+        if current.finished:
+            return current
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f'Job {job.id} did not finish within {timeout} seconds')
+        time.sleep(interval)
+        job = current
+    try:
+        review()
+    except BaseException as e:
+        # Including interruptions, so that the job isn't left running (and
+        # blocking later reviews of the issue) until it is considered stale.
+        jobs.complete(claimed.id, error=f'{type(e).__name__}: {e}')
+        raise
+    return jobs.complete(claimed.id)
+
+
+def main():
+    """Print statistics about the jobs in a queue database."""
+    parser = argparse.ArgumentParser(description='Show listing review job statistics.')
+    parser.add_argument('db', type=pathlib.Path, help='Path to the job queue database')
+    args = parser.parse_args()
+    jobs = JobQueue(args.db, stale_after=None)
+    try:
+        print(json.dumps(jobs.stats(), indent=2))
+    finally:
+        jobs.close()
+
+
+if __name__ == '__main__':
+    main()
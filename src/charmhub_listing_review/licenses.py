@@ -0,0 +1,202 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Identify a license from its text.
+
+The text of each accepted license is bundled in the ``licenses`` directory of
+the package, named by its SPDX identifier. Texts are compared by
+fingerprint: the text is lower-cased, copyright lines are dropped, and it is
+split into words (so punctuation, Markdown, whitespace, and line wrapping make
+no difference). Each run of `SHINGLE_SIZE` consecutive words is hashed, and
+the similarity of two texts is the proportion of those hashes that they share.
+
+The fingerprints of the bundled licenses are built once and cached on disk,
+in ``~/.cache/charmhub-listing-review/license-index.json`` by default, or the
+file in the ``CHARMHUB_LISTING_REVIEW_LICENSE_INDEX`` environment variable.
+The cache is rebuilt whenever the bundled texts or the fingerprinting change.
+
+Note that the text of a license doesn't say whether the "only" or "or later"
+variant (for example, of the GPL) applies, so neither is included in the ID.
+"""
+
+import collections
+import dataclasses
+import hashlib
+import importlib.resources
+import json
+import os
+import pathlib
+import re
+import tempfile
+import threading
+
+INDEX_PATH_ENV = 'CHARMHUB_LISTING_REVIEW_LICENSE_INDEX'
+# Bump this whenever the normalisation or fingerprinting changes, so that
+# cached indexes are rebuilt.
+INDEX_VERSION = 1
+SHINGLE_SIZE = 5
+# How similar the text must be to a known license to be accepted as that
+# license, and to be reported as resembling it.
+MATCH_THRESHOLD = 0.85
+RESEMBLANCE_THRESHOLD = 0.5
+
+_COPYRIGHT_LINE = re.compile(r'^\s*(copyright\b|\(c\)|©)', re.IGNORECASE | re.MULTILINE)
+_WORD = re.compile(r'[a-z0-9]+')
+# Spellings that are used interchangeably in license files.
+_EQUIVALENT_WORDS = {'licence': 'license', 'licences': 'licenses', 'licenced': 'licensed'}
+
+
+@dataclasses.dataclass(frozen=True)
+class LicenseMatch:
+    """The known license that a text is most similar to."""
+
+    spdx_id: str
+    score: float  # From 0 (nothing in common) to 1 (the same text).
+
+    @property
+    def accepted(self) -> bool:
+        """Whether the text is close enough to be accepted as the license."""
+        return self.score >= MATCH_THRESHOLD
+
+
+def words(text: str) -> list[str]:
+    """Normalise the text of a license to a list of words."""
+    text = '\n'.join(line for line in text.lower().splitlines() if not _COPYRIGHT_LINE.match(line))
+    return [_EQUIVALENT_WORDS.get(word, word) for word in _WORD.findall(text)]
+
+
+def fingerprint(text: str) -> set[int]:
+    """The hashes of each run of `SHINGLE_SIZE` words in the text."""
+    tokens = words(text)
+    if len(tokens) < SHINGLE_SIZE:
+        tokens += [''] * (SHINGLE_SIZE - len(tokens))
+    return {
+        int.from_bytes(
+            hashlib.blake2b(
+                ' '.join(tokens[i : i + SHINGLE_SIZE]).encode(), digest_size=8
+            ).digest()
+        )
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+def bundled_texts() -> dict[str, str]:
+    """The text of each bundled license, by SPDX identifier."""
+    directory = importlib.resources.files(__package__) / 'licenses'
+    return {
+        path.name.removesuffix('.txt'): path.read_text(encoding='utf-8')
+        for path in sorted(directory.iterdir(), key=lambda p: p.name)
+        if path.name.endswith('.txt')
+    }
+
+
+class LicenseIndex:
+    """The fingerprints of the known licenses, indexed for fast lookup."""
+
+    def __init__(self, fingerprints: dict[str, set[int]]):
+        self.spdx_ids = sorted(fingerprints)
+        self._sizes = [len(fingerprints[spdx_id]) for spdx_id in self.spdx_ids]
+        # Each shingle maps to the licenses that contain it, so a text can be
+        # compared to every license with a single pass over its shingles.
+        self._postings: dict[int, list[int]] = collections.defaultdict(list)
+        for i, spdx_id in enumerate(self.spdx_ids):
+            for shingle in fingerprints[spdx_id]:
+                self._postings[shingle].append(i)
+
+    @classmethod
+    def build(cls, texts: dict[str, str]) -> 'LicenseIndex':
+        """Build an index of the licenses in ``texts`` (by SPDX identifier)."""
+        return cls({spdx_id: fingerprint(text) for spdx_id, text in texts.items()})
+
+    @classmethod
+    def load(cls, path: pathlib.Path | str | None = None) -> 'LicenseIndex':
+        """Load the index of the bundled licenses, from the cache at ``path`` if it is current.
+
+        If the cache is missing or out of date, the index is built and the
+        cache is written.
+        """
+        if path is None:
+            path = (
+                pathlib.Path.home() / '.cache' / 'charmhub-listing-review' / 'license-index.json'
+            )
+        path = pathlib.Path(path)
+        texts = bundled_texts()
+        source = hashlib.sha256(
+            json.dumps([INDEX_VERSION, SHINGLE_SIZE, texts], sort_keys=True).encode()
+        ).hexdigest()
+        try:
+            with path.open(encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached['source'] == source:
+                return cls({
+                    spdx_id: set(shingles) for spdx_id, shingles in cached['licenses'].items()
+                })
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+        index = cls.build(texts)
+        index._save(path, source)
+        return index
+
+    def _save(self, path: pathlib.Path, source: str):
+        licenses: dict[str, list[int]] = {spdx_id: [] for spdx_id in self.spdx_ids}
+        for shingle, indexes in self._postings.items():
+            for i in indexes:
+                licenses[self.spdx_ids[i]].append(shingle)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'source': source, 'licenses': licenses}, f)
+            os.replace(temp_path, path)
+        except OSError:
+            # The cache is only an optimisation, so failing to write it is fine.
+            pass
+
+    def identify(self, text: str) -> LicenseMatch | None:
+        """Find the known license that ``text`` is most similar to.
+
+        The score is the Jaccard similarity of the fingerprints. Returns
+        ``None`` if the text doesn't resemble any of the licenses.
+        """
+        shingles = fingerprint(text)
+        shared = [0] * len(self.spdx_ids)
+        for shingle in shingles:
+            for i in self._postings.get(shingle, ()):
+                shared[i] += 1
+        best: LicenseMatch | None = None
+        for i, spdx_id in enumerate(self.spdx_ids):
+            score = shared[i] / (len(shingles) + self._sizes[i] - shared[i])
+            if best is None or score > best.score:
+                best = LicenseMatch(spdx_id, score)
+        if best is None or best.score < RESEMBLANCE_THRESHOLD:
+            return None
+        return best
+
+
+_index: LicenseIndex | None = None
+_index_lock = threading.Lock()
+
+
+def index() -> LicenseIndex:
+    """The index of the bundled licenses, shared by the whole process."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = LicenseIndex.load(os.environ.get(INDEX_PATH_ENV) or None)
+        return _index
+
+
+def identify(text: str) -> LicenseMatch | None:
+    """Find the known license that ``text`` is most similar to (see `LicenseIndex.identify`)."""
+    return index().identify(text)
@@ -0,0 +1,238 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Check that links resolve, several at a time.
+
+`probe` checks a single URL. It first sends a ``HEAD`` request, which is
+usually all that is needed. Some servers (particularly documentation hosts
+and CDNs) reject ``HEAD`` with a 400, 403, 405, or 501, so then it falls back
+to a ``GET`` for just the first byte (with a ``Range`` header), and reads at
+most that much of the body. Hosts that have rejected ``HEAD`` once are sent
+the ``GET`` straight away after that. Transient failures (no response, or
+a 408, 429, or 5xx status) are retried with jittered exponential backoff,
+for as long as the overall deadline allows. The result records which
+request worked, and how many attempts it took.
+
+A `LinkChecker` checks a batch of URLs concurrently, while being polite to
+the servers: no more than ``max_per_host`` requests are made to the same host
+at once. A URL that is already being checked (by this batch, or by another
+check running at the same time) isn't requested again: the second caller
+waits for the first request to finish and shares its result. Results aren't
+kept once the request is finished, so a later check sees the current state
+of the link.
+
+All of the checks in the process share the `checker`.
+"""
+
+import concurrent.futures
+import dataclasses
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Callable, Iterable
+
+MAX_WORKERS = 8
+MAX_PER_HOST = 2
+
+# The total time that probing a URL can take, including retries.
+PROBE_DEADLINE = 15
+MAX_PROBE_ATTEMPTS = 3
+# The first retry is after a random delay of up to this many seconds, and the
+# maximum delay doubles for each retry after that.
+RETRY_BACKOFF = 0.5
+HEAD_REJECTED_STATUSES = frozenset({400, 403, 405, 501})
+TRANSIENT_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+RANGE_GET = 'GET (range)'
+
+# An email address, optionally as 'mailto:' or 'Name <address>'.
+_EMAIL_RE = re.compile(r'^(?:mailto:)?(?:[^<>]*<)?[^@\s<>]+@[^@\s<>]+\.[^@\s<>]+>?$')
+
+
+@dataclasses.dataclass(frozen=True)
+class LinkStatus:
+    """The result of checking a URL."""
+
+    url: str
+    status: int | None = None  # The HTTP status, if there was a response.
+    error: str = ''  # Why there wasn't a response, if there wasn't.
+    method: str = 'HEAD'  # The request that gave this result: 'HEAD' or `RANGE_GET`.
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        """Whether the URL resolved with a successful (non-error) status."""
+        return self.status is not None and self.status < 400
+
+    @property
+    def transient(self) -> bool:
+        """Whether the failure might not happen if the request is tried again."""
+        if self.status is not None:
+            return self.status in TRANSIENT_STATUSES
+        return self.error != '' and not self.error.startswith('invalid URL')
+
+    def describe(self) -> str:
+        """A short description of the result, for the report."""
+        result = f'status {self.status}' if self.status is not None else self.error
+        result = result or 'no response'
+        if self.attempts > 1:
+            result += f', after {self.attempts} attempts'
+        return result
+
+
+def is_url(value: str) -> bool:
+    """Whether ``value`` is an HTTP or HTTPS URL."""
+    return urllib.parse.urlsplit(value).scheme in {'http', 'https'}
+
+
+def is_email(value: str) -> bool:
+    """Whether ``value`` looks like an email address."""
+    return bool(_EMAIL_RE.match(value.strip()))
+
+
+def _request(url: str, method: str, timeout: float) -> LinkStatus:
+    """Make a single ``HEAD`` or `RANGE_GET` request."""
+    headers = {'Range': 'bytes=0-0'} if method == RANGE_GET else {}
+    try:
+        request = urllib.request.Request(  # noqa: S310
+            url, headers=headers, method='GET' if method == RANGE_GET else method
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
+            # A server that ignores the range sends the whole body, so only
+            # read as much as was asked for.
+            if method == RANGE_GET:
+                response.read(1)
+            return LinkStatus(url, response.status, method=method)
+    except urllib.error.HTTPError as e:
+        e.close()
+        return LinkStatus(url, e.code, method=method)
+    except urllib.error.URLError as e:
+        return LinkStatus(url, error=str(e.reason), method=method)
+    except ValueError as e:
+        return LinkStatus(url, error=f'invalid URL: {e}', method=method)
+    except OSError as e:
+        return LinkStatus(url, error=str(e) or type(e).__name__, method=method)
+
+
+# The hosts that have rejected a HEAD request, so are sent a GET straight away.
+_head_rejected_hosts: set[str] = set()
+_head_rejected_lock = threading.Lock()
+
+
+def probe(url: str, *, timeout: float = 5, deadline: float = PROBE_DEADLINE) -> LinkStatus:
+    """Check whether ``url`` resolves, falling back from ``HEAD`` and retrying if needed.
+
+    Each request takes at most ``timeout`` seconds, and all of the attempts
+    together at most ``deadline`` seconds.
+    """
+    end = time.monotonic() + deadline
+    host = urllib.parse.urlsplit(url).netloc.lower()
+    with _head_rejected_lock:
+        method = RANGE_GET if host in _head_rejected_hosts else 'HEAD'
+    attempt = 1
+    while True:
+        result = _request(url, method, max(0.1, min(timeout, end - time.monotonic())))
+        if method == 'HEAD' and result.status in HEAD_REJECTED_STATUSES:
+            method = RANGE_GET
+            result = _request(url, method, max(0.1, min(timeout, end - time.monotonic())))
+            if result.status not in HEAD_REJECTED_STATUSES:
+                with _head_rejected_lock:
+                    _head_rejected_hosts.add(host)
+        result = dataclasses.replace(result, attempts=attempt)
+        if not result.transient or attempt >= MAX_PROBE_ATTEMPTS:
+            return result
+        delay = random.uniform(0, RETRY_BACKOFF * 2 ** (attempt - 1))  # noqa: S311
+        if time.monotonic() + delay >= end:
+            return result
+        time.sleep(delay)
+        attempt += 1
+
+
+class LinkChecker:
+    """Check URLs concurrently, with de-duplication and per-host limits."""
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        max_per_host: int = MAX_PER_HOST,
+        probe_url: Callable[[str], LinkStatus] | None = None,
+    ):
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        # By default, the module's `probe` is looked up for each request.
+        self._probe_url = probe_url
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, concurrent.futures.Future[LinkStatus]] = {}
+        self._hosts: dict[str, threading.BoundedSemaphore] = {}
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._hosts[host]
+
+    def _run(self, url: str, future: concurrent.futures.Future[LinkStatus]):
+        try:
+            with self._host_slot(url):
+                result = (self._probe_url or probe)(url)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._in_flight.pop(url, None)
+
+    def check_all(self, urls: Iterable[str]) -> dict[str, LinkStatus]:
+        """Check each of the URLs (once, however often it appears), and return the results."""
+        unique = list(dict.fromkeys(urls))
+        futures: dict[str, concurrent.futures.Future[LinkStatus]] = {}
+        owned = []
+        with self._lock:
+            for url in unique:
+                if url in self._in_flight:
+                    futures[url] = self._in_flight[url]
+                else:
+                    futures[url] = self._in_flight[url] = concurrent.futures.Future()
+                    owned.append(url)
+        if len(owned) == 1:
+            self._run(owned[0], futures[owned[0]])
+        elif owned:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(owned))
+            ) as executor:
+                for url in owned:
+                    executor.submit(self._run, url, futures[url])
+        return {url: futures[url].result() for url in unique}
+
+    def check(self, url: str) -> LinkStatus:
+        """Check a single URL."""
+        return self.check_all([url])[url]
+
+
+_checker: LinkChecker | None = None
+_checker_lock = threading.Lock()
+
+
+def checker() -> LinkChecker:
+    """The link checker shared by the whole process."""
+    global _checker
+    with _checker_lock:
+        if _checker is None:
+            _checker = LinkChecker()
+        return _checker
@@ -0,0 +1,199 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Check that a ``uv.lock`` or ``poetry.lock`` is consistent with ``pyproject.toml``.
+
+Lock files can be several megabytes, and only a small part of them is needed
+here: the name and version of each locked package, and the Python versions
+that the lock was resolved for. Rather than parsing the whole TOML document,
+the lock is scanned line by line, picking out the top-level keys of each
+``[[package]]`` table, the ``requires-python`` key of a ``uv.lock``, and the
+``python-versions`` key in the ``[metadata]`` table of a ``poetry.lock``. Both
+tools write one key per line, and indent the contents of multi-line arrays,
+so nothing else can be mistaken for those keys.
+
+The summary of each lock is stored in the result cache (see `result_cache`),
+keyed by the hash of the lock's content, so an unchanged lock isn't scanned
+again.
+"""
+
+import dataclasses
+import json
+import pathlib
+import re
+from typing import Any
+
+from . import file_index, result_cache
+
+# Bump this whenever `scan` changes, so that cached summaries from the
+# previous implementation aren't reused.
+SCANNER_VERSION = 1
+LOCK_FILE_NAMES = ('uv.lock', 'poetry.lock')
+
+_TABLE_RE = re.compile(r'^\[(\[?)\s*([^\[\]]+?)\s*\]\]?\s*(?:#.*)?$')
+_STRING_KEY_RE = re.compile(r'^([A-Za-z0-9_-]+)\s*=\s*"((?:[^"\\]|\\.)*)"\s*(?:#.*)?$')
+# The distribution name at the start of a PEP 508 requirement.
+_REQUIREMENT_NAME_RE = re.compile(r'^\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)')
+
+
+@dataclasses.dataclass(frozen=True)
+class LockSummary:
+    """The parts of a lock file needed to check it against ``pyproject.toml``."""
+
+    # The locked versions of each package, by normalised name. There may be
+    # more than one version when the resolution forks (for example, by Python
+    # version).
+    packages: dict[str, tuple[str, ...]] = dataclasses.field(default_factory=dict)
+    requires_python: str | None = None
+
+
+def normalise_name(name: str) -> str:
+    """Normalise a distribution name, as described in PEP 503."""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def _normalise_specifier(specifier: str) -> str:
+    return ','.join(sorted(re.sub(r'\s+', '', part) for part in specifier.split(',') if part))
+
+
+def scan(path: pathlib.Path) -> LockSummary:
+    """Scan a ``uv.lock`` or ``poetry.lock`` file, without parsing all of it."""
+    python_key = (
+        ('metadata', 'python-versions')
+        if path.name == 'poetry.lock'
+        else (None, 'requires-python')
+    )
+    packages: dict[str, list[str]] = {}
+    requires_python = None
+    table: str | None = None
+    name = version = None
+
+    def add_package():
+        if name is not None:
+            versions = packages.setdefault(normalise_name(name), [])
+            if version is not None and version not in versions:
+                versions.append(version)
+
+    with path.open(encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.rstrip()
+            if match := _TABLE_RE.match(line):
+                if table == '[[package]]':
+                    add_package()
+                # Sub-tables like [package.metadata] belong to the previous
+                # package, but don't hold its name or version.
+                table = f'[[{match.group(2)}]]' if match.group(1) else match.group(2)
+                name = version = None
+                continue
+            match = _STRING_KEY_RE.match(line)
+            if match is None:
+                continue
+            key, value = match.groups()
+            if table == '[[package]]' and key == 'name':
+                name = value
+            elif table == '[[package]]' and key == 'version':
+                version = value
+            elif (table, key) == python_key:
+                requires_python = value
+    if table == '[[package]]':
+        add_package()
+    return LockSummary(
+        {name: tuple(versions) for name, versions in packages.items()}, requires_python
+    )
+
+
+def summarise(path: pathlib.Path) -> LockSummary:
+    """Scan the lock file, using the cached summary if its content is unchanged."""
+    files = file_index.lookup(path.parent)
+
+    def compute() -> str:
+        summary = scan(path)
+        return json.dumps({
+            'packages': summary.packages,
+            'requires_python': summary.requires_python,
+        })
+
+    cached = json.loads(
+        result_cache.cache().run(
+            'lock_file', SCANNER_VERSION, path.parent, [path.name], compute, file_hash=files.hash
+        )
+    )
+    return LockSummary(
+        {name: tuple(versions) for name, versions in cached['packages'].items()},
+        cached['requires_python'],
+    )
+
+
+def declared_dependencies(pyproject: dict[str, Any]) -> set[str]:
+    """The normalised names of every dependency declared in ``pyproject.toml``.
+
+    This includes optional dependencies and dependency groups, since both uv
+    and Poetry lock those as well.
+    """
+    requirements: list[str] = []
+    project = pyproject.get('project', {})
+    requirements.extend(project.get('dependencies', []))
+    for extra in project.get('optional-dependencies', {}).values():
+        requirements.extend(extra)
+    for group in pyproject.get('dependency-groups', {}).values():
+        # Groups can also include other groups, with a table.
+        requirements.extend(group)
+    tool = pyproject.get('tool', {})
+    requirements.extend(tool.get('uv', {}).get('dev-dependencies', []))
+    names = {
+        normalise_name(match.group(1))
+        for requirement in requirements
+        if isinstance(requirement, str) and (match := _REQUIREMENT_NAME_RE.match(requirement))
+    }
+    poetry = tool.get('poetry', {})
+    tables = [poetry.get('dependencies', {}), poetry.get('dev-dependencies', {})]
+    tables.extend(group.get('dependencies', {}) for group in poetry.get('group', {}).values())
+    names.update(normalise_name(name) for table in tables for name in table if name != 'python')
+    return names
+
+
+def declared_requires_python(pyproject: dict[str, Any]) -> str | None:
+    """The Python versions that ``pyproject.toml`` says the project supports."""
+    requires_python = pyproject.get('project', {}).get('requires-python')
+    if requires_python is None:
+        requires_python = (
+            pyproject.get('tool', {}).get('poetry', {}).get('dependencies', {}).get('python')
+        )
+    return requires_python if isinstance(requires_python, str) else None
+
+
+def inconsistencies(pyproject: dict[str, Any], lock: LockSummary, lock_name: str) -> list[str]:
+    """Describe the ways in which the lock doesn't match ``pyproject.toml``.
+
+    Returns an empty list if the lock covers all of the declared dependencies
+    and was resolved for the declared Python versions.
+    """
+    problems = []
+    missing = sorted(declared_dependencies(pyproject) - lock.packages.keys())
+    if missing:
+        names = ', '.join(f'`{name}`' for name in missing)
+        problems.append(f"`{lock_name}` doesn't include these dependencies: {names}.")
+    requires_python = declared_requires_python(pyproject)
+    if requires_python is not None:
+        if lock.requires_python is None:
+            problems.append(
+                f"`{lock_name}` doesn't say which Python versions it was resolved for, "
+                f'but `pyproject.toml` requires `{requires_python}`.'
+            )
+        elif _normalise_specifier(lock.requires_python) != _normalise_specifier(requires_python):
+            problems.append(
+                f'`{lock_name}` was resolved for Python `{lock.requires_python}`, '
+                f'but `pyproject.toml` requires `{requires_python}`.'
+            )
+    return problems
@@ -0,0 +1,198 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A persistent cache of the results of checks that only depend on file content.
+
+Many of the checks only read one or two files from the charm (such as
+`charmcraft.yaml` or `pyproject.toml`). The result of such a check is stored
+under a key made from the check's name, its version, and the hash of each of
+its input files, so a check of unchanged files is answered from the cache,
+whichever repository, branch, or commit the files came from. Bumping a
+check's version means that results from the previous implementation are no
+longer used. The same store also holds a few results that aren't keyed by
+files, such as the links in the documentation that resolved recently (see
+`doc_links`), which are only used for a limited time.
+
+The cache is stored as one JSON file per entry, in
+``~/.cache/charmhub-listing-review/results`` by default, or the directory in
+the ``CHARMHUB_LISTING_REVIEW_CACHE_DIR`` environment variable. Entries can be
+inspected with ``python -m charmhub_listing_review.result_cache``.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+CACHE_DIR_ENV = 'CHARMHUB_LISTING_REVIEW_CACHE_DIR'
+
+
+def _file_hash(path: pathlib.Path) -> str | None:
+    """The SHA-256 of the file's content, or ``None`` if it doesn't exist."""
+    try:
+        with path.open('rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+
+
+class ResultCache:
+    """Check results, stored by a hash of the check and its inputs."""
+
+    def __init__(self, path: pathlib.Path | str | None = None):
+        if path is None:
+            path = pathlib.Path.home() / '.cache' / 'charmhub-listing-review' / 'results'
+        self.path = pathlib.Path(path)
+
+    @staticmethod
+    def key(
+        check: str,
+        version: int,
+        base_dir: pathlib.Path,
+        inputs: Iterable[str],
+        file_hash: Callable[[pathlib.Path], str | None] = _file_hash,
+    ) -> tuple[str, dict[str, str | None]]:
+        """The cache key for running a check against the inputs in ``base_dir``.
+
+        Returns the key, and the hash of each input file (``None`` for files
+        that don't exist, since their absence can also affect the result).
+        ``file_hash`` calculates the SHA-256 of a file, for callers that
+        already know it.
+        """
+        hashes = {name: file_hash(base_dir / name) for name in sorted(inputs)}
+        material = json.dumps([check, version, hashes], sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest(), hashes
+
+    def _entry_path(self, key: str) -> pathlib.Path:
+        return self.path / key[:2] / f'{key}.json'
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get the cache entry for ``key``, if there is one."""
+        try:
+            with self._entry_path(key).open(encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and 'result' in entry else None
+
+    def put(self, key: str, check: str, version: int, inputs: dict[str, str | None], result: str):
+        """Store the result of a check."""
+        entry = {
+            'key': key,
+            'check': check,
+            'version': version,
+            'inputs': inputs,
+            'result': result,
+            'created': time.time(),
+        }
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file and rename it, so concurrent readers
+            # never see a partial entry.
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except OSError:
+            # The cache is only an optimisation, so failing to write it is fine.
+            pass
+
+    def run(
+        self,
+        check: str,
+        version: int,
+        base_dir: pathlib.Path,
+        inputs: Iterable[str],
+        compute: Callable[[], str],
+        file_hash: Callable[[pathlib.Path], str | None] = _file_hash,
+    ) -> str:
+        """Return the cached result of the check, or compute and store it."""
+        key, hashes = self.key(check, version, base_dir, inputs, file_hash)
+        entry = self.get(key)
+        if entry is not None:
+            return entry['result']
+        result = compute()
+        self.put(key, check, version, hashes, result)
+        return result
+
+    def entries(self) -> Iterator[dict[str, Any]]:
+        """All of the entries in the cache."""
+        for path in sorted(self.path.glob('*/*.json')):
+            entry = self.get(path.stem)
+            if entry is not None:
+                yield entry
+
+    def clear(self) -> int:
+        """Remove every entry from the cache, and return how many there were."""
+        count = 0
+        for path in self.path.glob('*/*.json'):
+            path.unlink(missing_ok=True)
+            count += 1
+        return count
+
+
+_cache: ResultCache | None = None
+_cache_lock = threading.Lock()
+
+
+def cache() -> ResultCache:
+    """The result cache shared by the whole process."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache(os.environ.get(CACHE_DIR_ENV) or None)
+        return _cache
+
+
+def main():
+    """Inspect or clear the check result cache."""
+    parser = argparse.ArgumentParser(description='Inspect the cached check results.')
+    parser.add_argument(
+        '--cache-dir',
+        type=pathlib.Path,
+        help=f'Path to the cache (default: ${CACHE_DIR_ENV}, or ~/.cache/...)',
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    list_parser = subparsers.add_parser('list', help='List the cached results')
+    list_parser.add_argument('--check', help='Only list results of this check')
+    show_parser = subparsers.add_parser('show', help='Show a cached result in full')
+    show_parser.add_argument('key', help='The cache key (or a unique prefix of it)')
+    subparsers.add_parser('clear', help='Remove all cached results')
+    args = parser.parse_args()
+
+    result_cache = ResultCache(args.cache_dir) if args.cache_dir else cache()
+    if args.command == 'list':
+        for entry in result_cache.entries():
+            if args.check and entry['check'] != args.check:
+                continue
+            ticked = 'x' if entry['result'].startswith('* [x]') else ' '
+            print(f'{entry["key"][:12]}  [{ticked}]  {entry["check"]} v{entry["version"]}')
+    elif args.command == 'show':
+        matches = [e for e in result_cache.entries() if e['key'].startswith(args.key)]
+        if len(matches) != 1:
+            raise SystemExit(f'{len(matches)} entries match {args.key!r}')
+        print(json.dumps(matches[0], indent=2))
+    else:
+        print(f'Removed {result_cache.clear()} cached results.')
+
+
+if __name__ == '__main__':
+    main()
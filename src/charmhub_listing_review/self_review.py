@@ -31,8 +31,16 @@ console in a user-friendly format instead of updating a GitHub issue.
 import argparse
 import sys
 
-from .evaluate import evaluate, get_default_branch
-from .update_issue import issue_comment
+from .evaluate import (
+    evaluate,
+    evaluate_charms,
+    evaluate_path,
+    get_default_branch,
+    local_repository,
+    remote_repository,
+    resolve_commit,
+)
+from .update_issue import add_checklist_section, issue_comment
 
 
 def format_checklist_for_console(checklist_markdown: str) -> str:
@@ -58,17 +66,8 @@ def format_checklist_for_console(checklist_markdown: str) -> str:
     return '\n'.join(formatted_lines)
 
 
-def print_self_review_results(
-    charm_name: str,
-    project_repo: str = '',
-    ci_linting: str = '',
-    branch: str = '',
-    charm_dir: str = '.',
-):
-    """Print the self-review results to console."""
-    print(f"\n\033[1m🔍 Charmhub Public Listing Self-Review for '{charm_name}'\033[0m")
-    print('=' * (45 + len(charm_name)))
-
+def _self_review_checklist(charm_name: str) -> str:
+    """The listing checklist, without the items that link to the issue's details."""
     comment = issue_comment(
         charm_name,
         '',  # demo_url is not used.
@@ -93,54 +92,35 @@ def print_self_review_results(
 
     # TODO: it would be great if we had a better wrapping story, both for GitHub and console.
     comment = comment.replace('are also\nrequired for listing.', 'are also required for listing.')
+    return comment
 
-    if project_repo:
-        # Like update-issue, this assumes it's GitHub for now.
-        default_branch = branch or get_default_branch(project_repo)
-        contribution_url = f'{project_repo}/blob/{default_branch}/CONTRIBUTING.md'
-        license_url = f'{project_repo}/blob/{default_branch}/LICENSE'
-        security_url = f'{project_repo}/blob/{default_branch}/SECURITY.md'
-
-        try:
-            results = evaluate(
-                charm_name,
-                project_repo,
-                ci_linting or '',
-                contribution_url,
-                license_url,
-                security_url,
-                default_branch,
-                charm_dir=charm_dir,
-            )
 
-            automated_checks = set()
-            for result in results:
-                if not result:
-                    continue
-
-                unchecked_version = result.replace('* [x]', '* [ ]')
-                automated_checks.add(unchecked_version)
-                if unchecked_version in comment:
-                    if result.startswith('* [x]'):
-                        comment = comment.replace(unchecked_version, result)
-                    else:
-                        failed_version = unchecked_version.replace('* [ ]', '* [o]')
-                        comment = comment.replace(unchecked_version, failed_version)
-
-            # For checks that weren't automated, we already leave them as '* [ ]' (unknown)
-        except Exception as e:
-            print('\n⚠️  Warning: Could not run automated checks on repository.')
-            print(
-                '   This may happen if the repository is not accessible, not a charm repository,'
-                '   or missing required charm files like charmcraft.yaml.'
-            )
-            if 'No such file or directory' in str(e) and 'charmcraft.yaml' in str(e):
-                print('   The repository appears to be missing a charmcraft.yaml file.')
-            elif 'returned non-zero exit status' in str(e):
-                print('   Could not clone the repository.')
+def _apply_results(comment: str, results: list[str]) -> str:
+    """Tick passed items, and mark failed items, in the checklist."""
+    for result in results:
+        if not result:
+            continue
+        if not result.startswith('* ['):
+            comment = add_checklist_section(comment, result)
+            continue
+        # A result may have details on the lines after the item itself.
+        unchecked_version = result.split('\n', 1)[0].replace('* [x]', '* [ ]')
+        if unchecked_version in comment:
+            if result.startswith('* [x]'):
+                comment = comment.replace(unchecked_version, result)
             else:
-                print(f'   Error details: {e}')
+                failed_version = result.replace('* [ ]', '* [o]', 1)
+                comment = comment.replace(unchecked_version, failed_version)
+    # For checks that weren't automated, we already leave them as '* [ ]' (unknown)
+    return comment
+
 
+def _print_header(charm_name: str):
+    print(f"\n\033[1m🔍 Charmhub Public Listing Self-Review for '{charm_name}'\033[0m")
+    print('=' * (45 + len(charm_name)))
+
+
+def _print_checklist(comment: str):
     formatted_checklist = format_checklist_for_console(comment)
     print(formatted_checklist)
 
@@ -152,6 +132,9 @@ def print_self_review_results(
         f'\n\033[1m📊 Progress: {completed_count} passed, {failed_count} failed, '
         f'{unknown_count} manual review needed\033[0m'
     )
+
+
+def _print_footer():
     print('\n💡 Note: This self-review covers automated checks only.')
     print('   A human reviewer will perform additional checks during the official review process.')
     print('\n📋 To submit your charm for official review, create an issue at:')
@@ -161,6 +144,130 @@ def print_self_review_results(
     )
 
 
+def _print_evaluation_error(e: Exception):
+    print('\n⚠️  Warning: Could not run automated checks on repository.')
+    print(
+        '   This may happen if the repository is not accessible, not a charm repository,'
+        '   or missing required charm files like charmcraft.yaml.'
+    )
+    if 'No such file or directory' in str(e) and 'charmcraft.yaml' in str(e):
+        print('   The repository appears to be missing a charmcraft.yaml file.')
+    elif 'returned non-zero exit status' in str(e):
+        print('   Could not clone the repository.')
+    else:
+        print(f'   Error details: {e}')
+
+
+def _document_urls(project_repo: str, branch: str) -> tuple[str, str, str]:
+    """The URLs of the contribution guidelines, license, and security policy."""
+    if not project_repo:
+        return '', '', ''
+    # Like update-issue, this assumes it's GitHub for now.
+    # The remote is resolved once, and shared with the evaluation.
+    remote = remote_repository(project_repo)
+    default_branch = branch or remote.default_branch or 'main'
+    return (
+        remote.blob_url('CONTRIBUTING.md', default_branch),
+        remote.blob_url('LICENSE', default_branch),
+        remote.blob_url('SECURITY.md', default_branch),
+    )
+
+
+def print_self_review_results(
+    charm_name: str,
+    project_repo: str = '',
+    ci_linting: str = '',
+    branch: str = '',
+    charm_dir: str = '.',
+    commit: str = '',
+    run_tooling: bool = True,
+    path: str = '',
+):
+    """Print the self-review results to console."""
+    _print_header(charm_name)
+    comment = _self_review_checklist(charm_name)
+
+    if project_repo or path:
+        try:
+            if path:
+                # Use the local repository's remote, unless one was given. The
+                # documents are read from the working tree, so there's no need
+                # to contact the remote to build URLs for them.
+                project_repo = project_repo or local_repository(path)[0]
+                print(f'Evaluating the working tree at {path}')
+                results = evaluate_path(
+                    charm_name,
+                    path,
+                    project_repo,
+                    ci_linting or '',
+                    charm_dir=charm_dir,
+                    run_tooling=run_tooling,
+                )
+            else:
+                contribution_url, license_url, security_url = _document_urls(project_repo, branch)
+                commit = commit or resolve_commit(project_repo, branch) or ''
+                if commit:
+                    print(f'Evaluating commit {commit}')
+                results = evaluate(
+                    charm_name,
+                    project_repo,
+                    ci_linting or '',
+                    contribution_url,
+                    license_url,
+                    security_url,
+                    branch or get_default_branch(project_repo),
+                    charm_dir=charm_dir,
+                    commit=commit,
+                    run_tooling=run_tooling,
+                )
+            comment = _apply_results(comment, results)
+        except Exception as e:
+            _print_evaluation_error(e)
+
+    _print_checklist(comment)
+    _print_footer()
+
+
+def print_multi_charm_self_review_results(
+    project_repo: str,
+    ci_linting: str = '',
+    branch: str = '',
+    charm_dirs: list[str] | None = None,
+    commit: str = '',
+    run_tooling: bool = True,
+):
+    """Print the self-review results for each charm in a monorepo to console.
+
+    If ``charm_dirs`` is not provided, every charm in the repository is reviewed.
+    """
+    try:
+        contribution_url, license_url, security_url = _document_urls(project_repo, branch)
+        commit = commit or resolve_commit(project_repo, branch) or ''
+        if commit:
+            print(f'Evaluating commit {commit}')
+        results = evaluate_charms(
+            project_repo,
+            ci_linting,
+            contribution_url,
+            license_url,
+            security_url,
+            branch or get_default_branch(project_repo),
+            charm_dirs=charm_dirs,
+            commit=commit,
+            run_tooling=run_tooling,
+        )
+    except Exception as e:
+        _print_evaluation_error(e)
+        return
+    if not results:
+        print('\n⚠️  Warning: No charms (charmcraft.yaml files) were found in the repository.')
+        return
+    for charm_dir, (charm_name, charm_results) in results.items():
+        _print_header(f'{charm_name} ({charm_dir})')
+        _print_checklist(_apply_results(_self_review_checklist(charm_name), charm_results))
+    _print_footer()
+
+
 def main():
     """Main entry point for the self-review tool."""
     parser = argparse.ArgumentParser(
@@ -168,39 +275,85 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
-    parser.add_argument('--charm-name', required=True, help='Name of the charm to review')
     parser.add_argument(
+        '--charm-name',
+        help='Name of the charm to review (required unless reviewing several charms)',
+    )
+    source_group = parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument(
         '--repository',
-        required=True,
         help='URL of the charm repository (e.g., https://github.com/<user>/<workload>-operator)',
     )
+    source_group.add_argument(
+        '--path',
+        help=(
+            'Path to a local checkout of the charm repository to review, including any '
+            'uncommitted changes, instead of cloning it'
+        ),
+    )
     parser.add_argument('--ci-linting-url', help='URL to CI linting workflow')
     parser.add_argument(
         '--branch',
         help='Branch of the repository to review (auto-detected default branch if not specified)',
     )
+    parser.add_argument(
+        '--commit',
+        default='',
+        help='Full SHA of the commit to review (the tip of the branch if not specified)',
+    )
+    parser.add_argument(
+        '--skip-tooling',
+        action='store_true',
+        help=(
+            "Check that the charm provides the expected commands, but don't run them "
+            '(faster, as the repository does not need to be cloned)'
+        ),
+    )
     parser.add_argument(
         '--charm-dir',
-        default='.',
+        action='append',
         help=(
             'Relative path to the charm directory within the repository '
-            '(default: repository root). Useful for monorepos.'
+            '(default: repository root). Useful for monorepos. Can be given more than once '
+            'to review several charms from a single clone.'
         ),
     )
+    parser.add_argument(
+        '--all-charms',
+        action='store_true',
+        help='Review every charm (every directory with a charmcraft.yaml) in the repository',
+    )
 
     args = parser.parse_args()
+    charm_dirs = args.charm_dir or ['.']
+    multi_charm = args.all_charms or len(charm_dirs) > 1
 
-    if not args.charm_name or not args.repository:
+    if multi_charm and args.path:
+        parser.error('--path can only be used to review a single charm')
+    if not (args.repository or args.path) or (not multi_charm and not args.charm_name):
         parser.print_help()
         sys.exit(1)
 
     try:
+        if multi_charm:
+            print_multi_charm_self_review_results(
+                project_repo=args.repository,
+                ci_linting=args.ci_linting_url or '',
+                branch=args.branch or '',
+                charm_dirs=None if args.all_charms else charm_dirs,
+                commit=args.commit,
+                run_tooling=not args.skip_tooling,
+            )
+            return
         print_self_review_results(
             charm_name=args.charm_name,
-            project_repo=args.repository,
+            project_repo=args.repository or '',
             ci_linting=args.ci_linting_url or '',
             branch=args.branch or '',
-            charm_dir=args.charm_dir,
+            charm_dir=charm_dirs[0],
+            commit=args.commit,
+            run_tooling=not args.skip_tooling,
+            path=args.path or '',
         )
     except KeyboardInterrupt:
         print('\n\n⚡ Review cancelled by user.')
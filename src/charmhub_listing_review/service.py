@@ -0,0 +1,397 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Long-running service that reviews listing requests as they arrive.
+
+The GitHub workflow starts a fresh runner for every listing request event, and
+spends most of its time installing tools before a single check runs. This
+service instead keeps a warm process (with modules imported and the best
+practices cached) and receives GitHub ``issues`` webhooks, or polls for new
+listing requests, and runs the same update as the ``update-issue`` command.
+
+Reviews are run from a job queue (see the jobs module) by a fixed number of
+worker threads, so a burst of events can't start an unbounded number of
+evaluations, and events that arrive close together only trigger one.
+
+The service talks to GitHub through the ``gh`` CLI, exactly like
+``update-issue``, so it can be run against a local stand-in for GitHub by
+putting a mock ``gh`` at the front of ``PATH``.
+"""
+
+import argparse
+import hashlib
+import hmac
+import http.server
+import json
+import logging
+import os
+import pathlib
+import subprocess  # noqa: S404
+import sys
+import threading
+from typing import Any
+
+from . import github, update_issue
+from .jobs import STALE_AFTER_SECONDS, JobQueue
+
+logger = logging.getLogger(__name__)
+
+LISTING_REQUEST_LABEL = 'listing-request'
+
+# The issue actions that should trigger a review, matching the workflow.
+_REVIEW_ACTIONS = {'opened', 'labeled', 'reopened'}
+
+# How often idle workers check the queue for work added by other processes.
+_WAKEUP_SECONDS = 5
+
+# Issue events are far smaller than this, so larger requests are rejected
+# without being read.
+MAX_WEBHOOK_BYTES = 1024 * 1024
+
+
+class ReviewService:
+    """Run listing reviews from a job queue with bounded concurrency.
+
+    Requests for an issue and commit that are already waiting in the queue are
+    collapsed into the waiting job, but a request for a new commit gets its
+    own job. Only one review of each issue runs at a time.
+    """
+
+    def __init__(
+        self,
+        reviewers_file: pathlib.Path | None = None,
+        repo: str | None = None,
+        workers: int = 2,
+        dry_run: bool = False,
+        assign_to: str | None = None,
+        jobs: JobQueue | None = None,
+        assignment_strategy: str = 'random',
+    ):
+        if workers < 1:
+            raise ValueError(f'workers must be at least 1, got: {workers}')
+        self.reviewers_file = reviewers_file
+        self.repo = repo
+        self.dry_run = dry_run
+        self.assign_to = assign_to
+        self.assignment_strategy = assignment_strategy
+        self._owns_jobs = jobs is None
+        self.jobs = jobs if jobs is not None else JobQueue()
+        self._changed = threading.Condition()
+        self._stopping = False
+        self._workers = [
+            threading.Thread(target=self._work, name=f'review-worker-{i}', daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self):
+        """Start the worker threads."""
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self):
+        """Stop the workers once the reviews already queued have finished."""
+        with self._changed:
+            self._stopping = True
+            self._changed.notify_all()
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.join()
+        if self._owns_jobs:
+            self.jobs.close()
+
+    def join(self):
+        """Wait until every queued review has finished."""
+        with self._changed:
+            while self.jobs.active_count():
+                self._changed.wait(_WAKEUP_SECONDS)
+
+    def submit(self, issue_number: int, commit_sha: str | None = None) -> bool:
+        """Queue a review of the issue at ``commit_sha``.
+
+        If the commit isn't given, it is the one that a review would check now
+        (see `update_issue.review_commit`).
+
+        Returns ``False`` if a review of the issue and commit was already queued.
+        """
+        if commit_sha is None:
+            commit_sha = self._review_commit(issue_number)
+        _, added = self.jobs.enqueue(issue_number, commit_sha)
+        with self._changed:
+            self._changed.notify_all()
+        return added
+
+    def _work(self):
+        while True:
+            with self._changed:
+                job = self.jobs.claim()
+                while job is None:
+                    if self._stopping:
+                        return
+                    # Also wake up regularly, in case another process added
+                    # to a shared queue.
+                    self._changed.wait(_WAKEUP_SECONDS)
+                    job = self.jobs.claim()
+            error = self._review(job.issue, job.commit_sha)
+            self.jobs.complete(job.id, error=error)
+            with self._changed:
+                self._changed.notify_all()
+
+    def _review_commit(self, issue_number: int) -> str:
+        try:
+            return update_issue.review_commit(issue_number, repo=self.repo)
+        except (OSError, subprocess.CalledProcessError, ValueError, KeyError):
+            # The review itself will report the problem. Until then, the job
+            # is for whatever the review finds.
+            logger.exception('Could not find the commit to review for issue #%s', issue_number)
+            return ''
+
+    def _review(self, issue_number: int, commit_sha: str = '') -> str | None:
+        logger.info('Reviewing issue #%s', issue_number)
+        try:
+            update_issue.review_issue(
+                issue_number,
+                reviewers_file=self.reviewers_file,
+                dry_run=self.dry_run,
+                assign_to=self.assign_to,
+                repo=self.repo,
+                assignment_strategy=self.assignment_strategy,
+                commit=commit_sha,
+            )
+        except Exception as e:
+            # A single bad listing request mustn't take down the service.
+            logger.exception('Review of issue #%s failed', issue_number)
+            return f'{type(e).__name__}: {e}'
+        logger.info('Finished reviewing issue #%s', issue_number)
+        return None
+
+
+def should_review(event: str, payload: dict[str, Any]) -> bool:
+    """Whether a GitHub webhook event should trigger a listing review."""
+    if event != 'issues' or payload.get('action') not in _REVIEW_ACTIONS:
+        return False
+    if payload['action'] == 'labeled':
+        label = payload.get('label') or {}
+        return LISTING_REQUEST_LABEL in label.get('name', '')
+    labels = payload.get('issue', {}).get('labels', [])
+    return any(LISTING_REQUEST_LABEL in label.get('name', '') for label in labels)
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Whether the ``X-Hub-Signature-256`` header matches the body."""
+    if not signature:
+        return False
+    expected = 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+class _WebhookHandler(http.server.BaseHTTPRequestHandler):
+    server: '_WebhookServer'
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_error(400, 'Missing or invalid Content-Length')
+            return
+        if length > MAX_WEBHOOK_BYTES:
+            self.send_error(413, f'Payload larger than {MAX_WEBHOOK_BYTES} bytes')
+            return
+        body = self.rfile.read(length)
+        secret = self.server.secret
+        if secret and not verify_signature(secret, body, self.headers.get('X-Hub-Signature-256')):
+            self.send_error(401, 'Invalid signature')
+            return
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            self.send_error(400, 'Invalid JSON payload')
+            return
+        event = self.headers.get('X-GitHub-Event', '')
+        if not should_review(event, payload):
+            self._respond(200, {'queued': False})
+            return
+        issue = payload.get('issue')
+        issue_number = issue.get('number') if isinstance(issue, dict) else None
+        # bool is a subclass of int, but never an issue number.
+        if type(issue_number) is not int or issue_number <= 0:
+            self.send_error(400, 'Missing or invalid issue number')
+            return
+        queued = self.server.service.submit(issue_number)
+        self._respond(202, {'queued': queued, 'issue': issue_number})
+
+    def _respond(self, status: int, content: dict[str, Any]):
+        data = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any):
+        logger.debug(format, *args)
+
+
+class _WebhookServer(http.server.ThreadingHTTPServer):
+    def __init__(
+        self, address: tuple[str, int], service: ReviewService, secret: str | None = None
+    ):
+        super().__init__(address, _WebhookHandler)
+        self.service = service
+        self.secret = secret
+
+
+def make_webhook_server(
+    service: ReviewService, host: str = '127.0.0.1', port: int = 8080, secret: str | None = None
+) -> http.server.ThreadingHTTPServer:
+    """Create an HTTP server that queues reviews from GitHub ``issues`` webhooks.
+
+    If ``secret`` is provided, requests without a valid ``X-Hub-Signature-256``
+    header are rejected.
+    """
+    return _WebhookServer((host, port), service, secret)
+
+
+def list_listing_requests(repo: str | None = None) -> list[int]:
+    """The numbers of the open listing request issues."""
+    cmd = [
+        'gh',
+        'issue',
+        'list',
+        '--label',
+        LISTING_REQUEST_LABEL,
+        '--state',
+        'open',
+        '--json',
+        'number',
+        '--limit',
+        '1000',
+    ]
+    if repo:
+        cmd.extend(['--repo', repo])
+    result = github.run(cmd, capture_output=True)
+    return [issue['number'] for issue in json.loads(result.stdout)]
+
+
+def poll(service: ReviewService, interval: float, stop: threading.Event):
+    """Queue reviews for listing requests opened after polling started.
+
+    Issues that are already open when polling starts are assumed to have been
+    handled already, and are not reviewed again.
+    """
+    seen = set(list_listing_requests(service.repo))
+    while not stop.wait(interval):
+        try:
+            current = list_listing_requests(service.repo)
+        except (subprocess.CalledProcessError, ValueError):
+            logger.exception('Could not list listing requests')
+            continue
+        for issue_number in current:
+            if issue_number not in seen:
+                seen.add(issue_number)
+                service.submit(issue_number)
+
+
+def main():
+    """Run the review service until interrupted."""
+    parser = argparse.ArgumentParser(
+        description='Review charm listing requests as they arrive, from a long-running process.'
+    )
+    reviewer_group = parser.add_mutually_exclusive_group(required=True)
+    reviewer_group.add_argument(
+        '--reviewers-file',
+        type=pathlib.Path,
+        help='Path to the reviewers YAML file',
+    )
+    reviewer_group.add_argument(
+        '--assign-to',
+        type=str,
+        help='Override automatic reviewer assignment with this GitHub username',
+    )
+    parser.add_argument(
+        '--assignment-strategy',
+        choices=update_issue.ASSIGNMENT_STRATEGIES,
+        default='random',
+        help=(
+            'How to pick the team to assign reviews to: uniformly at random, or the team '
+            'with the fewest open listing requests'
+        ),
+    )
+    parser.add_argument(
+        '--repo',
+        type=str,
+        help='GitHub repository in OWNER/REPO format (e.g. canonical/charmhub-listing-review)',
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on for webhooks')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on for webhooks')
+    parser.add_argument(
+        '--workers', type=int, default=2, help='Maximum number of reviews to run at once'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        help=(
+            'Poll GitHub for new listing requests every this many seconds, '
+            'instead of listening for webhooks'
+        ),
+    )
+    parser.add_argument(
+        '--queue-db',
+        type=pathlib.Path,
+        help='Path to a SQLite database for the job queue (default: in memory)',
+    )
+    parser.add_argument(
+        '--dry-run', action='store_true', help='Do not update issues, just print the output'
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    service = ReviewService(
+        reviewers_file=args.reviewers_file,
+        repo=args.repo,
+        workers=args.workers,
+        dry_run=args.dry_run,
+        assign_to=args.assign_to,
+        # The database can be shared with update-issue processes that are
+        # still running their jobs, so only abandoned jobs are returned.
+        jobs=JobQueue(args.queue_db, stale_after=STALE_AFTER_SECONDS) if args.queue_db else None,
+        assignment_strategy=args.assignment_strategy,
+    )
+    service.start()
+    # Fetch the best practices up front, so that the first review is as fast
+    # as the rest.
+    update_issue.get_best_practices()
+    try:
+        if args.poll_interval:
+            poll(service, args.poll_interval, threading.Event())
+        else:
+            secret = os.environ.get('GITHUB_WEBHOOK_SECRET')
+            if not secret:
+                logger.warning('GITHUB_WEBHOOK_SECRET is not set: webhooks are not verified')
+            server = make_webhook_server(service, args.host, args.port, secret)
+            logger.info('Listening for webhooks on %s:%s', args.host, args.port)
+            with server:
+                server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info('Waiting for queued reviews to finish')
+        service.stop()
+        github.report_budget()
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,445 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Report how long listing reviews take, per team.
+
+The README promises an initial review within three working days. This report
+measures, for every listing request issue:
+
+* time to assignment: from the issue being opened to it being assigned;
+* time to first review: from the issue being opened to the first comment by
+  someone other than the author (and other than bots);
+* time to listing: from the issue being opened to it being closed as
+  completed.
+
+All times are in working days (weekends are excluded). Each issue is
+attributed to the team of its first assignee, from the reviewers file.
+
+Issue timelines are fetched with batched, paginated GraphQL queries. Closed
+issues don't change, so they are cached locally, and only fetched again if
+they have been updated since.
+"""
+
+import argparse
+import datetime
+import json
+import math
+import pathlib
+import sys
+from collections.abc import Iterable, Iterator
+from typing import Any, TypedDict
+
+from . import github, yaml_loader
+
+LISTING_REQUEST_LABEL = 'listing-request'
+# The README promises an initial review within this many working days.
+TARGET_WORKING_DAYS = 3
+METRICS = ('time_to_assignment', 'time_to_first_review', 'time_to_listing')
+
+DETAIL_BATCH_SIZE = 25
+_PAGE_SIZE = 100
+
+_LIST_QUERY = """
+query($owner: String!, $name: String!, $label: String!, $first: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issues(labels: [$label], first: $first, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes { number state updatedAt }
+    }
+  }
+}
+"""
+
+_TIMELINE_FIELDS = """
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      __typename
+      ... on AssignedEvent { createdAt assignee { ... on User { login } } }
+      ... on IssueComment { createdAt author { login } }
+      ... on ClosedEvent { createdAt stateReason }
+    }
+"""
+_TIMELINE_ITEM_TYPES = '[ASSIGNED_EVENT, ISSUE_COMMENT, CLOSED_EVENT]'
+
+_DETAIL_FIELDS = f"""
+  number title state stateReason createdAt closedAt updatedAt
+  author {{ login }}
+  timelineItems(first: {_PAGE_SIZE}, itemTypes: {_TIMELINE_ITEM_TYPES}) {{ {_TIMELINE_FIELDS} }}
+"""
+
+# The rest of a long timeline, after the first page that came with the details.
+_TIMELINE_QUERY = f"""
+query($owner: String!, $name: String!, $number: Int!, $first: Int!, $cursor: String) {{
+  repository(owner: $owner, name: $name) {{
+    issue(number: $number) {{
+      timelineItems(first: $first, after: $cursor, itemTypes: {_TIMELINE_ITEM_TYPES}) {{
+        {_TIMELINE_FIELDS}
+      }}
+    }}
+  }}
+}}
+"""
+
+
+class IssueTimes(TypedDict):
+    """The review milestones of a listing request issue."""
+
+    number: int
+    title: str
+    state: str
+    updated_at: str
+    created_at: str
+    assignee: str | None
+    assigned_at: str | None
+    first_review_at: str | None
+    listed_at: str | None
+
+
+def _graphql(query: str, **variables: Any) -> dict[str, Any]:
+    args = ['graphql', '-f', f'query={query}']
+    for name, value in variables.items():
+        if value is not None:
+            args.extend(['-F' if isinstance(value, int) else '-f', f'{name}={value}'])
+    return json.loads(github.api(args))['data']
+
+
+def list_issues(owner: str, name: str) -> list[dict[str, Any]]:
+    """List the number, state and last update of every listing request issue."""
+    issues: list[dict[str, Any]] = []
+    cursor = None
+    while True:
+        data = _graphql(
+            _LIST_QUERY,
+            owner=owner,
+            name=name,
+            label=LISTING_REQUEST_LABEL,
+            first=_PAGE_SIZE,
+            cursor=cursor,
+        )
+        page = data['repository']['issues']
+        issues.extend(page['nodes'])
+        if not page['pageInfo']['hasNextPage']:
+            return issues
+        cursor = page['pageInfo']['endCursor']
+
+
+def _batched(items: list[int], size: int) -> Iterator[list[int]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _fetch_rest_of_timeline(owner: str, name: str, issue: dict[str, Any]):
+    """Add the pages of the issue's timeline after the first to its nodes."""
+    timeline = issue['timelineItems']
+    page_info = timeline.get('pageInfo') or {}
+    while page_info.get('hasNextPage'):
+        data = _graphql(
+            _TIMELINE_QUERY,
+            owner=owner,
+            name=name,
+            number=issue['number'],
+            first=_PAGE_SIZE,
+            cursor=page_info['endCursor'],
+        )
+        page = data['repository']['issue']['timelineItems']
+        timeline['nodes'].extend(page['nodes'])
+        page_info = page['pageInfo']
+    timeline['pageInfo'] = page_info
+
+
+def fetch_issue_details(owner: str, name: str, numbers: list[int]) -> list[dict[str, Any]]:
+    """Fetch the timelines of the issues, several issues per query.
+
+    The first page of each timeline comes with the issue, and the rest (for
+    issues with long timelines) is fetched an issue at a time.
+    """
+    details: list[dict[str, Any]] = []
+    for batch in _batched(numbers, DETAIL_BATCH_SIZE):
+        fields = '\n'.join(
+            f'i{number}: issue(number: {number}) {{ {_DETAIL_FIELDS} }}' for number in batch
+        )
+        query = (
+            'query($owner: String!, $name: String!) { '
+            f'repository(owner: $owner, name: $name) {{ {fields} }} }}'
+        )
+        data = _graphql(query, owner=owner, name=name)
+        details.extend(issue for issue in data['repository'].values() if issue)
+    for issue in details:
+        _fetch_rest_of_timeline(owner, name, issue)
+    return details
+
+
+def _is_bot(login: str) -> bool:
+    return login.endswith('[bot]') or login == 'github-actions'
+
+
+def issue_times(issue: dict[str, Any]) -> IssueTimes:
+    """Extract the review milestones from an issue and its timeline."""
+    author = (issue.get('author') or {}).get('login', '')
+    times = IssueTimes(
+        number=issue['number'],
+        title=issue['title'],
+        state=issue['state'],
+        updated_at=issue['updatedAt'],
+        created_at=issue['createdAt'],
+        assignee=None,
+        assigned_at=None,
+        first_review_at=None,
+        listed_at=None,
+    )
+    for item in issue['timelineItems']['nodes']:
+        kind = item.get('__typename')
+        if kind == 'AssignedEvent' and times['assigned_at'] is None:
+            times['assigned_at'] = item['createdAt']
+            times['assignee'] = (item.get('assignee') or {}).get('login')
+        elif kind == 'IssueComment' and times['first_review_at'] is None:
+            login = (item.get('author') or {}).get('login', '')
+            if login and login != author and not _is_bot(login):
+                times['first_review_at'] = item['createdAt']
+        elif kind == 'ClosedEvent' and item.get('stateReason') == 'COMPLETED':
+            times['listed_at'] = item['createdAt']
+    return times
+
+
+def load_cache(path: pathlib.Path) -> dict[int, IssueTimes]:
+    """Load the cached milestones of closed issues."""
+    try:
+        with path.open() as f:
+            return {times['number']: times for times in json.load(f)}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def save_cache(path: pathlib.Path, issues: Iterable[IssueTimes]):
+    """Cache the milestones of closed issues, which no longer change."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    closed = sorted(
+        (times for times in issues if times['state'] == 'CLOSED'), key=lambda t: t['number']
+    )
+    with path.open('w') as f:
+        json.dump(closed, f, indent=1)
+
+
+def collect(owner: str, name: str, cache_path: pathlib.Path | None = None) -> list[IssueTimes]:
+    """Get the milestones of every listing request issue.
+
+    Closed issues that are in the cache, and haven't been updated since they
+    were cached, are not fetched again.
+    """
+    cache = load_cache(cache_path) if cache_path else {}
+    listed = list_issues(owner, name)
+    needed = [
+        issue['number']
+        for issue in listed
+        if issue['state'] != 'CLOSED'
+        or issue['number'] not in cache
+        or cache[issue['number']]['updated_at'] != issue['updatedAt']
+    ]
+    fetched = {
+        times['number']: times
+        for times in map(issue_times, fetch_issue_details(owner, name, needed))
+    }
+    issues: list[IssueTimes] = []
+    for issue in listed:
+        times = fetched.get(issue['number']) or cache.get(issue['number'])
+        # Issues that couldn't be fetched (for example, if they were deleted) are skipped.
+        if times is not None:
+            issues.append(times)
+    if cache_path:
+        save_cache(cache_path, issues)
+    return issues
+
+
+def working_days(start: str, end: str) -> float:
+    """The number of working days (Monday to Friday) between two ISO timestamps."""
+    start_dt = datetime.datetime.fromisoformat(start)
+    end_dt = datetime.datetime.fromisoformat(end)
+    total = datetime.timedelta()
+    current = start_dt
+    while current < end_dt:
+        next_day = datetime.datetime.combine(
+            current.date() + datetime.timedelta(days=1), datetime.time(), current.tzinfo
+        )
+        if current.weekday() < 5:
+            total += min(next_day, end_dt) - current
+        current = next_day
+    return total / datetime.timedelta(days=1)
+
+
+def percentile(values: list[float], percent: float) -> float | None:
+    """The nearest-rank percentile of ``values``."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def load_teams(reviewers_file: pathlib.Path) -> dict[str, str]:
+    """Map each reviewer's lowercased GitHub username (without ``@``) to their team."""
+    reviewers = yaml_loader.load_file(reviewers_file)['reviewers']
+    return {name.removeprefix('@').lower(): info['team'] for name, info in reviewers.items()}
+
+
+def build_report(
+    issues: list[IssueTimes], teams: dict[str, str], now: datetime.datetime | None = None
+) -> dict[str, Any]:
+    """Compute the latency percentiles per team, and overall."""
+    now = now or datetime.datetime.now(datetime.UTC)
+    durations: dict[str, dict[str, list[float]]] = {}
+    counts: dict[str, int] = {}
+    overdue: list[dict[str, Any]] = []
+    milestones = {
+        'time_to_assignment': 'assigned_at',
+        'time_to_first_review': 'first_review_at',
+        'time_to_listing': 'listed_at',
+    }
+    for times in issues:
+        assignee = times['assignee']
+        team = 'Unassigned' if assignee is None else teams.get(assignee.lower(), 'Other')
+        counts[team] = counts.get(team, 0) + 1
+        for group in (team, 'All teams'):
+            team_durations = durations.setdefault(group, {metric: [] for metric in METRICS})
+            for metric, milestone in milestones.items():
+                reached = times[milestone]
+                if reached is not None:
+                    team_durations[metric].append(working_days(times['created_at'], reached))
+        if times['state'] == 'OPEN' and times['first_review_at'] is None:
+            waiting = working_days(times['created_at'], now.isoformat())
+            if waiting > TARGET_WORKING_DAYS:
+                overdue.append({
+                    'number': times['number'],
+                    'title': times['title'],
+                    'team': team,
+                    'working_days_waiting': round(waiting, 2),
+                })
+    counts['All teams'] = len(issues)
+    report_teams: dict[str, Any] = {}
+    for team, team_durations in sorted(durations.items(), key=lambda item: item[0] == 'All teams'):
+        report_teams[team] = {'issues': counts[team]}
+        for metric, values in team_durations.items():
+            report_teams[team][metric] = {
+                'count': len(values),
+                'p50': _round(percentile(values, 50)),
+                'p90': _round(percentile(values, 90)),
+                'max': _round(max(values, default=None)),
+            }
+        first_review = report_teams[team]['time_to_first_review']
+        first_review['within_target'] = sum(
+            1 for value in team_durations['time_to_first_review'] if value <= TARGET_WORKING_DAYS
+        )
+    return {
+        'generated_at': now.isoformat(),
+        'target_working_days': TARGET_WORKING_DAYS,
+        'teams': report_teams,
+        'overdue': overdue,
+    }
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 2)
+
+
+def format_markdown(report: dict[str, Any]) -> str:
+    """Format the report as Markdown tables."""
+
+    def cell(stats: dict[str, Any]) -> str:
+        if not stats['count']:
+            return '-'
+        return f'{stats["p50"]} / {stats["p90"]} ({stats["count"]})'
+
+    lines = [
+        '# Listing review latency',
+        '',
+        f'Generated at {report["generated_at"]}. Times are working days, shown as '
+        'p50 / p90 (number of issues).',
+        '',
+        '| Team | Issues | Time to assignment | Time to first review | '
+        f'First review within {report["target_working_days"]} days | Time to listing |',
+        '| --- | --- | --- | --- | --- | --- |',
+    ]
+    for team, stats in report['teams'].items():
+        first_review = stats['time_to_first_review']
+        within = f'{first_review["within_target"]}/{first_review["count"]}'
+        lines.append(
+            f'| {team} | {stats["issues"]} | {cell(stats["time_to_assignment"])} | '
+            f'{cell(first_review)} | {within} | {cell(stats["time_to_listing"])} |'
+        )
+    if report['overdue']:
+        lines.extend([
+            '',
+            f'## Open issues waiting more than {report["target_working_days"]} working days '
+            'for a first review',
+            '',
+        ])
+        lines.extend(
+            f'* #{issue["number"]} {issue["title"]} ({issue["team"]}, '
+            f'{issue["working_days_waiting"]} working days)'
+            for issue in report['overdue']
+        )
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    """Report listing review latency per team."""
+    parser = argparse.ArgumentParser(
+        description='Report how long listing reviews take, per team, from the issue timelines.'
+    )
+    parser.add_argument(
+        '--repo',
+        default='canonical/charmhub-listing-review',
+        help='GitHub repository in OWNER/REPO format (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--reviewers-file',
+        type=pathlib.Path,
+        default=pathlib.Path('reviewers.yaml'),
+        help='Path to the reviewers YAML file (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--cache',
+        type=pathlib.Path,
+        help=(
+            'Path to the cache of closed issues '
+            '(default: ~/.cache/charmhub-listing-review/sla-OWNER-REPO.json)'
+        ),
+    )
+    parser.add_argument(
+        '--format', choices=('markdown', 'json'), default='markdown', help='Output format'
+    )
+    parser.add_argument(
+        '--output', type=pathlib.Path, help='Write the report to this file instead of stdout'
+    )
+    args = parser.parse_args()
+
+    owner, _, name = args.repo.partition('/')
+    if not owner or not name:
+        parser.error('--repo must be in OWNER/REPO format')
+    cache = args.cache or (
+        pathlib.Path.home() / '.cache' / 'charmhub-listing-review' / f'sla-{owner}-{name}.json'
+    )
+    issues = collect(owner, name, cache)
+    report = build_report(issues, load_teams(args.reviewers_file))
+    if args.format == 'json':
+        output = json.dumps(report, indent=2) + '\n'
+    else:
+        output = format_markdown(report)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        sys.stdout.write(output)
+    github.report_budget()
+
+
+if __name__ == '__main__':
+    main()
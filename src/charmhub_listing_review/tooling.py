@@ -0,0 +1,330 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Work out how to run a charm's format, lint, and test commands.
+
+The Charmcraft profiles provide ``format``, ``lint``, ``unit``, and
+``integration`` commands, in a ``tox.ini``, ``Makefile``, or ``Justfile``.
+Each of these files is parsed (without running anything) to find which of the
+commands it provides:
+
+* ``tox.ini``: the environments named in ``env_list`` (or ``envlist``) and the
+  ``[testenv:...]`` sections, with generative names like ``{format,lint}``
+  expanded.
+* ``Makefile``: the targets of each rule, other than special targets like
+  ``.PHONY``.
+* ``Justfile``: the recipes, and their aliases.
+
+The result is a `ToolingPlan`: for each command, how to run it, the
+environment variables that the file sets for it (as written in the file, for
+the report: make, just, and tox set them themselves when the command runs),
+and a rough estimate of how long it will take. Plans are stored in the
+result cache (see `result_cache`), keyed by the hash of the tooling files, so
+unchanged files aren't parsed again. Commands are always run in the charm
+directory, with the environment of this process.
+"""
+
+import configparser
+import dataclasses
+import itertools
+import json
+import pathlib
+import re
+import subprocess  # noqa: S404
+
+from . import file_index, result_cache
+
+# Bump this whenever the parsers change, so that cached plans from the
+# previous implementation aren't reused.
+PLAN_VERSION = 1
+# The files are used in this order when more than one provides a command.
+TOOLING_FILES = ('Makefile', 'Justfile', 'tox.ini')
+COMMANDS = ('format', 'lint', 'unit', 'integration')
+# Integration tests need a Juju controller, so they are never run.
+RUNNABLE_COMMANDS = ('format', 'lint', 'unit')
+
+# Rough estimates, in seconds, of the time to set up a tox environment and to
+# run each line of a recipe or each tox command.
+TOX_SETUP_SECONDS = 30
+SECONDS_PER_COMMAND = 10
+
+_MAKE_RULE_RE = re.compile(r'^([^\s:#=][^:#=]*?)\s*::?(?![:=])(.*)$')
+_MAKE_EXPORT_RE = re.compile(r'^export\s+([A-Za-z_][A-Za-z0-9_]*)\s*[:?+!]*=\s*(.*)$')
+_JUST_RECIPE_RE = re.compile(r'^@?([A-Za-z_][A-Za-z0-9_-]*)((?:\s+[^:]*?)?)\s*:(?!=)(.*)$')
+_JUST_ALIAS_RE = re.compile(r'^alias\s+([A-Za-z_][A-Za-z0-9_-]*)\s*:=\s*([A-Za-z_][A-Za-z0-9_-]*)')
+_JUST_EXPORT_RE = re.compile(r'^export\s+([A-Za-z_][A-Za-z0-9_]*)\s*:=\s*(.*)$')
+_GENERATIVE_RE = re.compile(r'\{([^{}]*)\}')
+
+
+@dataclasses.dataclass(frozen=True)
+class PlannedCommand:
+    """How to run one of the tooling commands."""
+
+    name: str
+    source: str  # The tooling file that provides the command.
+    argv: tuple[str, ...]
+    # Relative to the charm directory.
+    cwd: str = '.'
+    # Variables that the tooling file sets for the command, unexpanded. These
+    # are only reported: the tool sets them itself when it runs the command.
+    env: dict[str, str] = dataclasses.field(default_factory=dict)
+    estimated_seconds: int = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class ToolingPlan:
+    """The tooling commands that a charm provides, and those it is missing."""
+
+    commands: dict[str, PlannedCommand]
+    missing: tuple[str, ...]
+    sources: tuple[str, ...]  # The tooling files that were found.
+
+    def to_run(self) -> list[PlannedCommand]:
+        """The commands that should be run, cheapest first.
+
+        If any command is missing, the tooling check has already failed, so
+        nothing needs to be run.
+        """
+        if self.missing:
+            return []
+        return sorted(
+            (self.commands[name] for name in RUNNABLE_COMMANDS if name in self.commands),
+            key=lambda command: command.estimated_seconds,
+        )
+
+
+def expand_generative(name: str) -> list[str]:
+    """Expand a generative tox environment name like ``py{311,312}-{unit,lint}``."""
+    parts = _GENERATIVE_RE.split(name)
+    # The odd parts are the contents of the braces.
+    choices = [[part] if i % 2 == 0 else part.split(',') for i, part in enumerate(parts)]
+    return [
+        ''.join(choice.strip() for choice in combination)
+        for combination in itertools.product(*choices)
+    ]
+
+
+def _tox_list(value: str) -> list[str]:
+    names = []
+    for line in value.splitlines():
+        line = line.split('#', 1)[0]
+        # Commas inside braces separate generative factors, not environments.
+        for item in re.split(r',(?![^{]*\})', line):
+            if item.strip():
+                names.extend(expand_generative(item.strip()))
+    return names
+
+
+def _tox_lines(value: str) -> list[str]:
+    lines = []
+    for line in value.splitlines():
+        line = line.strip()
+        if line and not line.startswith('#'):
+            lines.append(line)
+    return lines
+
+
+def _tox_env(value: str) -> dict[str, str]:
+    env = {}
+    for line in _tox_lines(value):
+        key, sep, setting = line.partition('=')
+        if sep:
+            env[key.strip()] = setting.strip()
+    return env
+
+
+def parse_tox(content: str) -> dict[str, PlannedCommand]:
+    """The commands provided by a ``tox.ini``."""
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    try:
+        parser.read_string(content)
+    except configparser.Error:
+        return {}
+    environments: dict[str, configparser.SectionProxy | None] = {}
+    if parser.has_section('tox'):
+        tox = parser['tox']
+        for name in _tox_list(tox.get('env_list', tox.get('envlist', ''))):
+            environments.setdefault(name, None)
+    for section in parser.sections():
+        if section.startswith('testenv:'):
+            for name in expand_generative(section.removeprefix('testenv:').strip()):
+                environments[name] = parser[section]
+    base = parser['testenv'] if parser.has_section('testenv') else None
+    commands = {}
+    for name in COMMANDS:
+        if name not in environments:
+            continue
+        env_section = environments[name]
+        lines, env = [], {}
+        for section in (base, env_section):
+            if section is None:
+                continue
+            if 'commands' in section:
+                lines = _tox_lines(section['commands'])
+            env.update(_tox_env(section.get('setenv', section.get('set_env', ''))))
+        commands[name] = PlannedCommand(
+            name,
+            'tox.ini',
+            ('tox', '-e', name),
+            env=env,
+            estimated_seconds=TOX_SETUP_SECONDS + SECONDS_PER_COMMAND * max(len(lines), 1),
+        )
+    return commands
+
+
+def _recipe_seconds(
+    recipes: dict[str, tuple[list[str], int]], name: str, seen: set[str] | None = None
+) -> int:
+    """The estimated time for a recipe, including the recipes it depends on."""
+    seen = set() if seen is None else seen
+    if name in seen or name not in recipes:
+        return 0
+    seen.add(name)
+    dependencies, lines = recipes[name]
+    return SECONDS_PER_COMMAND * max(lines, 1) + sum(
+        _recipe_seconds(recipes, dependency, seen) for dependency in dependencies
+    )
+
+
+def parse_makefile(content: str) -> dict[str, PlannedCommand]:
+    """The commands provided by a ``Makefile``."""
+    recipes: dict[str, tuple[list[str], int]] = {}
+    env: dict[str, str] = {}
+    current: list[str] = []
+    for line in content.replace('\\\n', ' ').splitlines():
+        if line.startswith('\t'):
+            for target in current:
+                dependencies, lines = recipes[target]
+                recipes[target] = (dependencies, lines + 1)
+            continue
+        line = line.split('#', 1)[0].rstrip()
+        if match := _MAKE_EXPORT_RE.match(line):
+            env[match.group(1)] = match.group(2).strip()
+            current = []
+        elif match := _MAKE_RULE_RE.match(line):
+            targets = [target for target in match.group(1).split() if not target.startswith('.')]
+            dependencies = match.group(2).split(';', 1)[0].split()
+            for target in targets:
+                recipes.setdefault(target, ([], 0))[0].extend(dependencies)
+            current = targets
+        elif line:
+            current = []
+    return {
+        name: PlannedCommand(
+            name,
+            'Makefile',
+            ('make', name),
+            env=env,
+            estimated_seconds=_recipe_seconds(recipes, name),
+        )
+        for name in COMMANDS
+        if name in recipes
+    }
+
+
+def parse_justfile(content: str) -> dict[str, PlannedCommand]:
+    """The commands provided by a ``Justfile``."""
+    recipes: dict[str, tuple[list[str], int]] = {}
+    aliases: dict[str, str] = {}
+    env: dict[str, str] = {}
+    current = None
+    for line in content.splitlines():
+        if line[:1] in {' ', '\t'}:
+            if current is not None and line.strip() and not line.strip().startswith('#'):
+                dependencies, lines = recipes[current]
+                recipes[current] = (dependencies, lines + 1)
+            continue
+        current = None
+        line = line.split('#', 1)[0].rstrip()
+        if match := _JUST_ALIAS_RE.match(line):
+            aliases[match.group(1)] = match.group(2)
+        elif match := _JUST_EXPORT_RE.match(line):
+            env[match.group(1)] = match.group(2).strip().strip('\'"')
+        elif match := _JUST_RECIPE_RE.match(line):
+            current = match.group(1)
+            dependencies = [dependency.strip('()') for dependency in match.group(3).split()]
+            recipes[current] = ([dependency for dependency in dependencies if dependency], 0)
+    commands = {}
+    for name in COMMANDS:
+        recipe = name if name in recipes else aliases.get(name)
+        if recipe in recipes:
+            commands[name] = PlannedCommand(
+                name,
+                'Justfile',
+                ('just', name),
+                env=env,
+                estimated_seconds=_recipe_seconds(recipes, recipe),
+            )
+    return commands
+
+
+_PARSERS = {'Makefile': parse_makefile, 'Justfile': parse_justfile, 'tox.ini': parse_tox}
+
+
+def _build_plan(charm_dir: pathlib.Path, sources: list[str]) -> ToolingPlan:
+    commands: dict[str, PlannedCommand] = {}
+    for source in sources:
+        content = (charm_dir / source).read_text(encoding='utf-8', errors='replace')
+        for name, command in _PARSERS[source](content).items():
+            commands.setdefault(name, command)
+    missing = tuple(name for name in COMMANDS if name not in commands)
+    return ToolingPlan(commands, missing, tuple(sources))
+
+
+def plan(charm_dir: pathlib.Path) -> ToolingPlan:
+    """Work out how to run the charm's tooling commands, without running any of them."""
+    files = file_index.lookup(charm_dir)
+    sources = [name for name in TOOLING_FILES if files.is_file(charm_dir / name)]
+
+    def compute() -> str:
+        return json.dumps(dataclasses.asdict(_build_plan(charm_dir, sources)))
+
+    cached = json.loads(
+        result_cache.cache().run(
+            'tooling_plan', PLAN_VERSION, charm_dir, TOOLING_FILES, compute, file_hash=files.hash
+        )
+    )
+    return ToolingPlan(
+        {
+            name: PlannedCommand(**{**command, 'argv': tuple(command['argv'])})
+            for name, command in cached['commands'].items()
+        },
+        tuple(cached['missing']),
+        tuple(cached['sources']),
+    )
+
+
+def run(command: PlannedCommand, charm_dir: pathlib.Path) -> str | None:
+    """Run the command in the charm directory.
+
+    The command inherits this process's environment. The values in
+    ``command.env`` aren't passed on, since they are unexpanded (like
+    ``$(HOME)/bin:$(PATH)``), and the tool applies them itself.
+
+    Returns ``None`` if it succeeds, or a description of how it failed.
+    """
+    shown = ' '.join(command.argv)
+    try:
+        subprocess.run(
+            command.argv,
+            cwd=charm_dir / command.cwd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+    except FileNotFoundError:
+        return f"`{shown}` couldn't be run, because `{command.argv[0]}` isn't installed."
+    except subprocess.CalledProcessError as e:
+        return f'`{shown}` failed, with exit status {e.returncode}.'
+    return None
@@ -28,18 +28,26 @@ created issue to be user-friendly, and to include the current checklist.
 """
 
 import argparse
+import collections
 import json
+import math
 import pathlib
 import random
 import re
-import subprocess  # noqa: S404
+import threading
+import time
 import urllib.error
 import urllib.request
 from typing import TypedDict, cast
 
-import yaml
-
-from .evaluate import evaluate, get_default_branch
+from . import github, jobs, yaml_loader
+from .evaluate import (
+    evaluate,
+    get_default_branch,
+    is_commit_sha,
+    remote_repository,
+    resolve_commit,
+)
 from .sphinx_refs import convert_sphinx_refs
 
 BEST_PRACTICE_SOURCE = 'https://raw.githubusercontent.com/canonical/operator/refs/heads/main/docs/reuse/best-practices.txt'
@@ -105,16 +113,7 @@ A charm's documentation should focus on the charm itself. For workload-specific
     )
 
     # fmt: on
-    try:
-        with urllib.request.urlopen(BEST_PRACTICE_SOURCE) as response:
-            best_practices_content = response.read().decode()
-    except (urllib.error.URLError, urllib.error.HTTPError):
-        best_practices = []
-    else:
-        best_practices_content = convert_sphinx_refs(best_practices_content)
-        best_practices = best_practices_content.splitlines()
-    # Remove the headings and empty lines.
-    best_practices = [line for line in best_practices if line.startswith('-')]
+    best_practices = get_best_practices()
     if best_practices:
         description.append('\n\n')
         description.append(
@@ -133,6 +132,41 @@ required for listing.
     return ''.join(description)
 
 
+# How long a fetched copy of the best practices is reused. This only matters
+# for long-running processes (see the service module): a one-off run fetches
+# the list once anyway.
+BEST_PRACTICE_CACHE_SECONDS = 60 * 60
+
+_best_practices_cache: tuple[float, list[str]] | None = None
+_best_practices_lock = threading.Lock()
+
+
+def get_best_practices() -> list[str]:
+    """Get the current list of best practices, as Markdown list items.
+
+    The list is cached in-process for ``BEST_PRACTICE_CACHE_SECONDS``. A failed
+    fetch is not cached, so that the next call will try again.
+    """
+    global _best_practices_cache
+    with _best_practices_lock:
+        if _best_practices_cache is not None:
+            fetched_at, best_practices = _best_practices_cache
+            if time.monotonic() - fetched_at < BEST_PRACTICE_CACHE_SECONDS:
+                return best_practices
+        try:
+            with urllib.request.urlopen(BEST_PRACTICE_SOURCE) as response:
+                best_practices_content = response.read().decode()
+        except (urllib.error.URLError, urllib.error.HTTPError):
+            return []
+        best_practices_content = convert_sphinx_refs(best_practices_content)
+        # Remove the headings and empty lines.
+        best_practices = [
+            line for line in best_practices_content.splitlines() if line.startswith('-')
+        ]
+        _best_practices_cache = (time.monotonic(), best_practices)
+        return best_practices
+
+
 class _IssueData(TypedDict):
     """Typed dictionary for issue data."""
 
@@ -145,6 +179,7 @@ class _IssueData(TypedDict):
     ci_integration_url: str
     documentation_link: str
     default_branch: str
+    commit: str | None
     contribution_link: str
     license_link: str
     security_link: str
@@ -158,12 +193,7 @@ def get_details_from_issue(issue_number: int, repo: str | None = None):
     cmd = ['gh', 'issue', 'view', str(issue_number), '--json', 'body']
     if repo:
         cmd.extend(['--repo', repo])
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        check=True,
-    )
+    result = github.run(cmd, capture_output=True)
     body = json.loads(result.stdout)['body']
 
     # Define the fields to extract and their headings.
@@ -177,6 +207,7 @@ def get_details_from_issue(issue_number: int, repo: str | None = None):
         'ci_integration_url': '### CI Integration Tests',
         'documentation_link': '### Documentation Link',
         'default_branch': '### Review Branch',
+        'commit': '### Review Commit',
     }
 
     # Extract values for each field.
@@ -193,6 +224,11 @@ def get_details_from_issue(issue_number: int, repo: str | None = None):
     # Default charm_dir to '.' if not provided or empty.
     if not issue_data.get('charm_dir') or issue_data['charm_dir'] == '_No response_':
         issue_data['charm_dir'] = '.'
+    if issue_data.get('commit') == '_No response_':
+        issue_data['commit'] = None
+    elif issue_data.get('commit'):
+        # Git prints SHAs in lowercase, but people may paste them from elsewhere.
+        issue_data['commit'] = str(issue_data['commit']).strip().lower()
 
     # These have expected filenames, so we use those rather than require the author provide them.
     # This is quite specific to GitHub, but we can add support for other platforms if required,
@@ -200,22 +236,102 @@ def get_details_from_issue(issue_number: int, repo: str | None = None):
     project_repo = issue_data['project_repo']
     if not project_repo:
         raise ValueError('Issue body is missing the "Project Repository" field.')
+    remote = remote_repository(str(project_repo))
     default_branch = issue_data.get('default_branch') or get_default_branch(str(project_repo))
     issue_data['default_branch'] = default_branch
-    issue_data['contribution_link'] = (
-        f'{issue_data["project_repo"]}/blob/{default_branch}/CONTRIBUTING.md'
-    )
-    issue_data['license_link'] = f'{issue_data["project_repo"]}/blob/{default_branch}/LICENSE'
-    issue_data['security_link'] = f'{issue_data["project_repo"]}/blob/{default_branch}/SECURITY.md'
+    issue_data['contribution_link'] = remote.blob_url('CONTRIBUTING.md', default_branch)
+    issue_data['license_link'] = remote.blob_url('LICENSE', default_branch)
+    issue_data['security_link'] = remote.blob_url('SECURITY.md', default_branch)
 
     return cast('_IssueData', issue_data)
 
 
+# How long the counts of open assignments are reused. Within a sweep over
+# many issues this avoids refetching them for each one, and the counts are
+# updated locally as issues are assigned.
+OPEN_ASSIGNMENTS_CACHE_SECONDS = 5 * 60
+
+ASSIGNMENT_STRATEGIES = ('random', 'least-loaded')
+
+_open_assignments_cache: dict[str | None, tuple[float, collections.Counter[str]]] = {}
+_open_assignments_lock = threading.Lock()
+
+
+def get_open_assignments(repo: str | None = None) -> collections.Counter[str]:
+    """Count the open listing requests assigned to each GitHub user.
+
+    All open listing requests are fetched in a single query. The counts are
+    keyed by the lowercased username, with an ``@`` prefix (like the keys of
+    the reviewers file), and are cached for ``OPEN_ASSIGNMENTS_CACHE_SECONDS``.
+    """
+    with _open_assignments_lock:
+        cached = _open_assignments_cache.get(repo)
+        if cached is not None and time.monotonic() - cached[0] < OPEN_ASSIGNMENTS_CACHE_SECONDS:
+            return cached[1]
+        cmd = [
+            'gh',
+            'issue',
+            'list',
+            '--label',
+            'listing-request',
+            '--state',
+            'open',
+            '--json',
+            'assignees',
+            '--limit',
+            '1000',
+        ]
+        if repo:
+            cmd.extend(['--repo', repo])
+        result = github.run(cmd, capture_output=True)
+        counts: collections.Counter[str] = collections.Counter()
+        for issue in json.loads(result.stdout):
+            for assignee in issue.get('assignees', []):
+                counts[f'@{assignee["login"].lower()}'] += 1
+        _open_assignments_cache[repo] = (time.monotonic(), counts)
+        return counts
+
+
+def _pick_least_loaded(
+    reviewers: dict[str, dict[str, str]],
+    team_settings: dict[str, dict[str, float]],
+    open_assignments: collections.Counter[str],
+) -> str:
+    """Pick a reviewer from the team with the lowest weighted load.
+
+    A team's load is the number of open listing requests assigned to its
+    members, divided by the team's ``weight`` (default 1). Teams that have
+    reached their ``capacity`` are skipped, unless every team has. Ties are
+    broken randomly.
+    """
+    members: dict[str, list[str]] = collections.defaultdict(list)
+    for name, info in reviewers.items():
+        members[info['team']].append(name)
+
+    def load(name: str) -> int:
+        return open_assignments[name.lower()]
+
+    team_loads = {team: sum(load(name) for name in names) for team, names in members.items()}
+    available = [
+        team
+        for team in members
+        if team_loads[team] < team_settings.get(team, {}).get('capacity', math.inf)
+    ] or list(members)
+    scores = {
+        team: team_loads[team] / team_settings.get(team, {}).get('weight', 1) for team in available
+    }
+    lowest = min(scores.values())
+    team = random.choice([team for team, score in scores.items() if score == lowest])  # noqa: S311
+    lowest = min(load(name) for name in members[team])
+    return random.choice([name for name in members[team] if load(name) == lowest])  # noqa: S311
+
+
 def assign_review(
     issue_number: int,
     reviewers_file: pathlib.Path,
     dry_run: bool = False,
     repo: str | None = None,
+    strategy: str = 'random',
 ):
     """Assign the issue to a team.
 
@@ -229,22 +345,38 @@ def assign_review(
     every possible reviewer added as a collaborator on the repository), so they
     are expected to simply ping them in a comment. Once they have submitted
     their review, the author can interact with them in the usual way.
+
+    With the ``random`` strategy, the team is picked uniformly at random. With
+    the ``least-loaded`` strategy, the team with the fewest open listing
+    requests (adjusted by the optional ``weight`` and ``capacity`` in the
+    ``teams`` section of the reviewers file) is picked.
     """
-    with reviewers_file.open('r') as f:
-        reviewers_data = yaml.safe_load(f)
+    if strategy not in ASSIGNMENT_STRATEGIES:
+        raise ValueError(f'Unknown assignment strategy: {strategy!r}')
+    reviewers_data = yaml_loader.load_file(reviewers_file)
     reviewers = reviewers_data['reviewers']
-    teams = [info['team'] for info in reviewers.values()]
-    team = random.choice(teams)  # noqa: S311
-    # If there happen to be multiple people in a team, then randomly pick among
-    # them.
-    team_reviewers = [name for name, info in reviewers.items() if info['team'] == team]
-    reviewer = random.choice(team_reviewers)  # noqa: S311
+    if strategy == 'least-loaded':
+        open_assignments = get_open_assignments(repo)
+        reviewer = _pick_least_loaded(
+            reviewers, reviewers_data.get('teams') or {}, open_assignments
+        )
+    else:
+        teams = [info['team'] for info in reviewers.values()]
+        team = random.choice(teams)  # noqa: S311
+        # If there happen to be multiple people in a team, then randomly pick among
+        # them.
+        team_reviewers = [name for name, info in reviewers.items() if info['team'] == team]
+        reviewer = random.choice(team_reviewers)  # noqa: S311
 
     if not dry_run:
         cmd = ['gh', 'issue', 'edit', str(issue_number), '--add-assignee', reviewer[1:]]
         if repo:
             cmd.extend(['--repo', repo])
-        subprocess.run(cmd, check=True)
+        github.run(cmd)
+        if strategy == 'least-loaded':
+            # Keep the cached counts current for the rest of the sweep.
+            with _open_assignments_lock:
+                open_assignments[reviewer.lower()] += 1
     return reviewer
 
 
@@ -256,6 +388,7 @@ def update_gh_issue(
     dry_run: bool = False,
     assign_to: str | None = None,
     repo: str | None = None,
+    assignment_strategy: str = 'random',
 ):
     """Update the specified GitHub issue with the latest generated comment."""
     # Update the issue title.
@@ -266,7 +399,7 @@ def update_gh_issue(
         cmd = ['gh', 'issue', 'edit', str(issue_number), '--title', summary]
         if repo:
             cmd.extend(['--repo', repo])
-        subprocess.run(cmd, check=True)
+        github.run(cmd)
 
     # Assign the issue to the specified reviewer, or pick one automatically.
     if assign_to:
@@ -275,19 +408,21 @@ def update_gh_issue(
             cmd = ['gh', 'issue', 'edit', str(issue_number), '--add-assignee', username]
             if repo:
                 cmd.extend(['--repo', repo])
-            subprocess.run(cmd, check=True)
+            github.run(cmd)
         manager = f'@{username}'
     else:
         assert reviewers_file is not None  # Enforced by argument parser.
         cmd = ['gh', 'issue', 'view', str(issue_number), '--json', 'assignees']
         if repo:
             cmd.extend(['--repo', repo])
-        gh = subprocess.run(cmd, capture_output=True, text=True)
+        gh = github.run(cmd, capture_output=True, check=False)
         assignees = json.loads(gh.stdout.strip()).get('assignees', [])
         manager = (
             assignees[0]['login']
             if assignees
-            else assign_review(issue_number, reviewers_file, dry_run, repo)
+            else assign_review(
+                issue_number, reviewers_file, dry_run, repo, strategy=assignment_strategy
+            )
         )
     request_review = re.sub(
         r'\s',
@@ -304,7 +439,7 @@ review within the next three working days.
     cmd = ['gh', 'issue', 'view', str(issue_number), '--json', 'comments']
     if repo:
         cmd.extend(['--repo', repo])
-    existing_comments = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    existing_comments = github.run(cmd, capture_output=True)
     existing_comments = json.loads(existing_comments.stdout.strip()).get('comments', [])
     if not existing_comments:
         # Create a new comment.
@@ -314,7 +449,7 @@ review within the next three working days.
             cmd = ['gh', 'issue', 'comment', str(issue_number), '--body', comment]
             if repo:
                 cmd.extend(['--repo', repo])
-            subprocess.run(cmd, check=True)
+            github.run(cmd)
         return
 
     # Update the first comment with the new content.
@@ -332,11 +467,56 @@ review within the next three working days.
         ]
         if repo:
             cmd.extend(['--repo', repo])
-        subprocess.run(cmd, check=True)
+        github.run(cmd)
+
 
+def add_checklist_section(comment: str, section: str) -> str:
+    """Add a section of extra items (such as for the charm's libraries) to the checklist.
 
-def apply_automated_checks(issue_data: _IssueData, comment: str):
-    """Adjust the comment to tick items based on automated checks."""
+    The section goes at the end of the checklist, inside its code block.
+    """
+    head, fence, tail = comment.rpartition('\n```')
+    if not fence:
+        return f'{comment.rstrip()}\n\n{section}\n'
+    return f'{head.rstrip()}\n\n{section}{fence}{tail}'
+
+
+def _commit_to_review(issue_data: _IssueData) -> str:
+    requested = issue_data.get('commit')
+    if requested:
+        return requested
+    return resolve_commit(issue_data['project_repo'], issue_data['default_branch']) or ''
+
+
+def review_commit(issue_number: int, repo: str | None = None) -> str:
+    """The commit that a review of the issue would check, if it started now.
+
+    This is the commit requested in the issue, if any, or otherwise the
+    current tip of the review branch. An empty string means that the branch
+    couldn't be resolved.
+    """
+    return _commit_to_review(get_details_from_issue(issue_number, repo=repo))
+
+
+def apply_automated_checks(issue_data: _IssueData, comment: str, run_tooling: bool = True):
+    """Adjust the comment to tick items based on automated checks.
+
+    The checks are run against a single commit: the one requested in the
+    issue, if any, or otherwise the current tip of the review branch. The
+    comment records which commit that was, so that the results can be
+    reproduced. If the commit requested in the issue isn't a full commit SHA,
+    no checks are run, and the comment says why.
+    """
+    requested = issue_data.get('commit')
+    if requested and not is_commit_sha(requested):
+        shown = requested.replace('`', '')
+        return comment.replace(
+            '<details>',
+            f'The automated checks were not run, because the review commit `{shown}` is not '
+            'a full commit SHA.\n\n<details>',
+            1,
+        )
+    commit = _commit_to_review(issue_data)
     results = evaluate(
         issue_data['name'],
         issue_data['project_repo'],
@@ -346,15 +526,67 @@ def apply_automated_checks(issue_data: _IssueData, comment: str):
         issue_data['security_link'],
         issue_data['default_branch'],
         charm_dir=issue_data.get('charm_dir', '.'),
+        commit=commit or '',
+        run_tooling=run_tooling,
     )
+    if commit:
+        comment = comment.replace(
+            '<details>', f'Automated checks ran against commit `{commit}`.\n\n<details>', 1
+        )
     for result in results:
         # Convert Sphinx refs in the result to match the converted comment.
         result = convert_sphinx_refs(result)
-        if result.replace('* [x]', '* [ ]') in comment:
-            comment = comment.replace(result.replace('* [x]', '* [ ]'), result)
+        if result and not result.startswith('* ['):
+            comment = add_checklist_section(comment, result)
+            continue
+        # A result may have details on the lines after the item itself.
+        unchecked_item = result.split('\n', 1)[0].replace('* [x]', '* [ ]')
+        if unchecked_item in comment:
+            comment = comment.replace(unchecked_item, result)
     return comment
 
 
+def review_issue(
+    issue_number: int,
+    reviewers_file: pathlib.Path | None = None,
+    dry_run: bool = False,
+    assign_to: str | None = None,
+    repo: str | None = None,
+    assignment_strategy: str = 'random',
+    run_tooling: bool = True,
+    commit: str = '',
+):
+    """Evaluate the charm requested in the issue and post/update the review comment.
+
+    If ``commit`` is given, that commit is checked, rather than the one that
+    `review_commit` would find now.
+    """
+    issue_data = get_details_from_issue(issue_number, repo=repo)
+    if commit:
+        issue_data['commit'] = commit
+
+    summary = issue_summary(issue_data['name'])
+    comment = issue_comment(
+        issue_data['name'],
+        issue_data['demo_url'],
+        issue_data['ci_release_url'],
+        issue_data['ci_integration_url'],
+        issue_data['documentation_link'],
+    )
+    comment = apply_automated_checks(issue_data, comment, run_tooling=run_tooling)
+
+    update_gh_issue(
+        issue_number,
+        summary,
+        comment,
+        reviewers_file=reviewers_file,
+        dry_run=dry_run,
+        assign_to=assign_to,
+        repo=repo,
+        assignment_strategy=assignment_strategy,
+    )
+
+
 def main():
     """Extract information from the issue and post/update a review comment."""
     parser = argparse.ArgumentParser(
@@ -374,6 +606,15 @@ def main():
         type=str,
         help='Override automatic reviewer assignment with this GitHub username',
     )
+    parser.add_argument(
+        '--assignment-strategy',
+        choices=ASSIGNMENT_STRATEGIES,
+        default='random',
+        help=(
+            'How to pick the team to assign the review to: uniformly at random, or the team '
+            'with the fewest open listing requests'
+        ),
+    )
     parser.add_argument(
         '--dry-run', action='store_true', help='Do not update the issue, just print the output'
     )
@@ -382,29 +623,54 @@ def main():
         type=str,
         help='GitHub repository in OWNER/REPO format (e.g. canonical/charmhub-listing-review)',
     )
+    parser.add_argument(
+        '--skip-tooling',
+        action='store_true',
+        help=(
+            "Check that the charm provides the expected commands, but don't run them. This "
+            'allows fetching only the files the checks need, rather than cloning the repository'
+        ),
+    )
+    parser.add_argument(
+        '--queue-db',
+        type=pathlib.Path,
+        help=(
+            'Path to a SQLite job queue shared with other runs, so that a review that is '
+            'already in progress for the issue is waited for rather than repeated'
+        ),
+    )
     args = parser.parse_args()
 
-    issue_data = get_details_from_issue(args.issue_number, repo=args.repo)
-
-    summary = issue_summary(issue_data['name'])
-    comment = issue_comment(
-        issue_data['name'],
-        issue_data['demo_url'],
-        issue_data['ci_release_url'],
-        issue_data['ci_integration_url'],
-        issue_data['documentation_link'],
-    )
-    comment = apply_automated_checks(issue_data, comment)
+    def review(commit: str = ''):
+        review_issue(
+            args.issue_number,
+            reviewers_file=args.reviewers_file,
+            dry_run=args.dry_run,
+            assign_to=args.assign_to,
+            repo=args.repo,
+            assignment_strategy=args.assignment_strategy,
+            run_tooling=not args.skip_tooling,
+            commit=commit,
+        )
 
-    update_gh_issue(
-        args.issue_number,
-        summary,
-        comment,
-        reviewers_file=args.reviewers_file,
-        dry_run=args.dry_run,
-        assign_to=args.assign_to,
-        repo=args.repo,
-    )
+    try:
+        if not args.queue_db:
+            review()
+            return
+        # Jobs are per issue and commit, so a review of a new commit doesn't
+        # wait for (and then reuse) a review of an older one.
+        commit = review_commit(args.issue_number, repo=args.repo)
+        job_queue = jobs.JobQueue(args.queue_db, stale_after=jobs.STALE_AFTER_SECONDS)
+        try:
+            job = jobs.run_job(
+                job_queue, args.issue_number, lambda: review(commit), commit_sha=commit
+            )
+        finally:
+            job_queue.close()
+        if job.state == jobs.FAILED:
+            raise SystemExit(f'The review of issue #{args.issue_number} failed: {job.error}')
+    finally:
+        github.report_budget()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,315 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Scratch directories for fetching and evaluating charm repositories.
+
+Every evaluation gets its own workspace under a shared base directory, which
+can be set with the ``CHARMHUB_LISTING_REVIEW_WORKSPACE_DIR`` environment
+variable (for example, to put it on a tmpfs). When an evaluation is finished
+with its workspace, the workspace is renamed out of the way (which is
+instant) and deleted by a background reaper thread, so that removing a large
+tree isn't on the critical path.
+
+Workspaces left behind by processes that crashed are removed when the
+manager starts, and the total size of all workspaces can be limited with
+``CHARMHUB_LISTING_REVIEW_WORKSPACE_QUOTA`` (in bytes). With a quota, each
+workspace reserves an estimate of the space it needs when it is created, and
+is then charged for what it actually uses whenever the evaluation measures it
+(while fetching the repository, and after running the charm's tooling), see
+`WorkspaceManager.charge`. The total is tracked as workspaces are created,
+measured, and deleted, so finding out how much space is left never walks the
+directories.
+"""
+
+import errno
+import os
+import pathlib
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+WORKSPACE_DIR_ENV = 'CHARMHUB_LISTING_REVIEW_WORKSPACE_DIR'
+WORKSPACE_QUOTA_ENV = 'CHARMHUB_LISTING_REVIEW_WORKSPACE_QUOTA'
+# Workspaces older than this are assumed to be abandoned, even if the process
+# that created them is still running.
+STALE_AFTER_SECONDS = 24 * 60 * 60
+# How long to wait for the reaper to free space before giving up.
+QUOTA_WAIT_SECONDS = 60
+# How much space a new workspace reserves until it has been measured. Most
+# charm repositories, checked out at depth 1, are well under this.
+WORKSPACE_ESTIMATE_BYTES = 50 * 1024 * 1024
+
+_WORKSPACE_PREFIX = 'ws-'
+_TRASH_PREFIX = 'trash-'
+
+
+def _directory_size(path: pathlib.Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                # Files come and go while evaluations are running.
+                pass
+    return total
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # It exists, but belongs to someone else.
+        return True
+    return True
+
+
+class WorkspaceManager:
+    """Creates workspaces under ``base_dir``, and deletes them in the background.
+
+    ``quota`` limits the total size, in bytes, of the workspaces that this
+    manager creates (including ones waiting to be deleted, and abandoned ones
+    found when it starts); ``None`` means no limit.
+    """
+
+    def __init__(
+        self,
+        base_dir: pathlib.Path | str | None = None,
+        quota: int | None = None,
+        stale_after: float = STALE_AFTER_SECONDS,
+    ):
+        if base_dir is None:
+            base_dir = pathlib.Path(tempfile.gettempdir()) / 'charmhub-listing-review'
+        self.base_dir = pathlib.Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.quota = quota
+        self.stale_after = stale_after
+        self._trash: queue.Queue[pathlib.Path] = queue.Queue()
+        self._reaper: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._freed = threading.Condition(self._lock)
+        # The bytes reserved by each workspace (or deleted workspace, until it
+        # is gone), when there is a quota.
+        self._reserved: dict[pathlib.Path, int] = {}
+        self.collect_garbage()
+
+    def collect_garbage(self) -> list[pathlib.Path]:
+        """Queue abandoned workspaces for deletion, and return them.
+
+        A workspace is abandoned if the process that created it is no longer
+        running, or if it is older than ``stale_after``. Workspaces that were
+        released but not yet deleted (for example, because the process exited
+        first) are always collected.
+        """
+        collected: list[pathlib.Path] = []
+        now = time.time()
+        for path in self.base_dir.iterdir():
+            if path.name.startswith(_TRASH_PREFIX):
+                collected.append(path)
+                continue
+            if not path.name.startswith(_WORKSPACE_PREFIX):
+                continue
+            pid = path.name.removeprefix(_WORKSPACE_PREFIX).split('-', 1)[0]
+            try:
+                abandoned = not _process_exists(int(pid))
+                abandoned = abandoned or now - path.stat().st_mtime > self.stale_after
+            except (ValueError, OSError):
+                continue
+            if abandoned:
+                collected.append(path)
+        for path in collected:
+            # Abandoned workspaces take up space until they are deleted. This
+            # is the only time that directories are measured.
+            size = _directory_size(path) if self.quota is not None else 0
+            self._delete_later(path, size)
+        return collected
+
+    def usage(self) -> int:
+        """The total bytes charged to workspaces that haven't been deleted yet."""
+        with self._lock:
+            return sum(self._reserved.values())
+
+    def available(self) -> int | None:
+        """How many more bytes can be used before reaching the quota, if there is one."""
+        if self.quota is None:
+            return None
+        return max(0, self.quota - self.usage())
+
+    def budget(self, path: pathlib.Path | str) -> int | None:
+        """The most that the workspace can grow to, or ``None`` if there is no quota.
+
+        This is what the workspace has already been charged, plus whatever
+        isn't charged to any workspace.
+        """
+        if self.quota is None:
+            return None
+        with self._lock:
+            charged = self._reserved.get(pathlib.Path(path), 0)
+            return max(0, charged + self.quota - sum(self._reserved.values()))
+
+    def _workspace(self, path: pathlib.Path | str) -> pathlib.Path | None:
+        try:
+            name = pathlib.Path(path).relative_to(self.base_dir).parts[0]
+        except (ValueError, IndexError):
+            return None
+        return self.base_dir / name if name.startswith(_WORKSPACE_PREFIX) else None
+
+    def charge(self, path: pathlib.Path | str) -> int | None:
+        """Measure the workspace that contains ``path``, and charge it for that space.
+
+        The charge replaces the workspace's estimate (or previous charge), so
+        it can go down as well as up. The workspace is measured without
+        holding the lock.
+
+        Returns:
+            The size of the workspace in bytes, or ``None`` if ``path`` isn't
+            in one of the workspaces.
+
+        Raises:
+            OSError: with ``errno.ENOSPC``, if the workspaces now use more
+                than the quota.
+        """
+        root = self._workspace(path)
+        if root is None:
+            return None
+        size = _directory_size(root)
+        if self.quota is None:
+            return size
+        with self._freed:
+            if root not in self._reserved:
+                # Already released.
+                return size
+            self._reserved[root] = size
+            total = sum(self._reserved.values())
+            self._freed.notify_all()
+        if total > self.quota:
+            raise OSError(
+                errno.ENOSPC,
+                f'Workspace quota of {self.quota} bytes exceeded in {self.base_dir} '
+                f'({root.name} uses {size} bytes)',
+            )
+        return size
+
+    def create(
+        self, estimate: int = WORKSPACE_ESTIMATE_BYTES, timeout: float = QUOTA_WAIT_SECONDS
+    ) -> pathlib.Path:
+        """Create a new, empty, workspace.
+
+        If there is a quota, ``estimate`` bytes (or whatever is left, if that
+        is less) are reserved for the workspace, in the same step as checking
+        what is available, so concurrent callers never count the same space
+        twice. The reservation stands until the workspace is measured with
+        `charge`. If the quota has been reached, this waits (up to ``timeout``
+        seconds) for released workspaces to be deleted.
+
+        Raises:
+            OSError: with ``errno.ENOSPC``, if the quota is still exceeded
+                after ``timeout``.
+        """
+        deadline = time.monotonic() + timeout
+        with self._freed:
+            reservation = 0
+            if self.quota is not None:
+                while (available := self.quota - sum(self._reserved.values())) <= 0:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or (self._trash.empty() and not self._reaping()):
+                        raise OSError(
+                            errno.ENOSPC,
+                            f'Workspace quota of {self.quota} bytes reached in {self.base_dir}',
+                        )
+                    self._freed.wait(min(remaining, 1))
+                reservation = min(estimate, available)
+            path = pathlib.Path(
+                tempfile.mkdtemp(prefix=f'{_WORKSPACE_PREFIX}{os.getpid()}-', dir=self.base_dir)
+            )
+            if self.quota is not None:
+                self._reserved[path] = reservation
+            return path
+
+    def release(self, path: pathlib.Path | str):
+        """Hand a workspace back, to be deleted in the background."""
+        path = pathlib.Path(path)
+        if path.parent == self.base_dir and path.name.startswith(_WORKSPACE_PREFIX):
+            # Renaming is instant, and means that the workspace can't be
+            # mistaken for a live one while it is being deleted.
+            trash = path.with_name(_TRASH_PREFIX + path.name)
+            try:
+                path.rename(trash)
+            except OSError:
+                pass
+            else:
+                with self._lock:
+                    if path in self._reserved:
+                        self._reserved[trash] = self._reserved.pop(path)
+                path = trash
+        self._delete_later(path)
+
+    def wait(self):
+        """Wait for all released workspaces to be deleted."""
+        self._trash.join()
+
+    def _reaping(self) -> bool:
+        return self._reaper is not None
+
+    def _delete_later(self, path: pathlib.Path, size: int = 0):
+        with self._lock:
+            if size:
+                self._reserved[path] = self._reserved.get(path, 0) + size
+            self._trash.put(path)
+            if self._reaper is None:
+                # Not a daemon thread: workspaces should still be removed when
+                # the main thread finishes. The reaper exits once there is
+                # nothing left to delete.
+                self._reaper = threading.Thread(target=self._reap, name='workspace-reaper')
+                self._reaper.start()
+
+    def _reap(self):
+        while True:
+            with self._lock:
+                try:
+                    path = self._trash.get_nowait()
+                except queue.Empty:
+                    self._reaper = None
+                    return
+            try:
+                shutil.rmtree(path, ignore_errors=True)
+            finally:
+                self._trash.task_done()
+            with self._freed:
+                self._reserved.pop(path, None)
+                self._freed.notify_all()
+
+
+_manager: WorkspaceManager | None = None
+_manager_lock = threading.Lock()
+
+
+def manager() -> WorkspaceManager:
+    """The workspace manager shared by the whole process.
+
+    It is created (collecting any abandoned workspaces) on first use, with the
+    base directory and quota from the environment.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            quota = os.environ.get(WORKSPACE_QUOTA_ENV)
+            _manager = WorkspaceManager(
+                os.environ.get(WORKSPACE_DIR_ENV) or None, int(quota) if quota else None
+            )
+        return _manager
@@ -0,0 +1,160 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Load YAML documents quickly, and safely from untrusted repositories.
+
+All YAML in the project is loaded through `load` (or `load_file`), which uses
+PyYAML's libyaml-based ``CSafeLoader`` when PyYAML was built with libyaml, and
+the pure-Python ``SafeLoader`` otherwise. Both construct the same (safe)
+Python objects.
+
+The charm files come from arbitrary repositories, so there are limits on
+what will be loaded:
+
+* Documents larger than `MAX_YAML_BYTES` are rejected without being parsed.
+* Aliases are shared references in the node graph, so a small document can
+  describe a huge structure (a "billion laughs" document). The size of the
+  graph with every alias expanded is calculated before anything is
+  constructed, and documents that would expand to more than `MAX_YAML_NODES`
+  nodes are rejected.
+
+Both are reported with `YAMLLimitError`, which is a ``yaml.YAMLError``, so
+callers that already handle invalid YAML also handle these.
+
+Run ``python -m charmhub_listing_review.yaml_loader FILE...`` to compare the
+speed of the two loaders on some files.
+"""
+
+import argparse
+import io
+import pathlib
+import time
+from typing import IO, Any
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML wasn't built with libyaml.
+    from yaml import SafeLoader
+
+MAX_YAML_BYTES = 1024 * 1024
+MAX_YAML_NODES = 100_000
+
+
+class YAMLLimitError(yaml.YAMLError):
+    """The document is too large, or would expand to too large a structure."""
+
+
+def _expanded_size(node: yaml.Node, max_nodes: int) -> int:
+    """The number of nodes in the graph under ``node``, with each alias expanded.
+
+    Shared nodes are only walked once, so this is linear in the size of the
+    document, rather than of the expansion.
+    """
+    sizes: dict[int, int] = {}
+
+    def size(node: yaml.Node) -> int:
+        if id(node) in sizes:
+            return sizes[id(node)]
+        # A recursive structure refers to itself, which doesn't expand further.
+        sizes[id(node)] = 1
+        if isinstance(node, yaml.SequenceNode):
+            children = node.value
+        elif isinstance(node, yaml.MappingNode):
+            children = [child for pair in node.value for child in pair]
+        else:
+            return 1
+        total = 1
+        for child in children:
+            total += size(child)
+            if total > max_nodes:
+                raise YAMLLimitError(f'The document expands to more than {max_nodes} nodes.')
+        sizes[id(node)] = total
+        return total
+
+    try:
+        return size(node)
+    except RecursionError:
+        raise YAMLLimitError('The document is nested too deeply.') from None
+
+
+def load(
+    source: str | bytes | IO[str] | IO[bytes],
+    *,
+    max_bytes: int = MAX_YAML_BYTES,
+    max_nodes: int = MAX_YAML_NODES,
+    loader: type[Any] = SafeLoader,
+) -> Any:
+    """Load a single YAML document, like ``yaml.safe_load`` but within the limits.
+
+    Raises:
+        YAMLLimitError: if the document is over ``max_bytes`` (in bytes, or
+            characters for text) or expands to more than ``max_nodes`` nodes.
+        yaml.YAMLError: if the document isn't valid YAML.
+    """
+    if not isinstance(source, str | bytes):
+        source = source.read(max_bytes + 1)
+    if len(source) > max_bytes:
+        raise YAMLLimitError(f'The document is larger than {max_bytes} bytes.')
+    instance = loader(source)
+    try:
+        node = instance.get_single_node()
+        if node is None:
+            return None
+        _expanded_size(node, max_nodes)
+        return instance.construct_document(node)
+    finally:
+        instance.dispose()
+
+
+def load_file(path: pathlib.Path, **limits: Any) -> Any:
+    """Load the YAML document in the file at ``path`` (see `load`)."""
+    with path.open('rb') as f:
+        return load(f, **limits)
+
+
+def benchmark(paths: list[pathlib.Path], repeat: int = 200) -> dict[str, float]:
+    """The mean time, in seconds, that each loader takes to load all of ``paths``."""
+    contents = [path.read_bytes() for path in paths]
+    loaders = {'SafeLoader': yaml.SafeLoader}
+    if SafeLoader is not yaml.SafeLoader:
+        loaders['CSafeLoader'] = SafeLoader
+    timings = {}
+    for name, loader in loaders.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for content in contents:
+                load(io.BytesIO(content), loader=loader)
+        timings[name] = (time.perf_counter() - start) / repeat
+    return timings
+
+
+def main():
+    """Compare the speed of the YAML loaders."""
+    parser = argparse.ArgumentParser(description='Time loading YAML files with each loader.')
+    parser.add_argument('paths', nargs='+', type=pathlib.Path, help='The YAML files to load')
+    parser.add_argument('--repeat', type=int, default=200, help='How many times to load them')
+    args = parser.parse_args()
+    timings = benchmark(args.paths, args.repeat)
+    for name, seconds in timings.items():
+        print(f'{name:<12} {seconds * 1000:8.3f} ms')
+    if 'CSafeLoader' in timings:
+        print(f'CSafeLoader is {timings["SafeLoader"] / timings["CSafeLoader"]:.1f}x faster.')
+    else:
+        print('PyYAML was built without libyaml, so only SafeLoader is available.')
+
+
+if __name__ == '__main__':
+    main()
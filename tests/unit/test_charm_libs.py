@@ -0,0 +1,152 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the Charmhub library index."""
+
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.charm_libs as charm_libs
+import charmhub_listing_review.result_cache as result_cache
+
+INTERFACE_LIB = b'''"""Library for the `db` interface.
+
+Use it on the requiring side:
+
+    from charms.my_charm.v0.db import DatabaseRequires
+"""
+
+import ops
+
+LIBID = 'abc123'
+LIBAPI = 0
+LIBPATCH = 7
+PYDEPS: list[str] = ['pydantic>=2']
+
+
+class DatabaseRequires(ops.Object):
+    def _on_relation_changed(self, event: ops.RelationChangedEvent):
+        pass
+'''
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = result_cache.ResultCache(tmp_path / 'cache')
+    monkeypatch.setattr(result_cache, '_cache', cache)
+    return cache
+
+
+def test_parse_lib():
+    lib = charm_libs.parse_lib(INTERFACE_LIB, 'lib/charms/my_charm/v0/db.py')
+    assert lib.name == 'db'
+    assert lib.docstring.startswith('Library for the `db` interface.')
+    assert (lib.libid, lib.libapi, lib.libpatch) == ('abc123', 0, 7)
+    assert lib.uses_relations
+    assert lib.publishing_problems() == []
+    assert not lib.error
+
+
+def test_parse_lib_general_and_invalid():
+    lib = charm_libs.parse_lib(b'LIBAPI = "zero"\ndef helper(): ...\n', 'x.py')
+    assert lib.libapi is None
+    assert not lib.uses_relations
+    assert lib.docstring == ''
+    assert charm_libs.parse_lib(b'def (:', 'x.py').error
+
+
+@pytest.mark.parametrize(
+    'source',
+    [
+        b'from ops import RelationDataContent\n',
+        b'import ops\ndef f(event: ops.RelationJoinedEvent): ...\n',
+        b'def f(charm):\n    return charm.model.relations["db"]\n',
+        b'def f(charm):\n    charm.framework.observe(charm.on.db_relation_changed, f)\n',
+    ],
+)
+def test_parse_lib_uses_relations(source):
+    assert charm_libs.parse_lib(source, 'x.py').uses_relations
+
+
+@pytest.mark.parametrize(
+    'source',
+    [
+        b'def correlation(relations, relationship): ...\n',
+        b'class RelationshipGraph:\n    relation_count = 0\n',
+        b'import ops\ndef f(event: ops.ConfigChangedEvent): ...\n',
+    ],
+)
+def test_parse_lib_does_not_use_relations(source):
+    assert not charm_libs.parse_lib(source, 'x.py').uses_relations
+
+
+@pytest.mark.parametrize(
+    'source,problems',
+    [
+        (
+            b'LIBAPI = "zero"\nLIBPATCH = -1\n',
+            [
+                '`LIBID` is missing, or is not a string.',
+                '`LIBAPI` is missing, or is not a non-negative integer.',
+                '`LIBPATCH` is missing, or is not a non-negative integer.',
+            ],
+        ),
+        (
+            b'LIBID = "abc"\nLIBAPI = 1\nLIBPATCH = 2\n',
+            ['`LIBAPI` is 1, but the library is in `v0`.'],
+        ),
+        (b'LIBID = "abc"\nLIBAPI = 0\nLIBPATCH = 2\n', []),
+    ],
+)
+def test_publishing_problems(source, problems):
+    lib = charm_libs.parse_lib(source, 'lib/charms/my_charm/v0/db.py')
+    assert lib.publishing_problems() == problems
+
+
+def _write_libs(charm_dir, count):
+    for i in range(count):
+        path = charm_dir / 'lib' / 'charms' / 'my_charm' / f'v{i % 2}' / f'lib{i}.py'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(INTERFACE_LIB.replace(b'LIBPATCH = 7', f'LIBPATCH = {i}'.encode()))
+
+
+def test_index_libs(tmp_path):
+    charm_dir = tmp_path / 'charm'
+    _write_libs(charm_dir, 4)
+    other = charm_dir / 'lib' / 'charms' / 'other_charm' / 'v0' / 'other.py'
+    other.parent.mkdir(parents=True)
+    other.write_text('"""Someone else\'s library."""\n')
+    (charm_dir / 'lib' / 'charms' / 'my_charm' / 'v0' / '__init__.py').write_text('')
+    libs = charm_libs.index_libs(charm_dir, 'my-charm')
+    assert [(lib.path, lib.libpatch) for lib in libs] == [
+        ('lib/charms/my_charm/v0/lib0.py', 0),
+        ('lib/charms/my_charm/v0/lib2.py', 2),
+        ('lib/charms/my_charm/v1/lib1.py', 1),
+        ('lib/charms/my_charm/v1/lib3.py', 3),
+    ]
+    assert charm_libs.index_libs(charm_dir, 'other-charm')[0].docstring == (
+        "Someone else's library."
+    )
+    assert charm_libs.index_libs(charm_dir, 'missing') == []
+
+
+def test_index_libs_is_cached(tmp_path):
+    _write_libs(tmp_path / 'a', 2)
+    _write_libs(tmp_path / 'b', 2)
+    first = charm_libs.index_libs(tmp_path / 'a', 'my_charm')
+    with mock.patch.object(charm_libs, 'parse_lib') as mock_parse:
+        # The same content, elsewhere, is also answered from the cache.
+        assert charm_libs.index_libs(tmp_path / 'b', 'my_charm') == first
+    mock_parse.assert_not_called()
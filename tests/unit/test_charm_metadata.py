@@ -0,0 +1,101 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the merged charm metadata view."""
+
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.charm_metadata as charm_metadata
+import charmhub_listing_review.yaml_loader as yaml_loader
+
+METADATA_YAML = """\
+name: legacy
+display-name: Legacy Charm
+summary: An older charm.
+docs: https://discourse.charmhub.io/t/legacy/1
+issues: https://github.com/org/legacy/issues
+source: https://github.com/org/legacy
+requires:
+  database:
+    interface: mysql
+    optional: true
+"""
+
+
+@pytest.fixture
+def legacy_charm(tmp_path):
+    (tmp_path / 'metadata.yaml').write_text(METADATA_YAML)
+    (tmp_path / 'actions.yaml').write_text('do-something:\n  description: Does it.\n')
+    (tmp_path / 'config.yaml').write_text('options:\n  log-level:\n    type: string\n')
+    return tmp_path
+
+
+def test_legacy_files(legacy_charm):
+    metadata = charm_metadata.CharmMetadata(legacy_charm)
+    assert metadata.get('name') == 'legacy'
+    assert metadata.get('title') == 'Legacy Charm'
+    assert metadata.get('actions') == {'do-something': {'description': 'Does it.'}}
+    assert metadata.get('config') == {'options': {'log-level': {'type': 'string'}}}
+    assert metadata.get('links') == {
+        'documentation': 'https://discourse.charmhub.io/t/legacy/1',
+        'issues': 'https://github.com/org/legacy/issues',
+        'source': 'https://github.com/org/legacy',
+    }
+    assert 'provides' not in metadata
+    assert metadata.get('provides', {}) == {}
+    assert metadata.source('requires') == 'metadata.yaml'
+    assert metadata.source('actions') == 'actions.yaml'
+    assert metadata.describe_source('title') == '`title` is the `display-name` in metadata.yaml'
+    assert metadata.describe_source('config') == '`config` is from config.yaml'
+
+
+def test_charmcraft_yaml_is_preferred(legacy_charm):
+    (legacy_charm / 'charmcraft.yaml').write_text('name: modern\nactions: {}\n')
+    metadata = charm_metadata.CharmMetadata(legacy_charm)
+    assert metadata.get('name') == 'modern'
+    assert metadata.get('actions') == {}
+    assert metadata.source('name') == 'charmcraft.yaml'
+    assert metadata.describe_source('name') is None
+    # Keys that charmcraft.yaml doesn't have still come from the other files.
+    assert metadata.get('title') == 'Legacy Charm'
+    assert metadata.get('config') == {'options': {'log-level': {'type': 'string'}}}
+
+
+def test_files_are_loaded_lazily_and_once(legacy_charm):
+    metadata = charm_metadata.CharmMetadata(legacy_charm)
+    with mock.patch.object(yaml_loader, 'load_file', wraps=yaml_loader.load_file) as load_file:
+        metadata.get('actions')
+        metadata.get('actions')
+        assert 'actions' in metadata
+    # There isn't a charmcraft.yaml, so only actions.yaml is loaded.
+    assert [call.args[0].name for call in load_file.call_args_list] == ['actions.yaml']
+
+
+def test_invalid_files_are_ignored(tmp_path):
+    (tmp_path / 'charmcraft.yaml').write_text('name: [')
+    (tmp_path / 'metadata.yaml').write_text('- a list')
+    metadata = charm_metadata.CharmMetadata(tmp_path)
+    assert metadata.document('charmcraft.yaml') is None
+    assert metadata.get('name') is None
+
+
+def test_view_is_shared_until_files_change(legacy_charm):
+    metadata = charm_metadata.view(legacy_charm)
+    assert charm_metadata.view(legacy_charm) is metadata
+    (legacy_charm / 'actions.yaml').write_text('other: {}\n')
+    changed = charm_metadata.view(legacy_charm)
+    assert changed is not metadata
+    assert changed.get('actions') == {'other': {}}
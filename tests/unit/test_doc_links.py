@@ -0,0 +1,201 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test checking the links in the documentation."""
+
+import pathlib
+import time
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.doc_links as doc_links
+import charmhub_listing_review.links as links
+import charmhub_listing_review.result_cache as result_cache
+
+
+@pytest.fixture(autouse=True)
+def check_results(monkeypatch, tmp_path_factory):
+    cache = result_cache.ResultCache(tmp_path_factory.mktemp('results'))
+    monkeypatch.setattr(result_cache, '_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def probe():
+    """Pretend that URLs containing 'broken' are a 404, and everything else is fine."""
+
+    def fake_probe(url):
+        return links.LinkStatus(url, 404 if 'broken' in url else 200)
+
+    with mock.patch('charmhub_listing_review.links.probe', side_effect=fake_probe) as patched:
+        yield patched
+
+
+def _targets(path, text):
+    return [(link.line, link.target) for link in doc_links.extract(path, text.splitlines())]
+
+
+def test_extract_markdown():
+    text = """# Title
+
+[![Badge](https://img.example.com/badge.svg)](https://ci.example.com/job)
+See [the docs](https://docs.example.com/a "Title"), or <https://example.com/auto>.
+Bare: https://example.com/bare. And [Foo](https://en.wikipedia.org/wiki/Foo_(bar)).
+Not `https://example.com/code` and [relative](docs/how-to.md#section).
+
+```shell
+curl https://example.com/fenced
+```
+
+[ref]: https://example.com/ref
+"""
+    assert _targets('README.md', text) == [
+        (3, 'https://img.example.com/badge.svg'),
+        (3, 'https://ci.example.com/job'),
+        (4, 'https://docs.example.com/a'),
+        (4, 'https://example.com/auto'),
+        (5, 'https://en.wikipedia.org/wiki/Foo_(bar)'),
+        (5, 'https://example.com/bare'),
+        (6, 'docs/how-to.md#section'),
+        (12, 'https://example.com/ref'),
+    ]
+
+
+def test_extract_rst():
+    text = """Title
+=====
+
+See `the docs <https://docs.example.com/>`_ and `Other`_, or https://example.com/bare.
+Not ``https://example.com/literal``::
+
+    curl https://example.com/literal-block
+
+.. note::
+
+    Read https://example.com/note first.
+
+.. code-block:: shell
+
+    curl https://example.com/code-block
+
+.. _Other: https://example.com/other
+.. _label:
+"""
+    assert _targets('docs/index.rst', text) == [
+        (4, 'https://docs.example.com/'),
+        (4, 'https://example.com/bare'),
+        (11, 'https://example.com/note'),
+        (17, 'https://example.com/other'),
+    ]
+
+
+@pytest.mark.parametrize(
+    'path,expected',
+    [
+        ('README.md', True),
+        ('readme.rst', True),
+        ('CONTRIBUTING.md', True),
+        ('.github/CONTRIBUTING.md', True),
+        ('docs/how-to/deploy.md', True),
+        ('docs/index.rst', True),
+        ('README', False),
+        ('docs/diagram.png', False),
+        ('src/README.md', False),
+        ('CHANGELOG.md', False),
+    ],
+)
+def test_is_doc_path(path, expected):
+    assert doc_links.is_doc_path(pathlib.PurePosixPath(path)) == expected
+
+
+def test_review(tmp_path, probe):
+    (tmp_path / 'docs' / 'how-to').mkdir(parents=True)
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'README.md').write_text(
+        '[Docs](docs/index.md) and [missing](docs/missing.md)\n'
+        '![Diagram](docs/diagram.png)\n'
+        'See https://example.com/ok and https://example.com/broken\n'
+    )
+    (tmp_path / 'CONTRIBUTING.md').write_text('[Ok](https://example.com/ok)\n')
+    (tmp_path / 'docs' / 'index.md').write_text('[Up](../README.md) [Deploy](how-to/deploy.md)\n')
+    (tmp_path / 'docs' / 'how-to' / 'deploy.rst').write_text(
+        '\n`Broken <https://example.com/broken>`_\n'
+    )
+    (tmp_path / 'src' / 'notes.md').write_text('https://example.com/broken/not-checked\n')
+    report = doc_links.review([tmp_path, tmp_path])
+    assert report.documents == 4
+    assert [problem.describe() for problem in report.broken] == [
+        'README.md:1: docs/missing.md (no such file in the repository)',
+        'README.md:3: https://example.com/broken (status 404)',
+        'docs/how-to/deploy.rst:2: https://example.com/broken (status 404)',
+        'docs/index.md:1: how-to/deploy.md (no such file in the repository)',
+    ]
+    # Each URL is only requested once, however often it appears.
+    assert sorted(call.args[0] for call in probe.call_args_list) == [
+        'https://example.com/broken',
+        'https://example.com/ok',
+    ]
+    assert report.skipped == {}
+
+
+def test_review_nested_search_dirs(tmp_path, probe):
+    charm_dir = tmp_path / 'charms' / 'a'
+    charm_dir.mkdir(parents=True)
+    (charm_dir / 'README.md').write_text('[Missing](missing.md)\n')
+    (tmp_path / 'README.md').write_text('[Charm](charms/a/README.md)\n')
+    report = doc_links.review([charm_dir, tmp_path])
+    assert report.documents == 2
+    assert [problem.describe() for problem in report.broken] == [
+        'charms/a/README.md:1: missing.md (no such file in the repository)',
+    ]
+
+
+def test_review_no_documents(tmp_path, probe):
+    (tmp_path / 'charmcraft.yaml').write_text('name: foo\n')
+    assert doc_links.review([tmp_path]) == doc_links.LinkReport(0, 0, [], {})
+    probe.assert_not_called()
+
+
+def test_review_per_host_limit(tmp_path, probe, monkeypatch):
+    lines = [f'https://a.example.com/{i} https://b.example.com/{i}' for i in range(5)]
+    (tmp_path / 'README.md').write_text('\n'.join([*lines, lines[-1]]))
+    monkeypatch.setenv(doc_links.MAX_LINKS_PER_HOST_ENV, '3')
+    report = doc_links.review([tmp_path])
+    assert report.checked == 6
+    assert report.skipped == {'a.example.com': 2, 'b.example.com': 2}
+    assert probe.call_count == 6
+    assert doc_links.review([tmp_path], max_per_host=10).skipped == {}
+
+
+@pytest.mark.parametrize('value', ['', 'lots', '0', '-1'])
+def test_max_links_per_host_default(value, monkeypatch):
+    monkeypatch.setenv(doc_links.MAX_LINKS_PER_HOST_ENV, value)
+    assert doc_links.max_links_per_host() == doc_links.MAX_LINKS_PER_HOST
+
+
+def test_check_urls_cached(probe, check_results):
+    urls = ['https://example.com/ok', 'https://example.com/broken']
+    first = doc_links.check_urls(urls)
+    assert first['https://example.com/ok'].ok
+    assert not first['https://example.com/broken'].ok
+    # Only the link that resolved is cached, so the broken one is checked again.
+    probe.reset_mock()
+    assert doc_links.check_urls(urls) == first
+    probe.assert_called_once_with('https://example.com/broken')
+    # Cached results expire.
+    probe.reset_mock()
+    with mock.patch.object(time, 'time', return_value=time.time() + doc_links.CACHE_TTL + 1):
+        doc_links.check_urls(['https://example.com/ok'])
+    probe.assert_called_once_with('https://example.com/ok')
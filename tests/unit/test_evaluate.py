@@ -14,12 +14,52 @@
 
 """Test the automated criteria evaluation."""
 
+import http.server
+import io
+import os
+import pathlib
+import shutil
 import subprocess  # noqa: S404
+import sys
+import tarfile
+import threading
 from unittest import mock
 
 import pytest
 
+import charmhub_listing_review.charm_metadata as charm_metadata
 import charmhub_listing_review.evaluate as evaluate
+import charmhub_listing_review.licenses as licenses
+import charmhub_listing_review.links as links
+import charmhub_listing_review.result_cache as result_cache
+import charmhub_listing_review.workspace as workspace
+
+
+@pytest.fixture(autouse=True, scope='module')
+def license_index(tmp_path_factory):
+    index = licenses.LicenseIndex.load(tmp_path_factory.mktemp('licenses') / 'index.json')
+    with mock.patch.object(licenses, '_index', index):
+        yield index
+
+
+@pytest.fixture(autouse=True)
+def clear_remotes(monkeypatch):
+    monkeypatch.setattr(evaluate, '_remotes', {})
+
+
+@pytest.fixture(autouse=True)
+def check_results(monkeypatch, tmp_path_factory):
+    cache = result_cache.ResultCache(tmp_path_factory.mktemp('results'))
+    monkeypatch.setattr(result_cache, '_cache', cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def workspaces(monkeypatch, tmp_path_factory):
+    manager = workspace.WorkspaceManager(tmp_path_factory.mktemp('workspaces'))
+    monkeypatch.setattr(workspace, '_manager', manager)
+    yield manager
+    manager.wait()
 
 
 class TestGetDefaultBranch:
@@ -50,6 +90,13 @@ class TestGetDefaultBranch:
 class TestEvaluateCharmDir:
     """Test that evaluate() correctly handles the charm_dir parameter."""
 
+    @pytest.fixture(autouse=True)
+    def no_remote(self):
+        remote = mock.Mock(spec=evaluate.RemoteRepository)
+        remote.commit.return_value = None
+        with mock.patch('charmhub_listing_review.evaluate.remote_repository', return_value=remote):
+            yield
+
     @mock.patch('charmhub_listing_review.evaluate._clone_repo')
     def test_evaluate_with_charm_dir(self, mock_clone, tmp_path):
         """evaluate() runs checks against the subdirectory."""
@@ -116,26 +163,451 @@ class TestEvaluateCharmDir:
             )
 
 
-class TestCloneRepo:
+class TestEvaluatePath:
+    def test_evaluates_working_tree_in_place(self, tmp_path):
+        (tmp_path / 'charmcraft.yaml').write_text('name: my-charm\n')
+        (tmp_path / 'pyproject.toml').write_text('[project]\nrequires-python = ">=3.10"\n')
+        results = evaluate.evaluate_path('my-charm', tmp_path, run_tooling=False)
+        assert any(r.startswith('* [x]') and 'requires-python' in r for r in results)
+        assert (tmp_path / 'charmcraft.yaml').is_file()
+
+    def test_rejects_traversal_charm_dir(self, tmp_path):
+        with pytest.raises(ValueError, match="'\\.\\.'"):
+            evaluate.evaluate_path('my-charm', tmp_path, charm_dir='../elsewhere')
+
+    def test_local_repository(self, tmp_path):
+        git = ['/usr/bin/git', '-C', str(tmp_path)]
+        subprocess.run([*git, 'init', '-q', '-b', 'feature'], check=True)
+        subprocess.run(
+            [*git, 'remote', 'add', 'origin', 'git@github.com:org/my-charm-operator.git'],
+            check=True,
+        )
+        assert evaluate.local_repository(tmp_path) == (
+            'https://github.com/org/my-charm-operator',
+            'feature',
+        )
+
+    def test_local_repository_without_git(self, tmp_path):
+        assert evaluate.local_repository(tmp_path / 'missing') == ('', '')
+
+
+class TestEvaluateCharms:
+    @pytest.fixture
+    def monorepo(self, tmp_path):
+        for name in ('alpha', 'beta'):
+            charm = tmp_path / 'charms' / name
+            charm.mkdir(parents=True)
+            (charm / 'charmcraft.yaml').write_text(f'name: {name}\n')
+        (tmp_path / 'charms' / 'beta' / 'pyproject.toml').write_text(
+            '[project]\nrequires-python = ">=3.10"\n'
+        )
+        (tmp_path / '.tox' / 'ignored').mkdir(parents=True)
+        (tmp_path / '.tox' / 'ignored' / 'charmcraft.yaml').write_text('name: ignored\n')
+        return tmp_path
+
+    def test_discover_charms(self, monorepo):
+        assert evaluate.discover_charms(monorepo) == ['charms/alpha', 'charms/beta']
+
+    @mock.patch('charmhub_listing_review.evaluate.remote_repository')
+    @mock.patch('charmhub_listing_review.evaluate._fetch_source')
+    def test_evaluates_each_charm_once(self, mock_fetch, mock_remote, monorepo):
+        mock_fetch.return_value = monorepo
+        single = evaluate.evaluate_path('alpha', monorepo / 'charms' / 'alpha', run_tooling=False)
+        with mock.patch(
+            'charmhub_listing_review.evaluate._repository_checks', return_value=['* [ ] repo']
+        ) as mock_repository_checks:
+            results = evaluate.evaluate_charms(
+                'https://github.com/org/monorepo', '', '', '', '', run_tooling=False
+            )
+        mock_fetch.assert_called_once()
+        mock_repository_checks.assert_called_once()
+        assert list(results) == ['charms/alpha', 'charms/beta']
+        alpha_name, alpha = results['charms/alpha']
+        beta_name, beta = results['charms/beta']
+        assert (alpha_name, beta_name) == ('alpha', 'beta')
+        assert alpha[0] == beta[0] == '* [ ] repo'
+        assert alpha[1:] == single[5:]
+        assert not any(r.startswith('* [x]') and 'requires-python' in r for r in alpha)
+        assert any(r.startswith('* [x]') and 'requires-python' in r for r in beta)
+
+    @mock.patch('charmhub_listing_review.evaluate.remote_repository')
+    @mock.patch('charmhub_listing_review.evaluate._fetch_source')
+    def test_explicit_charm_dirs(self, mock_fetch, mock_remote, monorepo):
+        mock_fetch.return_value = monorepo
+        results = evaluate.evaluate_charms(
+            'https://github.com/org/monorepo',
+            '',
+            '',
+            '',
+            '',
+            charm_dirs=['charms/beta'],
+            run_tooling=False,
+        )
+        assert list(results) == ['charms/beta']
+        assert mock_fetch.call_args.args[3] == ['charms/beta']
+
+    def test_rejects_traversal_charm_dir(self):
+        with pytest.raises(ValueError, match='relative path'):
+            evaluate.evaluate_charms(
+                'https://github.com/org/repo', '', '', '', '', charm_dirs=['/etc']
+            )
+
+
+class TestRemoteRepository:
+    LS_REMOTE = (
+        'ref: refs/heads/main\tHEAD\n'
+        'abc123\tHEAD\n'
+        'def456\trefs/heads/develop\n'
+        'abc123\trefs/heads/main\n'
+    )
+
     @mock.patch('subprocess.run')
+    def test_resolves_once(self, mock_run):
+        mock_run.return_value = mock.Mock(stdout=self.LS_REMOTE)
+        url = 'https://github.com/org/repo'
+        assert evaluate.get_default_branch(url) == 'main'
+        assert evaluate.resolve_commit(url) == 'abc123'
+        assert evaluate.resolve_commit(url, 'develop') == 'def456'
+        assert evaluate.resolve_commit(url, 'missing') is None
+        remote = evaluate.remote_repository(url)
+        assert remote.blob_url('LICENSE') == f'{url}/blob/main/LICENSE'
+        assert remote.blob_url('LICENSE', 'develop') == f'{url}/blob/develop/LICENSE'
+        mock_run.assert_called_once()
+
+    @mock.patch(
+        'subprocess.run',
+        side_effect=subprocess.CalledProcessError(128, 'git', stderr='repository not found'),
+    )
+    def test_caches_missing_repository(self, mock_run, monkeypatch):
+        url = 'file:///nonexistent/repo'
+        remote = evaluate.remote_repository(url)
+        assert not remote.exists
+        assert remote.error == 'repository not found'
+        # Later callers fail fast, without contacting the remote again.
+        assert evaluate.resolve_commit(url) is None
+        with pytest.raises(subprocess.CalledProcessError):
+            evaluate.evaluate('my-charm', url, '', '', '', '')
+        mock_run.assert_called_once()
+        # Once the failure expires, the remote is tried again.
+        monkeypatch.setattr(evaluate, 'REMOTE_ERROR_TTL_SECONDS', 0)
+        assert evaluate.resolve_commit(url) is None
+        assert mock_run.call_count == 2
+
+    def test_sees_new_commits(self, tmp_path, monkeypatch):
+        origin = tmp_path / 'origin'
+        git = ['/usr/bin/git', '-C', str(origin), '-c', 'user.name=t', '-c', 'user.email=t@t']
+        subprocess.run(['/usr/bin/git', 'init', '-q', '-b', 'main', str(origin)], check=True)
+        (origin / 'file.txt').write_text('first')
+        subprocess.run([*git, 'add', '.'], check=True)
+        subprocess.run([*git, 'commit', '-qm', 'first'], check=True)
+        url = origin.as_uri()
+        first = evaluate.resolve_commit(url)
+        (origin / 'file.txt').write_text('second')
+        subprocess.run([*git, 'commit', '-qam', 'second'], check=True)
+        # Within an evaluation, the lookup is shared.
+        assert evaluate.resolve_commit(url) == first
+        monkeypatch.setattr(evaluate, 'REMOTE_TTL_SECONDS', 0)
+        second = evaluate.resolve_commit(url)
+        assert second is not None and second != first
+
+
+class TestCloneRepo:
+    @mock.patch('charmhub_listing_review.evaluate._run_git_limited')
     def test_clone_without_branch(self, mock_run):
         evaluate._clone_repo('https://github.com/org/repo')
         cmd = mock_run.call_args[0][0]
         assert '--branch' not in cmd
 
-    @mock.patch('subprocess.run')
+    @mock.patch('charmhub_listing_review.evaluate._run_git_limited')
     def test_clone_with_branch(self, mock_run):
         evaluate._clone_repo('https://github.com/org/repo', branch='develop')
         cmd = mock_run.call_args[0][0]
         assert '--branch' in cmd
         assert cmd[cmd.index('--branch') + 1] == 'develop'
+        # The clone is watched, like a fetch of an exact commit.
+        assert mock_run.call_args.kwargs['max_bytes'] == evaluate.MAX_CLONE_BYTES
 
-    @mock.patch('subprocess.run')
+    @mock.patch('charmhub_listing_review.evaluate._run_git_limited')
     def test_clone_with_empty_branch(self, mock_run):
         evaluate._clone_repo('https://github.com/org/repo', branch='')
         cmd = mock_run.call_args[0][0]
         assert '--branch' not in cmd
 
+    def test_clone_exact_commit(self, tmp_path):
+        origin = tmp_path / 'origin'
+        git = ['/usr/bin/git', '-C', str(origin), '-c', 'user.name=t', '-c', 'user.email=t@t']
+        subprocess.run(['/usr/bin/git', 'init', '-q', '-b', 'main', str(origin)], check=True)
+        (origin / 'file.txt').write_text('first')
+        subprocess.run([*git, 'add', '.'], check=True)
+        subprocess.run([*git, 'commit', '-qm', 'first'], check=True)
+        first = subprocess.run(
+            [*git, 'rev-parse', 'HEAD'], check=True, capture_output=True, text=True
+        ).stdout.strip()
+        (origin / 'file.txt').write_text('second')
+        subprocess.run([*git, 'commit', '-qam', 'second'], check=True)
+        # Allow fetching commits that are no longer the tip of a branch.
+        subprocess.run([*git, 'config', 'uploadpack.allowAnySHA1InWant', 'true'], check=True)
+        url = origin.as_uri()
+        assert evaluate.resolve_commit(url) != first
+        assert evaluate.resolve_commit(url, 'main') == evaluate.resolve_commit(url)
+        assert evaluate.resolve_commit(url, 'missing') is None
+        repo_dir = evaluate._clone_repo(url, commit=first)
+        try:
+            assert (repo_dir / 'file.txt').read_text() == 'first'
+        finally:
+            shutil.rmtree(repo_dir)
+
+    def test_clone_commit_when_server_rejects_sha(self, tmp_path, monkeypatch):
+        origin = tmp_path / 'origin'
+        git = ['/usr/bin/git', '-C', str(origin), '-c', 'user.name=t', '-c', 'user.email=t@t']
+        subprocess.run(['/usr/bin/git', 'init', '-q', '-b', 'main', str(origin)], check=True)
+        (origin / 'file.txt').write_text('first')
+        subprocess.run([*git, 'add', '.'], check=True)
+        subprocess.run([*git, 'commit', '-qm', 'first'], check=True)
+        first = subprocess.run(
+            [*git, 'rev-parse', 'HEAD'], check=True, capture_output=True, text=True
+        ).stdout.strip()
+        (origin / 'file.txt').write_text('second')
+        subprocess.run([*git, 'commit', '-qam', 'second'], check=True)
+        # With protocol version 0, the server refuses to send a commit that no
+        # branch or tag points to, like many git hosts do.
+        monkeypatch.setenv('GIT_CONFIG_COUNT', '1')
+        monkeypatch.setenv('GIT_CONFIG_KEY_0', 'protocol.version')
+        monkeypatch.setenv('GIT_CONFIG_VALUE_0', '0')
+        url = origin.as_uri()
+        repo_dir = evaluate._clone_repo(url, 'main', commit=first)
+        try:
+            assert (repo_dir / 'file.txt').read_text() == 'first'
+        finally:
+            shutil.rmtree(repo_dir)
+        # The commit must be in the recent history of the branch.
+        monkeypatch.setattr(evaluate, 'COMMIT_FALLBACK_DEPTH', 1)
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            evaluate._clone_repo(url, 'main', commit=first)
+        assert exc_info.value.stderr == (
+            f'commit {first} could not be fetched directly, and is not in the last 1 commits '
+            'of branch main'
+        )
+
+    def test_clone_rejects_abbreviated_commit(self):
+        with pytest.raises(ValueError, match='full commit SHA'):
+            evaluate._clone_repo('https://github.com/org/repo', commit='abc123')
+
+    @mock.patch('charmhub_listing_review.evaluate._directory_size', return_value=10)
+    def test_clone_size_limit(self, mock_size, tmp_path):
+        watch = tmp_path / 'watch'
+        watch.mkdir()
+        with pytest.raises(subprocess.CalledProcessError, match='sleep'):
+            evaluate._run_git_limited(['sleep', '5'], str(watch), timeout=10, max_bytes=1)
+
+    def test_clone_charges_workspace(self, tmp_path, monkeypatch):
+        manager = workspace.WorkspaceManager(tmp_path / 'workspaces', quota=10_000)
+        monkeypatch.setattr(workspace, '_manager', manager)
+        root = manager.create(estimate=5_000)
+        script = f'import pathlib; pathlib.Path({str(root)!r}, "big").write_bytes(bytes(20_000))'
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            evaluate._run_git_limited(
+                [sys.executable, '-c', script], str(root), timeout=10, max_bytes=100_000
+            )
+        assert 'quota' in exc_info.value.stderr
+        assert manager.usage() == 20_000
+
+    def test_clone_timeout(self, tmp_path):
+        with pytest.raises(subprocess.TimeoutExpired):
+            evaluate._run_git_limited(['sleep', '5'], str(tmp_path), timeout=0.1, max_bytes=1000)
+
+
+def _make_archive(files: dict[str, bytes], top: str = 'repo-sha') -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(f'{top}/{name}')
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+        link = tarfile.TarInfo(f'{top}/charms/my-charm/tox.ini')
+        link.type = tarfile.SYMTYPE
+        link.linkname = '/etc/passwd'
+        tar.addfile(link)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def archive_server(monkeypatch):
+    """A stand-in for codeload.github.com, serving a single archive."""
+    archives: dict[str, bytes] = {}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = archives.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv(
+        evaluate.ARCHIVE_URL_ENV,
+        f'http://127.0.0.1:{server.server_address[1]}/{{owner}}/{{repo}}/{{commit}}',
+    )
+    yield archives
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def web_server():
+    """Serve documents, given as (content type, body, whether to send the length)."""
+    pages: dict[str, tuple[str, bytes, bool]] = {}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path not in pages:
+                self.send_error(404)
+                return
+            content_type, body, send_length = pages[self.path]
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            if send_length:
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except OSError:
+                # The client stopped reading.
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', pages
+    server.shutdown()
+    server.server_close()
+
+
+class TestFetchUrl:
+    def test_text(self, web_server):
+        base_url, pages = web_server
+        pages['/LICENSE'] = ('text/plain; charset=utf-8', 'Licença\n'.encode(), True)
+        assert evaluate._fetch_url(f'{base_url}/LICENSE') == 'Licença\n'
+        assert evaluate._fetch_url(f'{base_url}/missing') is None
+
+    @pytest.mark.parametrize('send_length', [True, False])
+    def test_size_cap(self, web_server, send_length):
+        base_url, pages = web_server
+        pages['/big'] = ('text/plain', b'x' * 1000, send_length)
+        assert evaluate._fetch_url(f'{base_url}/big', max_bytes=999) is None
+        assert evaluate._fetch_url(f'{base_url}/big', max_bytes=1000) == 'x' * 1000
+
+    def test_not_text(self, web_server):
+        base_url, pages = web_server
+        pages['/image'] = ('image/png', b'PNG', True)
+        pages['/binary'] = ('text/plain', b'\0' * evaluate.FETCH_CHUNK_BYTES * 4, False)
+        assert evaluate._fetch_url(f'{base_url}/image') is None
+        assert evaluate._fetch_url(f'{base_url}/binary') is None
+
+    def test_stops_early(self, web_server):
+        base_url, pages = web_server
+        pages['/stream'] = ('text/plain', b'x' * evaluate.FETCH_CHUNK_BYTES * 10, False)
+        chunks = []
+        assert evaluate._stream_url(f'{base_url}/stream', lambda c: bool(chunks.append(c)) or True)
+        assert len(chunks) == 1
+
+
+class TestFetchArchive:
+    COMMIT = 'a' * 40
+
+    def test_extracts_only_needed_files(self, archive_server):
+        archive_server[f'/org/repo/{self.COMMIT}'] = _make_archive({
+            'README.md': b'readme',
+            'LICENSE': b'license',
+            '.github/SECURITY.md': b'security',
+            'docs/how-to/CONTRIBUTING.md': b'contributing',
+            'docs/diagram.png': b'PNG',
+            'src/README.md': b'not documentation',
+            'charms/my-charm/CONTRIBUTING.md': b'contributing',
+            'charms/my-charm/charmcraft.yaml': b'name: my-charm\n',
+            'charms/my-charm/src/charm.py': b'import ops\n',
+            'charms/my-charm/lib/charms/my_charm/v0/lib.py': b'"""Lib."""\n',
+            'charms/other/charmcraft.yaml': b'name: other\n',
+        })
+        repo_dir = evaluate._fetch_source(
+            'https://github.com/org/repo',
+            commit=self.COMMIT,
+            charm_dirs=['charms/my-charm'],
+            run_tooling=False,
+        )
+        try:
+            files = sorted(
+                p.relative_to(repo_dir).as_posix() for p in repo_dir.rglob('*') if p.is_file()
+            )
+            assert files == [
+                '.github/SECURITY.md',
+                'LICENSE',
+                'README.md',
+                'charms/my-charm/CONTRIBUTING.md',
+                'charms/my-charm/charmcraft.yaml',
+                'charms/my-charm/lib/charms/my_charm/v0/lib.py',
+                'docs/how-to/CONTRIBUTING.md',
+            ]
+        finally:
+            shutil.rmtree(repo_dir)
+
+    def test_extracts_legacy_metadata(self, archive_server):
+        archive_server[f'/org/repo/{self.COMMIT}'] = _make_archive({
+            'metadata.yaml': b'name: legacy\ndisplay-name: Legacy\n',
+            'actions.yaml': b'run-backup: {}\n',
+            'config.yaml': b'options: {}\n',
+            'src/charm.py': b'import ops\n',
+        })
+        repo_dir = evaluate._fetch_source(
+            'https://github.com/org/repo', commit=self.COMMIT, run_tooling=False
+        )
+        try:
+            files = sorted(p.name for p in repo_dir.rglob('*') if p.is_file())
+            assert files == ['actions.yaml', 'config.yaml', 'metadata.yaml']
+            metadata = charm_metadata.view(repo_dir)
+            assert metadata.get('title') == 'Legacy'
+            assert 'run-backup' in metadata.get('actions')
+        finally:
+            shutil.rmtree(repo_dir)
+
+    def test_size_cap(self, archive_server):
+        archive_server[f'/org/repo/{self.COMMIT}'] = _make_archive({
+            'charmcraft.yaml': os.urandom(10_000)
+        })
+        url = evaluate._archive_url('https://github.com/org/repo', self.COMMIT)
+        assert url is not None
+        with pytest.raises(ValueError, match='larger than'):
+            evaluate._fetch_archive(url, max_bytes=1000)
+
+    @mock.patch('charmhub_listing_review.evaluate._clone_repo')
+    def test_falls_back_to_clone(self, mock_clone, archive_server):
+        evaluate._fetch_source(
+            'https://github.com/org/missing', commit=self.COMMIT, run_tooling=False
+        )
+        mock_clone.assert_called_once_with('https://github.com/org/missing', '', self.COMMIT)
+
+    @mock.patch('charmhub_listing_review.evaluate._fetch_archive')
+    @mock.patch('charmhub_listing_review.evaluate._clone_repo')
+    def test_clones_for_tooling_and_other_hosts(self, mock_clone, mock_fetch_archive):
+        evaluate._fetch_source('https://github.com/org/repo', commit=self.COMMIT)
+        evaluate._fetch_source(
+            'https://gitlab.com/org/repo', commit=self.COMMIT, run_tooling=False
+        )
+        mock_fetch_archive.assert_not_called()
+        assert mock_clone.call_count == 2
+
 
 @pytest.mark.parametrize(
     'name,expected',
@@ -190,14 +662,17 @@ def test_contribution_guidelines(mock_url_ok, status, expected):
     assert (result.startswith('* [x]')) == expected
 
 
+@mock.patch('charmhub_listing_review.licenses.identify')
 @mock.patch('charmhub_listing_review.evaluate._fetch_url')
-@pytest.mark.parametrize('license_hash', sorted(evaluate._known_licenses))
-def test_license_statement_known_license(mock_fetch, license_hash):
-    mock_fetch.return_value = 'Some License Version x.0, January 1979'
-    with mock.patch('hashlib.sha512') as mock_hash:
-        mock_hash.return_value.hexdigest.return_value = license_hash
-        result = evaluate.license_statement('url')
-        assert result.startswith('* [x]')
+@pytest.mark.parametrize('spdx_id', sorted(licenses.bundled_texts()))
+def test_license_statement_known_license(mock_fetch, mock_identify, spdx_id):
+    mock_fetch.return_value = licenses.bundled_texts()[spdx_id]
+    result = evaluate.license_statement('url')
+    assert result == (
+        f'* [x] The charm provides a license statement.\n  * Identified as {spdx_id} (100% match).'
+    )
+    # The exact text is recognised without the fuzzy comparison.
+    mock_identify.assert_not_called()
 
 
 @mock.patch('charmhub_listing_review.evaluate._fetch_url')
@@ -219,6 +694,103 @@ def test_security_doc(mock_url_ok, status, expected):
     assert result.startswith('* [x]') == expected
 
 
+@pytest.mark.parametrize(
+    'names,expected',
+    [
+        (['LICENSE'], 'LICENSE'),
+        (['licence.txt'], 'licence.txt'),
+        (['.github/COPYING.md'], '.github/COPYING.md'),
+        (['docs/License.rst', 'LICENSE'], 'LICENSE'),
+        (['charm/LICENSE'], 'charm/LICENSE'),
+        (['LICENSE.html', 'LICENSES/Apache-2.0'], None),
+    ],
+)
+def test_find_document(tmp_path, names, expected):
+    for name in names:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text('text')
+    result = evaluate.find_document([tmp_path, tmp_path / 'charm'], evaluate.LICENSE_NAMES)
+    assert result == (None if expected is None else tmp_path / expected)
+
+
+def test_license_statement_local_file(tmp_path):
+    license_path = tmp_path / 'LICENSE'
+    license_path.write_text((pathlib.Path(__file__).parents[2] / 'LICENSE').read_text())
+    assert evaluate.license_statement('', license_path) == (
+        '* [x] The charm provides a license statement.\n  * Identified as Apache-2.0 (100% match).'
+    )
+    license_path.write_text('All rights reserved.')
+    assert evaluate.license_statement('', license_path) == (
+        '* [ ] The charm provides a license statement.'
+    )
+
+
+def test_license_statement_reformatted(tmp_path):
+    license_path = tmp_path / 'LICENSE.md'
+    text = licenses.bundled_texts()['GPL-3.0']
+    license_path.write_text('# License\n\nCopyright 2026 Me\n\n' + ' '.join(text.split()))
+    result = evaluate.license_statement('', license_path)
+    assert result.startswith('* [x]')
+    assert 'Identified as GPL-3.0' in result
+    license_path.write_text(text[: len(text) * 2 // 3])
+    result = evaluate.license_statement('', license_path)
+    assert result.startswith('* [ ]')
+    assert 'Most similar to GPL-3.0' in result
+
+
+@mock.patch('charmhub_listing_review.evaluate._fetch_url')
+@mock.patch('charmhub_listing_review.evaluate._url_ok')
+def test_repository_checks_local_first(mock_url_ok, mock_fetch, tmp_path):
+    mock_url_ok.return_value = True
+    repository_url = 'https://github.com/canonical/foo-operator'
+    (tmp_path / '.github').mkdir()
+    (tmp_path / '.github' / 'CONTRIBUTING.md').write_text('# Contributing')
+    results = evaluate._repository_checks(
+        'lint',
+        f'{repository_url}/blob/main/CONTRIBUTING.md',
+        f'{repository_url}/blob/main/LICENSE',
+        'https://example.com/security',
+        repository_url,
+        [tmp_path],
+    )
+    assert results[1].startswith('* [x]')
+    # The license is in the repository, but not in the working copy, so it is
+    # missing, and there is no point fetching the GitHub page.
+    assert results[2].startswith('* [ ]')
+    mock_fetch.assert_not_called()
+    # The security policy is elsewhere, so is still checked over HTTP.
+    assert results[3].startswith('* [x]')
+    mock_url_ok.assert_called_once_with('https://example.com/security')
+
+
+def test_documentation_links(tmp_path, monkeypatch):
+    assert evaluate.documentation_links([tmp_path]) == ''
+    (tmp_path / 'README.md').write_text(
+        'See [the docs](https://example.com/docs) and [how-to](docs/how-to.md).\n'
+    )
+    statuses = {'https://example.com/docs': links.LinkStatus('https://example.com/docs', 200)}
+    with mock.patch(
+        'charmhub_listing_review.links.probe', side_effect=lambda url: statuses[url]
+    ) as probe:
+        result = evaluate.documentation_links([tmp_path])
+        assert result.splitlines() == [
+            'The links in the README, contributing guide, and `docs` directory were checked:',
+            '* [ ] These links are broken:',
+            '  * README.md:1: docs/how-to.md (no such file in the repository)',
+        ]
+        (tmp_path / 'docs').mkdir()
+        (tmp_path / 'docs' / 'how-to.md').write_text('https://example.com/a https://example.com/b')
+        monkeypatch.setenv('CHARMHUB_LISTING_REVIEW_MAX_LINKS_PER_HOST', '2')
+        statuses['https://example.com/a'] = links.LinkStatus('https://example.com/a', 200)
+        result = evaluate.documentation_links([tmp_path])
+    assert result.splitlines()[1:] == [
+        '* [x] All 3 of the checked links resolve.',
+        '  * Only the first 2 links to example.com were checked (skipped 1 more).',
+    ]
+    # The link that was already checked came from the cache.
+    assert probe.call_count == 2
+
+
 @pytest.mark.parametrize(
     'url,charm_name,expected',
     [
@@ -241,6 +813,66 @@ def test_repository_name(url, charm_name, expected):
     assert (result.startswith('* [x]')) == expected
 
 
+def test_charmcraft_tooling(tmp_path):
+    (tmp_path / 'Makefile').write_text(
+        'format:\n\truff format\nlint:\n\truff check\nunit:\n\tpytest\nintegration:\n\tpytest\n'
+    )
+    with mock.patch.object(subprocess, 'run') as run:
+        result = evaluate.charmcraft_tooling(tmp_path, run_commands=False)
+    assert result.startswith('* [ ]')
+    assert result.endswith('\n  * The commands were found, but not run.')
+    run.assert_not_called()
+
+    with mock.patch.object(subprocess, 'run') as run:
+        result = evaluate.charmcraft_tooling(tmp_path)
+    assert result.startswith('* [x]')
+    # Integration tests are never run, and the others are run in the charm directory.
+    assert sorted(call.args[0][1] for call in run.call_args_list) == ['format', 'lint', 'unit']
+    assert all(call.kwargs['cwd'] == tmp_path / '.' for call in run.call_args_list)
+
+    with mock.patch.object(
+        subprocess, 'run', side_effect=subprocess.CalledProcessError(2, 'make')
+    ) as run:
+        result = evaluate.charmcraft_tooling(tmp_path)
+    assert result.startswith('* [ ]')
+    assert result.endswith('failed, with exit status 2.')
+    run.assert_called_once()
+
+
+def test_charmcraft_tooling_quota(tmp_path, monkeypatch):
+    manager = workspace.WorkspaceManager(tmp_path / 'workspaces', quota=1000)
+    monkeypatch.setattr(workspace, '_manager', manager)
+    charm_dir = manager.create() / 'charm'
+    charm_dir.mkdir()
+    (charm_dir / 'Makefile').write_text(
+        'format:\n\truff format\nlint:\n\truff check\nunit:\n\tpytest\nintegration:\n\tpytest\n'
+    )
+
+    def make_venv(argv, **kwargs):
+        (charm_dir / '.venv').write_bytes(bytes(5000))
+
+    with mock.patch.object(subprocess, 'run', side_effect=make_venv) as run:
+        result = evaluate.charmcraft_tooling(charm_dir)
+    assert result.startswith('* [ ]')
+    assert 'Stopped after `make format`' in result
+    assert 'quota of 1000 bytes exceeded' in result
+    run.assert_called_once()
+
+
+def test_charmcraft_tooling_missing_command(tmp_path):
+    assert evaluate.charmcraft_tooling(tmp_path).startswith('* [ ]')
+
+    (tmp_path / 'tox.ini').write_text(
+        '[testenv:format]\n[testenv:lint]\n# [testenv:unit]\n[testenv:integration]\n'
+    )
+    with mock.patch.object(subprocess, 'run') as run:
+        result = evaluate.charmcraft_tooling(tmp_path)
+    first, detail = result.splitlines()
+    assert first.startswith('* [ ]')
+    assert detail == "  * `tox.ini` doesn't provide these commands: `unit`."
+    run.assert_not_called()
+
+
 def test_python_requires_version(tmp_path):
     pyproject = tmp_path / 'pyproject.toml'
     pyproject.write_text("""
@@ -274,6 +906,33 @@ def test_repo_has_lock_file(tmp_path, lock_file):
     result = evaluate.repo_has_lock_file(tmp2)
     assert result.startswith('* [ ]')
 
+    tmp3 = tmp_path / 'no_pyproject'
+    tmp3.mkdir()
+    (tmp3 / lock_file).write_text('lock')
+    result = evaluate.repo_has_lock_file(tmp3)
+    assert result.startswith('* [ ]')
+
+
+def test_repo_has_lock_file_out_of_date(tmp_path):
+    (tmp_path / 'pyproject.toml').write_text(
+        '[project]\nname = "foo"\nrequires-python = ">=3.12"\ndependencies = ["ops", "jinja2"]\n'
+    )
+    (tmp_path / 'uv.lock').write_text(
+        'version = 1\n'
+        'requires-python = ">=3.12"\n\n'
+        '[[package]]\nname = "ops"\nversion = "2.17.0"\n'
+    )
+    result = evaluate.repo_has_lock_file(tmp_path)
+    first, *details = result.splitlines()
+    assert first.startswith('* [ ]')
+    assert details == ["  * `uv.lock` doesn't include these dependencies: `jinja2`."]
+
+    with (tmp_path / 'uv.lock').open('a') as f:
+        f.write('\n[[package]]\nname = "Jinja2"\nversion = "3.1.4"\n')
+    result = evaluate.repo_has_lock_file(tmp_path)
+    assert result.startswith('* [x]')
+    assert '\n' not in result
+
 
 def test_charm_has_icon(tmp_path):
     icon = tmp_path / 'icon.svg'
@@ -290,6 +949,114 @@ def test_charm_has_icon(tmp_path):
     assert result.startswith('* [ ]')
 
 
+# The values that Charmcraft needs to publish a library.
+_LIB_VALUES = "LIBID = 'abc123'\nLIBAPI = 0\nLIBPATCH = 1\n"
+
+
+def test_charm_lib_docs(tmp_path):
+    assert evaluate.charm_lib_docs(tmp_path) == ''
+    (tmp_path / 'charmcraft.yaml').write_text('name: my-charm\n')
+    assert evaluate.charm_lib_docs(tmp_path) == ''
+    lib_dir = tmp_path / 'lib' / 'charms' / 'my_charm' / 'v0'
+    lib_dir.mkdir(parents=True)
+    (lib_dir / 'db.py').write_text(
+        '"""Provides and requires sides of the `db` interface."""\n'
+        'def on_changed(event: ops.RelationChangedEvent): ...\n'
+        "LIBID = 'abc123'\n"
+    )
+    (lib_dir / 'helpers.py').write_text(
+        '"""# Helpers for writing charms\n\n## Overview\n\nSome helpers.\n\n'
+        '## Audience\n\nA public library, for example:\n\n'
+        '    from charms.my_charm.v0 import helpers\n"""\n' + _LIB_VALUES
+    )
+    (lib_dir / 'broken.py').write_text('def (:\n')
+    sections = evaluate.charm_lib_docs(tmp_path).split('\n\n')
+    assert len(sections) == 3
+    assert sections[0].startswith("The `lib/charms/my_charm/v0/broken.py` library couldn't be")
+    assert sections[1].splitlines()[0] == (
+        'The `lib/charms/my_charm/v0/db.py` library looks like an interface library, '
+        "so the library's module docstring must contain the following information:"
+    )
+    # A one-line mention of the interface isn't a section about it.
+    assert sections[1].splitlines()[1:] == [
+        '* [ ] the interface(s) this library is for, and if it takes care of one or both of '
+        'the providing/requiring sides',
+        '* [ ] guidance on how to start when using the library to implement their end of the '
+        'interface',
+        '* [ ] The library sets the `LIBID`, `LIBAPI`, and `LIBPATCH` values that Charmcraft '
+        'needs to publish it.',
+        '  * `LIBAPI` is missing, or is not a non-negative integer.',
+        '  * `LIBPATCH` is missing, or is not a non-negative integer.',
+    ]
+    assert 'a general library' in sections[2]
+    assert [line[:5] for line in sections[2].splitlines()[1:]] == ['* [x]', '* [x]', '* [x]']
+
+
+@pytest.mark.parametrize(
+    'docstring,expected',
+    [
+        # Mentioning the items in passing doesn't tick them.
+        (
+            'Provides a helper that anyone can use, for example in the install hook.',
+            ['* [ ]', '* [ ]', '* [ ]'],
+        ),
+        (
+            'Purpose\n=======\n\nHelpers.\n\nWho should use this\n------------------\n\n'
+            'Any charm.\n\nUsage::\n\n    helpers.run()\n',
+            ['* [x]', '* [x]', '* [x]'],
+        ),
+        ('## Getting started\n\nCall `run()`.', ['* [ ]', '* [ ]', '* [x]']),
+        ('Helpers.\n\n```python\nhelpers.run()\n```', ['* [ ]', '* [ ]', '* [x]']),
+    ],
+)
+def test_charm_lib_docs_needs_sections(tmp_path, docstring, expected):
+    (tmp_path / 'charmcraft.yaml').write_text('name: my-charm\n')
+    lib_dir = tmp_path / 'lib' / 'charms' / 'my_charm' / 'v0'
+    lib_dir.mkdir(parents=True)
+    (lib_dir / 'helpers.py').write_text(f'"""{docstring}"""\n{_LIB_VALUES}')
+    lines = evaluate.charm_lib_docs(tmp_path).splitlines()
+    assert [line[:5] for line in lines[1:]] == expected
+
+
+def test_charm_lib_docs_interface_sections(tmp_path):
+    (tmp_path / 'charmcraft.yaml').write_text('name: my-charm\n')
+    lib_dir = tmp_path / 'lib' / 'charms' / 'my_charm' / 'v0'
+    lib_dir.mkdir(parents=True)
+    source = f'def setup(charm):\n    charm.model.get_relation("db")\n{_LIB_VALUES}'
+    (lib_dir / 'db.py').write_text(
+        f'"""Library for the db interface, providing data."""\n{source}'
+    )
+    lines = evaluate.charm_lib_docs(tmp_path).splitlines()
+    assert [line[:5] for line in lines[1:]] == ['* [ ]', '* [ ]']
+    (lib_dir / 'db.py').write_text(
+        f'"""# Database library\n\n## Requirer side\n\n    from charms.x import Db\n"""\n{source}'
+    )
+    lines = evaluate.charm_lib_docs(tmp_path).splitlines()
+    assert [line[:5] for line in lines[1:]] == ['* [x]', '* [x]']
+
+
+def test_charm_has_icon_details(tmp_path):
+    (tmp_path / 'icon.svg').write_text(
+        '<svg width="100" height="100">'
+        '<circle cx="50" cy="50" r="50" fill="url(#shiny)"/>'
+        '<rect x="2" y="10" width="96" height="80" fill="#fff"/>'
+        '</svg>'
+    )
+    assert evaluate.charm_has_icon(tmp_path).splitlines() == [
+        '* [x] The charm has an icon.',
+        '  * The canvas is 100x100 pixels.',
+        '  * The background circle is filled with a gradient, not a flat colour.',
+        '  * The logo has 2 pixels of padding inside the circle; at least 5 is recommended.',
+        '  * The icon uses gradients: avoid glossy materials, unless they are part of a logo.',
+        '  * The icon has 3 elements and 1 colours.',
+    ]
+    (tmp_path / 'icon.svg').write_text('<svg width="100" height="100">')
+    assert evaluate.charm_has_icon(tmp_path).splitlines() == [
+        '* [ ] The charm has an icon.',
+        '  * icon.svg could not be read: not valid XML (no element found, line 1).',
+    ]
+
+
 @pytest.mark.parametrize(
     'parts,expected_checked',
     [
@@ -421,17 +1188,50 @@ links:
         ),
     ],
 )
-@mock.patch('charmhub_listing_review.evaluate._url_ok')
+@mock.patch('charmhub_listing_review.links.probe')
 def test_metadata_links_parametrized(
-    mock_url_ok, tmp_path, yaml_content, link_ok, expected_checked
+    mock_probe, tmp_path, yaml_content, link_ok, expected_checked
 ):
     charmcraft_yaml = tmp_path / 'charmcraft.yaml'
     charmcraft_yaml.write_text(yaml_content)
-    mock_url_ok.return_value = link_ok
+    mock_probe.side_effect = lambda url: links.LinkStatus(url, 200 if link_ok else 404)
     result = evaluate.metadata_links(tmp_path)
     assert (result.startswith('* [x]')) == expected_checked
 
 
+@mock.patch('charmhub_listing_review.links.probe')
+def test_metadata_links_reports_every_problem(mock_probe, tmp_path):
+    (tmp_path / 'charmcraft.yaml').write_text("""
+name: foo
+title: Charm Template
+summary: A short summary.
+description: Custom description.
+links:
+    documentation: https://example.com/docs
+    issues: https://example.com/issues
+    source: [https://example.com/source, https://example.com/gone]
+    website: https://example.com/docs
+    contact: not an address
+""")
+    mock_probe.side_effect = lambda url: (
+        links.LinkStatus(url, 404) if url.endswith('gone') else links.LinkStatus(url, 200)
+    )
+    first, *details = evaluate.metadata_links(tmp_path).splitlines()
+    assert first.startswith('* [ ]')
+    assert details == [
+        "  * The `title` is the profile's default.",
+        "  * The `contact` link (not an address) isn't a URL or email address.",
+        '  * The `source` link (https://example.com/gone) failed: status 404.',
+    ]
+    # The documentation and website are the same, so are only checked once.
+    assert sorted(call.args[0] for call in mock_probe.call_args_list) == [
+        'https://example.com/docs',
+        'https://example.com/gone',
+        'https://example.com/issues',
+        'https://example.com/source',
+    ]
+
+
 def test_check_action_names_monorepo(tmp_path):
     """Checks work when charm files are in a subdirectory (monorepo)."""
     charm_dir = tmp_path / 'charms' / 'my-charm'
@@ -529,3 +1329,38 @@ def test_relations_includes_optional(tmp_path, yaml_content, expected_checked):
     charmcraft_yaml.write_text(yaml_content)
     result = evaluate.relations_includes_optional(tmp_path)
     assert (result.startswith('* [x]')) == expected_checked
+
+
+@mock.patch(
+    'charmhub_listing_review.links.probe', side_effect=lambda url: links.LinkStatus(url, 200)
+)
+def test_legacy_metadata_files(mock_probe, tmp_path):
+    (tmp_path / 'metadata.yaml').write_text("""
+name: legacy
+display-name: Legacy Charm
+summary: An older charm.
+description: It keeps its metadata in metadata.yaml.
+docs: https://example.com/docs
+issues: https://example.com/issues
+source: [https://example.com/source]
+website: https://example.com
+maintainers: [Jane Doe <jane@example.com>]
+requires:
+  database:
+    interface: mysql
+    optional: true
+""")
+    (tmp_path / 'actions.yaml').write_text('do_something: {}\n')
+    (tmp_path / 'config.yaml').write_text('options:\n  log-level: {}\n')
+
+    first, *details = evaluate.metadata_links(tmp_path).splitlines()
+    assert first.startswith('* [x]')
+    assert '  * `title` is the `display-name` in metadata.yaml.' in details
+    assert mock_probe.call_count == 4
+
+    first, *details = evaluate.action_names(tmp_path).splitlines()
+    assert first.startswith('* [ ]')
+    assert details == ['  * `actions` is from actions.yaml.']
+    assert evaluate.option_names(tmp_path).startswith('* [x]')
+    assert evaluate.relations_includes_optional(tmp_path).startswith('* [x]')
+    assert evaluate._charm_name(tmp_path) == 'legacy'
@@ -0,0 +1,96 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the repository file index."""
+
+import hashlib
+import os
+from unittest import mock
+
+import charmhub_listing_review.evaluate as evaluate
+import charmhub_listing_review.file_index as file_index
+import charmhub_listing_review.result_cache as result_cache
+
+
+def _make_tree(root):
+    for name in (
+        'charmcraft.yaml',
+        'src/charm.py',
+        'lib/charms/my_charm/v0/lib.py',
+        '.git/HEAD',
+        '.tox/unit/bin/python',
+        'node_modules/x/index.js',
+        '.github/workflows/ci.yaml',
+    ):
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(name)
+
+
+def test_build(tmp_path):
+    _make_tree(tmp_path)
+    os.symlink(tmp_path / 'src', tmp_path / 'link')
+    index = file_index.FileIndex.build(tmp_path)
+    assert index.root == tmp_path.resolve()
+    assert index.is_file('charmcraft.yaml')
+    assert index.is_file(tmp_path / 'src' / 'charm.py')
+    assert not index.is_file('src')
+    assert index.is_dir('lib/charms/my_charm')
+    assert index.is_dir('.')
+    # Ignored directories, and symbolic links to directories, aren't indexed.
+    assert not index.is_file('.git/HEAD')
+    assert not index.is_dir('node_modules')
+    assert not index.is_file('link/charm.py')
+    assert index.listdir() == ['.github', 'charmcraft.yaml', 'lib', 'src']
+    assert index.listdir('missing') == []
+    assert index.info('charmcraft.yaml') == file_index.FileInfo(
+        len('charmcraft.yaml'), (tmp_path / 'charmcraft.yaml').stat().st_mtime_ns
+    )
+    assert sorted(p.relative_to(index.root).as_posix() for p in index.files('lib')) == [
+        'lib/charms/my_charm/v0/lib.py'
+    ]
+    assert not index.contains(tmp_path.parent)
+
+
+def test_hash_is_calculated_once(tmp_path):
+    (tmp_path / 'file').write_text('content')
+    index = file_index.FileIndex.build(tmp_path)
+    expected = hashlib.sha256(b'content').hexdigest()
+    assert index.hash('file') == expected
+    with mock.patch('hashlib.file_digest') as mock_digest:
+        assert index.hash(tmp_path / 'file') == expected
+    mock_digest.assert_not_called()
+    assert index.hash('missing') is None
+
+
+def test_lookup(tmp_path):
+    _make_tree(tmp_path)
+    with file_index.indexed(tmp_path) as index:
+        assert file_index.lookup(tmp_path) is index
+        assert file_index.lookup(tmp_path / 'lib' / 'charms') is index
+        # Files created after the index was built aren't seen.
+        (tmp_path / 'icon.svg').write_text('<svg/>')
+        assert not file_index.lookup(tmp_path).is_file('icon.svg')
+    assert file_index.lookup(tmp_path) is not index
+    assert file_index.lookup(tmp_path).is_file('icon.svg')
+
+
+def test_evaluate_walks_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, '_cache', result_cache.ResultCache(tmp_path / 'cache'))
+    tmp_path = tmp_path / 'charm'
+    tmp_path.mkdir()
+    (tmp_path / 'charmcraft.yaml').write_text('name: my-charm\n')
+    build = file_index.FileIndex.build
+    with mock.patch.object(file_index.FileIndex, 'build', side_effect=build) as mock_build:
+        evaluate.evaluate_path('my-charm', tmp_path, run_tooling=False)
+    mock_build.assert_called_once()
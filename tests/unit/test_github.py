@@ -0,0 +1,216 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the rate-limit aware GitHub call layer."""
+
+import json
+import subprocess  # noqa: S404
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.github as github
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(github, 'bucket', github.TokenBucket(float('inf'), 1))
+    monkeypatch.setattr(github, 'stats', github.CallStats())
+    monkeypatch.setattr(github, 'budgets', {})
+
+
+def _rate_limited(cmd):
+    return subprocess.CalledProcessError(
+        1, cmd, '', 'HTTP 403: You have exceeded a secondary rate limit.'
+    )
+
+
+@mock.patch('time.sleep')
+@mock.patch('charmhub_listing_review.github.fetch_budget')
+@mock.patch('subprocess.run')
+def test_run_retries_rate_limited_calls(mock_run, mock_fetch_budget, mock_sleep):
+    cmd = ['gh', 'issue', 'edit', '1', '--title', 'Title']
+    ok = subprocess.CompletedProcess(cmd, 0, None, '')
+    mock_run.side_effect = [_rate_limited(cmd), _rate_limited(cmd), ok]
+    assert github.run(cmd) is ok
+    assert mock_run.call_count == 3
+    assert mock_sleep.call_count == 2
+    assert github.stats.calls == 3
+    assert github.stats.retries == 2
+
+
+@mock.patch('subprocess.run')
+def test_run_does_not_retry_other_failures(mock_run):
+    cmd = ['gh', 'issue', 'view', '1']
+    mock_run.side_effect = subprocess.CalledProcessError(1, cmd, '', 'no such issue')
+    with pytest.raises(subprocess.CalledProcessError):
+        github.run(cmd)
+    assert mock_run.call_count == 1
+
+
+@mock.patch('subprocess.run')
+def test_run_without_check_returns_failure(mock_run):
+    cmd = ['gh', 'issue', 'view', '1']
+    mock_run.side_effect = subprocess.CalledProcessError(1, cmd, 'out', 'no such issue')
+    result = github.run(cmd, capture_output=True, check=False)
+    assert result.returncode == 1
+    assert result.stdout == 'out'
+
+
+@mock.patch('time.sleep')
+@mock.patch('subprocess.run')
+def test_run_waits_for_primary_rate_limit_reset(mock_run, mock_sleep):
+    cmd = ['gh', 'issue', 'edit', '1']
+    reset = 2_000_000_000
+    rate_limit = {'resources': {'core': {'remaining': 0, 'limit': 5000, 'reset': reset}}}
+    mock_run.side_effect = [
+        _rate_limited(cmd),
+        subprocess.CompletedProcess([], 0, json.dumps(rate_limit), ''),
+        subprocess.CompletedProcess(cmd, 0, None, ''),
+    ]
+    with mock.patch('time.time', return_value=reset - 30):
+        github.run(cmd)
+    mock_sleep.assert_called_once_with(31)
+
+
+# What gh writes to stderr with GH_DEBUG=api, when it is rate limited.
+_DEBUG_RATE_LIMITED = """* Request at 2026-10-19 10:00:00
+* Request to https://api.github.com/graphql
+> POST /graphql HTTP/1.1
+> Host: api.github.com
+
+{"query": "..."}
+
+< HTTP/2.0 403 Forbidden
+< X-Ratelimit-Limit: 5000
+< X-Ratelimit-Remaining: 0
+< X-Ratelimit-Reset: 2000000000
+< X-Ratelimit-Resource: graphql
+
+{
+  "message": "API rate limit exceeded"
+}
+
+* Request took 120ms
+GraphQL: API rate limit exceeded for user ID 1.
+"""
+
+
+@mock.patch('time.sleep')
+@mock.patch('charmhub_listing_review.github.fetch_budget')
+@mock.patch('subprocess.run')
+def test_run_reads_rate_limit_headers(mock_run, mock_fetch_budget, mock_sleep):
+    cmd = ['gh', 'issue', 'view', '1']
+    ok = subprocess.CompletedProcess(
+        cmd,
+        0,
+        '{}',
+        _DEBUG_RATE_LIMITED
+        .replace('403 Forbidden', '200 OK')
+        .replace('Remaining: 0', 'Remaining: 4999')
+        .replace('GraphQL: API rate limit exceeded for user ID 1.\n', ''),
+    )
+    mock_run.side_effect = [
+        subprocess.CalledProcessError(1, cmd, '', _DEBUG_RATE_LIMITED),
+        ok,
+    ]
+    with mock.patch('time.time', return_value=2_000_000_000 - 30):
+        result = github.run(cmd, capture_output=True)
+    assert result.stdout == '{}'
+    # The HTTP traffic isn't passed on.
+    assert result.stderr == ''
+    assert mock_run.call_args.kwargs['env']['GH_DEBUG'] == 'api'
+    # The wait comes from the headers, without asking for the budget.
+    mock_sleep.assert_called_once_with(31)
+    mock_fetch_budget.assert_not_called()
+    assert github.budgets['graphql'].remaining == 4999
+
+
+@mock.patch('subprocess.run')
+def test_run_passes_on_message_without_traffic(mock_run, capsys):
+    cmd = ['gh', 'issue', 'view', '1']
+    debug = _DEBUG_RATE_LIMITED.replace('403 Forbidden', '404 Not Found').replace(
+        'GraphQL: API rate limit exceeded for user ID 1.', 'Could not resolve to an issue.'
+    )
+    mock_run.side_effect = subprocess.CalledProcessError(1, cmd, '', debug)
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        github.run(cmd)
+    assert exc_info.value.stderr == 'Could not resolve to an issue.\n'
+    assert capsys.readouterr().err == 'Could not resolve to an issue.\n'
+    assert mock_run.call_count == 1
+
+
+@mock.patch('time.sleep')
+@mock.patch('subprocess.run')
+def test_api_honours_retry_after(mock_run, mock_sleep):
+    limited = (
+        'HTTP/2.0 429 Too Many Requests\r\nRetry-After: 7\r\n'
+        'X-Ratelimit-Remaining: 10\r\nX-Ratelimit-Limit: 5000\r\n'
+        'X-Ratelimit-Reset: 2000000000\r\n\r\n{"message": "slow down"}'
+    )
+    ok = (
+        'HTTP/2.0 200 OK\r\nX-Ratelimit-Remaining: 9\r\nX-Ratelimit-Limit: 5000\r\n'
+        'X-Ratelimit-Reset: 2000000000\r\nX-Ratelimit-Resource: graphql\r\n\r\n{"data": {}}'
+    )
+    mock_run.side_effect = [
+        subprocess.CompletedProcess([], 1, limited, 'gh: HTTP 429'),
+        subprocess.CompletedProcess([], 0, ok, ''),
+    ]
+    assert json.loads(github.api(['graphql', '-f', 'query=x'])) == {'data': {}}
+    mock_sleep.assert_called_once_with(7.0)
+    assert mock_run.call_args.args[0][:3] == ['gh', 'api', '--include']
+    assert github.budgets['graphql'].remaining == 9
+
+
+@mock.patch('subprocess.run')
+def test_api_raises_other_errors(mock_run):
+    response = 'HTTP/2.0 404 Not Found\r\n\r\n{"message": "Not Found"}'
+    mock_run.return_value = subprocess.CompletedProcess([], 1, response, 'gh: Not Found')
+    with pytest.raises(subprocess.CalledProcessError):
+        github.api(['repos/org/missing'])
+    assert mock_run.call_count == 1
+
+
+def test_token_bucket_paces_callers():
+    bucket = github.TokenBucket(capacity=2, rate=10)
+    with mock.patch('time.sleep') as mock_sleep:
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0
+        assert bucket.acquire() > 0
+    mock_sleep.assert_called_once()
+
+
+@mock.patch('subprocess.run')
+def test_report_budget(mock_run, tmp_path, monkeypatch, capsys):
+    summary_path = tmp_path / 'summary.md'
+    monkeypatch.setenv('GITHUB_STEP_SUMMARY', str(summary_path))
+    rate_limit = {
+        'resources': {
+            'core': {'remaining': 4000, 'limit': 5000, 'reset': 2000000000},
+            'graphql': {'remaining': 100, 'limit': 5000, 'reset': 2000000000},
+        }
+    }
+    mock_run.return_value = subprocess.CompletedProcess([], 0, json.dumps(rate_limit), '')
+    github.report_budget()
+    assert '`core`: 4000/5000 remaining' in capsys.readouterr().err
+    assert '`graphql`: 100/5000 remaining' in summary_path.read_text()
+
+
+@mock.patch('subprocess.run')
+def test_report_budget_from_headers(mock_run, capsys):
+    github.budgets['core'] = github.Budget(remaining=10, limit=5000, reset=2000000000)
+    github.report_budget()
+    # The budget is already known, so it isn't looked up.
+    mock_run.assert_not_called()
+    assert '`core`: 10/5000 remaining' in capsys.readouterr().err
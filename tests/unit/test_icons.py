@@ -0,0 +1,113 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the icon analysis."""
+
+import math
+
+import pytest
+
+import charmhub_listing_review.icons as icons
+
+ICON = """<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100" viewBox="0 0 200 200">
+  <title>My charm</title>
+  <defs>
+    <linearGradient id="shine"><stop offset="0"/></linearGradient>
+    <path id="unused" d="M0 0 H1000"/>
+  </defs>
+  <circle cx="100" cy="100" r="100" style="fill: #E95420"/>
+  <g transform="translate(40 40) scale(0.5)" fill="#fff">
+    <rect x="20" y="20" width="200" height="200"/>
+    <path d="M120 20 a100 100 0 1 1 0 200 a100 100 0 1 1 0 -200"/>
+  </g>
+</svg>
+"""
+
+
+def test_analyse_icon(tmp_path):
+    path = tmp_path / 'icon.svg'
+    path.write_text(ICON)
+    summary = icons.analyse_icon(path)
+    assert (summary.width, summary.height) == (100, 100)
+    assert summary.view_box == (0, 0, 200, 200)
+    assert summary.elements == 10
+    assert summary.fills == {'#e95420', '#fff'}
+    assert not summary.uses_gradient
+    assert summary.circle == icons.Circle(100, 100, 100, '#E95420')
+    assert summary.logo_box is not None
+    assert [round(v, 1) for v in summary.logo_box] == [50.0, 50.0, 150.0, 150.0]
+    # 50 units of padding in the viewBox is 25 pixels on the canvas.
+    assert summary.padding == pytest.approx(25)
+
+
+def test_no_background_circle(tmp_path):
+    path = tmp_path / 'icon.svg'
+    path.write_text(
+        '<svg viewBox="0 0 100 100"><circle cx="20" cy="20" r="50" fill="url(#g)"/></svg>'
+    )
+    summary = icons.analyse_icon(path)
+    assert (summary.width, summary.height) == (100, 100)
+    assert summary.circle is None
+    assert summary.padding is None
+    assert summary.uses_gradient
+
+
+@pytest.mark.parametrize(
+    'content,message',
+    [
+        ('<svg width="100"><circle', 'not valid XML'),
+        ('<html></html>', 'not <svg>'),
+        ('<!DOCTYPE svg [<!ENTITY a "aaaa">]><svg>&a;</svg>', 'entity'),
+        ('<svg><g transform="wobble(1)"/></svg>', 'invalid transform'),
+        ('<svg><path d="10 10"/></svg>', 'invalid path'),
+    ],
+)
+def test_invalid_icon(tmp_path, content, message):
+    path = tmp_path / 'icon.svg'
+    path.write_text(content)
+    with pytest.raises(icons.IconError, match=message):
+        icons.analyse_icon(path)
+
+
+def test_limits(tmp_path, monkeypatch):
+    path = tmp_path / 'icon.svg'
+    path.write_text('<svg>' + '<g/>' * 100 + '</svg>')
+    monkeypatch.setattr(icons, 'MAX_ICON_ELEMENTS', 50)
+    with pytest.raises(icons.IconError, match='more than 50 elements'):
+        icons.analyse_icon(path)
+    monkeypatch.setattr(icons, 'MAX_ICON_BYTES', 100)
+    with pytest.raises(icons.IconError, match='larger than 100 bytes'):
+        icons.analyse_icon(path)
+
+
+def test_transforms():
+    matrix = icons.parse_transform('rotate(90 50 50)')
+    x, y = icons._apply(matrix, 100, 50)
+    assert math.isclose(x, 50, abs_tol=1e-9)
+    assert math.isclose(y, 100)
+    assert icons.parse_transform('translate(10) scale(2, 3)') == (2, 0, 0, 3, 10, 0)
+
+
+def test_path_points():
+    assert icons.path_points('M10 10 l5 5 10 0 H0 v-20 z') == [
+        (10, 10),
+        (15, 15),
+        (25, 15),
+        (0, 15),
+        (0, -5),
+    ]
+    # A half circle arc reaches out to its radius.
+    points = icons.path_points('M0 50 A50 50 0 0 1 100 50')
+    assert min(y for _, y in points) == pytest.approx(0)
@@ -0,0 +1,151 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the listing review job queue."""
+
+import threading
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.jobs as jobs
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    queue = jobs.JobQueue(tmp_path / 'jobs.db')
+    yield queue
+    queue.close()
+
+
+def test_enqueue_collapses_pending_duplicates(job_queue):
+    first, added = job_queue.enqueue(1, 'abc')
+    assert added
+    second, added = job_queue.enqueue(1, 'abc')
+    assert not added
+    assert second.id == first.id
+    # A different commit, or a different issue, is a different job.
+    assert job_queue.enqueue(1, 'def')[1]
+    assert job_queue.enqueue(2, 'abc')[1]
+
+
+def test_enqueue_returns_running_job(job_queue):
+    job, _ = job_queue.enqueue(1)
+    job_queue.claim()
+    running, added = job_queue.enqueue(1)
+    assert not added
+    assert running.id == job.id
+    assert running.state == jobs.RUNNING
+
+
+def test_claim_runs_one_job_per_issue(job_queue):
+    job_queue.enqueue(1, 'abc')
+    job_queue.enqueue(1, 'def')
+    job_queue.enqueue(2, 'abc')
+    first = job_queue.claim()
+    assert first is not None
+    assert (first.issue, first.commit_sha) == (1, 'abc')
+    second = job_queue.claim()
+    assert second is not None
+    assert second.issue == 2
+    assert job_queue.claim() is None
+    job_queue.complete(first.id)
+    third = job_queue.claim()
+    assert third is not None
+    assert (third.issue, third.commit_sha) == (1, 'def')
+
+
+def test_complete_records_duration(job_queue):
+    job_queue.enqueue(1)
+    job = job_queue.claim()
+    assert job is not None
+    finished = job_queue.complete(job.id)
+    assert finished.state == jobs.DONE
+    assert finished.duration is not None and finished.duration >= 0
+    failed_job, _ = job_queue.enqueue(2)
+    job_queue.claim()
+    assert job_queue.complete(failed_job.id, error='boom').state == jobs.FAILED
+    stats = job_queue.stats()
+    assert stats['finished'] == 2
+    assert stats['failed'] == 1
+    assert stats['pending_or_running'] == 0
+    assert 'duration_p95' in stats
+
+
+def test_running_jobs_are_recovered(tmp_path):
+    queue = jobs.JobQueue(tmp_path / 'jobs.db')
+    queue.enqueue(1)
+    queue.claim()
+    queue.close()
+    # By default, a process sharing the queue doesn't take over jobs that may
+    # still be running.
+    shared = jobs.JobQueue(tmp_path / 'jobs.db')
+    assert shared.claim() is None
+    shared.close()
+    reopened = jobs.JobQueue(tmp_path / 'jobs.db', stale_after=0)
+    job = reopened.claim()
+    assert job is not None
+    assert job.issue == 1
+    reopened.close()
+
+
+def test_run_job_runs_review(job_queue):
+    review = mock.Mock()
+    job = jobs.run_job(job_queue, 1, review)
+    review.assert_called_once_with()
+    assert job.state == jobs.DONE
+
+
+def test_run_job_records_failure(job_queue):
+    review = mock.Mock(side_effect=ValueError('bad'))
+    with pytest.raises(ValueError):
+        jobs.run_job(job_queue, 1, review)
+    stats = job_queue.stats()
+    assert stats['failed'] == 1
+
+
+def test_run_job_records_interruption(job_queue):
+    review = mock.Mock(side_effect=KeyboardInterrupt)
+    with pytest.raises(KeyboardInterrupt):
+        jobs.run_job(job_queue, 1, review)
+    # The job isn't left running, so later reviews of the issue don't wait for it.
+    assert job_queue.active_count() == 0
+    assert job_queue.stats()['failed'] == 1
+
+
+def test_run_job_waits_for_in_flight_review(tmp_path):
+    path = tmp_path / 'jobs.db'
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_review():
+        started.set()
+        release.wait(5)
+
+    first_queue = jobs.JobQueue(path)
+    thread = threading.Thread(target=jobs.run_job, args=(first_queue, 1, slow_review))
+    thread.start()
+    started.wait(5)
+    second_queue = jobs.JobQueue(path, stale_after=None)
+    second_review = mock.Mock()
+    # Let the first review finish only once the second is waiting for it.
+    timer = threading.Timer(0.2, release.set)
+    timer.start()
+    job = jobs.run_job(second_queue, 1, second_review, interval=0.01)
+    timer.join()
+    thread.join()
+    second_review.assert_not_called()
+    assert job.state == jobs.DONE
+    first_queue.close()
+    second_queue.close()
@@ -0,0 +1,78 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test identifying licenses from their text."""
+
+import re
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.licenses as licenses
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    index = licenses.LicenseIndex.load(tmp_path / 'license-index.json')
+    monkeypatch.setattr(licenses, '_index', index)
+    return index
+
+
+@pytest.mark.parametrize('spdx_id', sorted(licenses.bundled_texts()))
+def test_identifies_bundled_licenses(index, spdx_id):
+    match = index.identify(licenses.bundled_texts()[spdx_id])
+    assert match == licenses.LicenseMatch(spdx_id, 1.0)
+
+
+def test_ignores_formatting_and_copyright(index):
+    text = licenses.bundled_texts()['Apache-2.0']
+    text = re.sub(r'\s+', ' ', text).replace('License', 'Licence')
+    text = f'# LICENSE\n\nCopyright 2026 Someone Else\n\n{text}'
+    match = licenses.identify(text)
+    assert match is not None
+    assert match.spdx_id == 'Apache-2.0'
+    assert match.accepted
+
+
+def test_partial_license(index):
+    text = licenses.bundled_texts()['Apache-2.0'].split('APPENDIX')[0]
+    match = index.identify(text)
+    assert match is not None
+    assert match.spdx_id == 'Apache-2.0'
+    assert match.accepted
+    text = licenses.bundled_texts()['GPL-3.0'][:25_000]
+    match = index.identify(text)
+    assert match is not None
+    assert match.spdx_id == 'GPL-3.0'
+    assert not match.accepted
+
+
+def test_unknown_text(index):
+    assert index.identify('All rights reserved. Do not copy.') is None
+    assert index.identify('') is None
+
+
+def test_index_is_cached_on_disk(tmp_path):
+    path = tmp_path / 'license-index.json'
+    index = licenses.LicenseIndex.load(path)
+    assert path.exists()
+    with mock.patch.object(licenses, 'fingerprint') as mock_fingerprint:
+        cached = licenses.LicenseIndex.load(path)
+    mock_fingerprint.assert_not_called()
+    assert cached.spdx_ids == index.spdx_ids
+    text = licenses.bundled_texts()['MPL-2.0']
+    assert cached.identify(text) == index.identify(text)
+    # A cache for different texts (or an older version) is rebuilt.
+    path.write_text('{"source": "something else", "licenses": {}}')
+    assert licenses.LicenseIndex.load(path).spdx_ids == index.spdx_ids
@@ -0,0 +1,214 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the link checker."""
+
+import http.server
+import threading
+import time
+
+import pytest
+
+import charmhub_listing_review.links as links
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(links, 'RETRY_BACKOFF', 0)
+    monkeypatch.setattr(links, '_head_rejected_hosts', set())
+
+
+@pytest.fixture
+def link_server():
+    """Serve links with the status in the path.
+
+    ``/<status>`` responds with the status. ``/<head>/<get>`` responds to HEAD
+    and GET with different statuses. ``/flaky/<n>`` responds with a 503 to the
+    first ``n`` requests. The requests are recorded as (method, path, range).
+    """
+    requests: list[tuple[str, str, str | None]] = []
+    flaky_counts: dict[str, int] = {}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def _status(self) -> int:
+            requests.append((self.command, self.path, self.headers.get('Range')))
+            parts = self.path.strip('/').split('/')
+            if parts[0] == 'flaky':
+                flaky_counts[self.path] = flaky_counts.get(self.path, 0) + 1
+                return 503 if flaky_counts[self.path] <= int(parts[1]) else 200
+            if self.command == 'GET' and len(parts) > 1:
+                return int(parts[1])
+            return int(parts[0])
+
+        def do_HEAD(self):
+            self.send_response(self._status())
+            self.end_headers()
+
+        def do_GET(self):
+            # Ignore the range, and send a large body.
+            body = b'x' * 1024 * 1024
+            self.send_response(self._status())
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except OSError:
+                # The client stopped reading.
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_probe(link_server):
+    base_url, requests = link_server
+    status = links.probe(f'{base_url}/200')
+    assert (status.ok, status.method, status.attempts) == (True, 'HEAD', 1)
+    # A failure that isn't transient isn't retried.
+    status = links.probe(f'{base_url}/404')
+    assert (status.ok, status.status, status.describe()) == (False, 404, 'status 404')
+    assert len(requests) == 2
+    status = links.probe('http://127.0.0.1:1/', deadline=1)
+    assert not status.ok
+    assert status.status is None
+    assert status.error
+    status = links.probe('not a url')
+    assert (status.ok, status.attempts) == (False, 1)
+
+
+def test_probe_falls_back_to_range_get(link_server):
+    base_url, requests = link_server
+    status = links.probe(f'{base_url}/405/200')
+    assert (status.ok, status.method) == (True, links.RANGE_GET)
+    assert requests == [('HEAD', '/405/200', None), ('GET', '/405/200', 'bytes=0-0')]
+    # The host rejected HEAD, so it isn't sent any more HEAD requests.
+    requests.clear()
+    assert links.probe(f'{base_url}/403/200').method == links.RANGE_GET
+    assert requests == [('GET', '/403/200', 'bytes=0-0')]
+
+
+def test_probe_rejected_get(link_server):
+    base_url, _ = link_server
+    status = links.probe(f'{base_url}/403/403')
+    assert (status.ok, status.status, status.method) == (False, 403, links.RANGE_GET)
+    # The host rejects the GET as well, so it isn't a HEAD problem.
+    assert not links._head_rejected_hosts
+    status = links.probe(f'{base_url}/405/404')
+    assert (status.ok, status.status, status.method) == (False, 404, links.RANGE_GET)
+    assert links._head_rejected_hosts
+
+
+def test_probe_retries_transient_failures(link_server):
+    base_url, _ = link_server
+    status = links.probe(f'{base_url}/flaky/2')
+    assert (status.ok, status.attempts) == (True, 3)
+    status = links.probe(f'{base_url}/flaky/5')
+    assert (status.ok, status.status, status.attempts) == (False, 503, links.MAX_PROBE_ATTEMPTS)
+    assert status.describe() == f'status 503, after {links.MAX_PROBE_ATTEMPTS} attempts'
+
+
+def test_probe_deadline(link_server, monkeypatch):
+    base_url, _ = link_server
+    monkeypatch.setattr(links, 'RETRY_BACKOFF', 10)
+    monkeypatch.setattr(links.random, 'uniform', lambda low, high: high)
+    start = time.monotonic()
+    status = links.probe(f'{base_url}/flaky/1', deadline=1)
+    # There isn't time to back off before the deadline, so there's no retry.
+    assert (status.ok, status.attempts) == (False, 1)
+    assert time.monotonic() - start < 1
+
+
+@pytest.mark.parametrize(
+    'value,email',
+    [
+        ('charm-team@example.com', True),
+        ('mailto:charm-team@example.com', True),
+        ('Charm Team <charm-team@example.com>', True),
+        ('https://example.com/contact', False),
+        ('the charm team', False),
+    ],
+)
+def test_is_email(value, email):
+    assert links.is_email(value) == email
+
+
+def test_check_all_deduplicates():
+    calls = []
+
+    def probe_url(url):
+        calls.append(url)
+        return links.LinkStatus(url, 200)
+
+    checker = links.LinkChecker(probe_url=probe_url)
+    results = checker.check_all(['https://a.example/', 'https://b.example/', 'https://a.example/'])
+    assert list(results) == ['https://a.example/', 'https://b.example/']
+    assert sorted(calls) == ['https://a.example/', 'https://b.example/']
+
+
+def test_single_flight():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def probe_url(url):
+        calls.append(url)
+        started.set()
+        release.wait(5)
+        return links.LinkStatus(url, 200)
+
+    checker = links.LinkChecker(probe_url=probe_url)
+    first = threading.Thread(target=checker.check, args=['https://a.example/'])
+    first.start()
+    started.wait(5)
+    # The second check of the URL waits for the first, rather than requesting it again.
+    second: list[links.LinkStatus] = []
+    thread = threading.Thread(target=lambda: second.append(checker.check('https://a.example/')))
+    thread.start()
+    release.set()
+    first.join()
+    thread.join()
+    assert second[0].ok
+    assert calls == ['https://a.example/']
+    # Once it has finished, the URL is checked again.
+    checker.check('https://a.example/')
+    assert len(calls) == 2
+
+
+def test_per_host_limit():
+    lock = threading.Lock()
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    def probe_url(url):
+        host = url.split('/')[2]
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.02)
+        with lock:
+            active[host] -= 1
+        return links.LinkStatus(url, 200)
+
+    checker = links.LinkChecker(max_workers=8, max_per_host=2, probe_url=probe_url)
+    urls = [f'https://{host}.example/{i}' for host in ('a', 'b') for i in range(6)]
+    assert all(status.ok for status in checker.check_all(urls).values())
+    assert set(peak) == {'a.example', 'b.example'}
+    assert all(count <= 2 for count in peak.values())
@@ -0,0 +1,176 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the lock file consistency checks."""
+
+import tomllib
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.lock_files as lock_files
+import charmhub_listing_review.result_cache as result_cache
+
+UV_LOCK = """\
+version = 1
+revision = 3
+requires-python = ">=3.10"
+
+[[package]]
+name = "my-charm"
+version = "0.0.0"
+source = { virtual = "." }
+dependencies = [
+    { name = "ops" },
+]
+
+[package.metadata]
+requires-dist = [{ name = "ops", specifier = ">=2" }]
+
+[[package]]
+name = "ops"
+version = "2.17.0"
+source = { registry = "https://pypi.org/simple" }
+dependencies = [
+    { name = "PyYAML" },
+]
+
+[[package]]
+name = "PyYAML"
+version = "6.0.2"
+source = { registry = "https://pypi.org/simple" }
+
+[package.optional-dependencies]
+name = "not-a-package"
+"""
+
+POETRY_LOCK = """\
+[[package]]
+name = "ops"
+version = "2.17.0"
+description = "The Python library behind great charms"
+optional = false
+python-versions = ">=3.8"
+
+[package.dependencies]
+PyYAML = "==6.*"
+
+[[package]]
+name = "pyyaml"
+version = "6.0.2"
+python-versions = ">=3.8"
+
+[metadata]
+lock-version = "2.0"
+python-versions = "^3.10"
+content-hash = "abc"
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = result_cache.ResultCache(tmp_path / 'cache')
+    monkeypatch.setattr(result_cache, '_cache', cache)
+    return cache
+
+
+def test_scan_uv_lock(tmp_path):
+    path = tmp_path / 'uv.lock'
+    path.write_text(UV_LOCK)
+    summary = lock_files.scan(path)
+    assert summary.packages == {
+        'my-charm': ('0.0.0',),
+        'ops': ('2.17.0',),
+        'pyyaml': ('6.0.2',),
+    }
+    assert summary.requires_python == '>=3.10'
+
+
+def test_scan_poetry_lock(tmp_path):
+    path = tmp_path / 'poetry.lock'
+    path.write_text(POETRY_LOCK)
+    summary = lock_files.scan(path)
+    assert summary.packages == {'ops': ('2.17.0',), 'pyyaml': ('6.0.2',)}
+    # The python-versions of each package isn't the lock's.
+    assert summary.requires_python == '^3.10'
+
+
+def test_scan_forked_versions(tmp_path):
+    path = tmp_path / 'uv.lock'
+    path.write_text(
+        '[[package]]\nname = "numpy"\nversion = "1.26.4"\n\n'
+        '[[package]]\nname = "numpy"\nversion = "2.1.0"\n'
+    )
+    assert lock_files.scan(path).packages == {'numpy': ('1.26.4', '2.1.0')}
+
+
+def test_summarise_is_cached(tmp_path):
+    path = tmp_path / 'uv.lock'
+    path.write_text(UV_LOCK)
+    summary = lock_files.summarise(path)
+    assert summary == lock_files.scan(path)
+    with mock.patch.object(lock_files, 'scan') as scan:
+        assert lock_files.summarise(path) == summary
+    scan.assert_not_called()
+
+    path.write_text(UV_LOCK.replace('2.17.0', '2.18.0'))
+    assert lock_files.summarise(path).packages['ops'] == ('2.18.0',)
+
+
+def test_declared_dependencies():
+    pyproject = tomllib.loads("""
+[project]
+dependencies = ["ops>=2", "PyYAML==6.*", "cosl; python_version >= '3.10'"]
+optional-dependencies = {tracing = ["opentelemetry_api"]}
+
+[dependency-groups]
+unit = ["pytest~=8.0", {include-group = "lint"}]
+lint = ["ruff"]
+
+[tool.poetry.dependencies]
+python = "^3.10"
+jinja2 = "*"
+
+[tool.poetry.group.integration.dependencies]
+juju = "^3"
+""")
+    assert lock_files.declared_dependencies(pyproject) == {
+        'ops',
+        'pyyaml',
+        'cosl',
+        'opentelemetry-api',
+        'pytest',
+        'ruff',
+        'jinja2',
+        'juju',
+    }
+
+
+def test_inconsistencies():
+    lock = lock_files.LockSummary({'ops': ('2.17.0',)}, '>=3.10, <4')
+    pyproject = {'project': {'dependencies': ['ops'], 'requires-python': '<4,>=3.10'}}
+    assert lock_files.inconsistencies(pyproject, lock, 'uv.lock') == []
+
+    pyproject = {'project': {'dependencies': ['ops', 'jinja2'], 'requires-python': '>=3.12'}}
+    assert lock_files.inconsistencies(pyproject, lock, 'uv.lock') == [
+        "`uv.lock` doesn't include these dependencies: `jinja2`.",
+        '`uv.lock` was resolved for Python `>=3.10, <4`, but `pyproject.toml` requires `>=3.12`.',
+    ]
+
+    lock = lock_files.LockSummary({'ops': ('2.17.0',)})
+    pyproject = {'tool': {'poetry': {'dependencies': {'python': '^3.10', 'ops': '*'}}}}
+    assert lock_files.inconsistencies(pyproject, lock, 'poetry.lock') == [
+        "`poetry.lock` doesn't say which Python versions it was resolved for, "
+        'but `pyproject.toml` requires `^3.10`.'
+    ]
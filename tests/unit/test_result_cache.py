@@ -0,0 +1,93 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the check result cache."""
+
+import sys
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.evaluate as evaluate
+import charmhub_listing_review.links as links
+import charmhub_listing_review.result_cache as result_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = result_cache.ResultCache(tmp_path / 'cache')
+    monkeypatch.setattr(result_cache, '_cache', cache)
+    return cache
+
+
+def test_unchanged_inputs_are_cached(cache, tmp_path):
+    charm = tmp_path / 'charm'
+    charm.mkdir()
+    (charm / 'pyproject.toml').write_text('[project]\nrequires-python = ">=3.10"\n')
+    first = evaluate._cached(evaluate.python_requires_version, charm)
+    assert first.startswith('* [x]')
+    with mock.patch('tomllib.load') as mock_load:
+        assert evaluate._cached(evaluate.python_requires_version, charm) == first
+    mock_load.assert_not_called()
+    # Changing the input means the check runs again.
+    (charm / 'pyproject.toml').write_text('[project]\n')
+    assert evaluate._cached(evaluate.python_requires_version, charm).startswith('* [ ]')
+
+
+def test_metadata_links_are_checked_every_time(cache, tmp_path):
+    (tmp_path / 'charmcraft.yaml').write_text(
+        'name: foo\ntitle: Foo\nsummary: Foo.\ndescription: Foo.\n'
+        'links:\n  documentation: https://example.com/docs\n  issues: https://example.com/i\n'
+        '  source: https://example.com/s\n  website: https://example.com/w\n'
+        '  contact: foo@example.com\n'
+    )
+    with mock.patch('charmhub_listing_review.links.probe') as mock_probe:
+        mock_probe.side_effect = lambda url: links.LinkStatus(url, 404)
+        first = evaluate._charm_checks(tmp_path, 'foo', '', run_tooling=False)[0]
+        mock_probe.side_effect = lambda url: links.LinkStatus(url, 200)
+        second = evaluate._charm_checks(tmp_path, 'foo', '', run_tooling=False)[0]
+    assert first.startswith('* [ ]')
+    assert second.startswith('* [x]')
+    assert not any(entry['check'] == 'metadata_links' for entry in cache.entries())
+
+
+def test_missing_inputs_are_part_of_the_key(tmp_path):
+    key, hashes = result_cache.ResultCache.key('check', 1, tmp_path, ['a', 'b'])
+    assert hashes == {'a': None, 'b': None}
+    (tmp_path / 'a').write_text('content')
+    assert result_cache.ResultCache.key('check', 1, tmp_path, ['a', 'b'])[0] != key
+
+
+def test_version_bump_invalidates(cache, tmp_path):
+    compute = mock.Mock(return_value='* [x] Done.')
+    assert cache.run('check', 1, tmp_path, ['file'], compute) == '* [x] Done.'
+    assert cache.run('check', 1, tmp_path, ['file'], compute) == '* [x] Done.'
+    assert compute.call_count == 1
+    cache.run('check', 2, tmp_path, ['file'], compute)
+    assert compute.call_count == 2
+
+
+def test_cli(cache, tmp_path, monkeypatch, capsys):
+    cache.run('my_check', 3, tmp_path, ['file'], lambda: '* [x] Done.')
+    (entry,) = cache.entries()
+    monkeypatch.setattr(sys, 'argv', ['result_cache', 'list'])
+    result_cache.main()
+    assert f'{entry["key"][:12]}  [x]  my_check v3' in capsys.readouterr().out
+    monkeypatch.setattr(sys, 'argv', ['result_cache', 'show', entry['key'][:8]])
+    result_cache.main()
+    assert '"result": "* [x] Done."' in capsys.readouterr().out
+    monkeypatch.setattr(sys, 'argv', ['result_cache', 'clear'])
+    result_cache.main()
+    assert 'Removed 1 cached results.' in capsys.readouterr().out
+    assert list(cache.entries()) == []
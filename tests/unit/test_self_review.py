@@ -0,0 +1,46 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the self-review command."""
+
+from unittest import mock
+
+import charmhub_listing_review.self_review as self_review
+
+
+@mock.patch('charmhub_listing_review.self_review.remote_repository')
+@mock.patch('charmhub_listing_review.self_review.evaluate_path', return_value=[])
+@mock.patch('charmhub_listing_review.self_review.local_repository', return_value=('', ''))
+def test_path_is_reviewed_offline(mock_local, mock_evaluate_path, mock_remote, tmp_path):
+    # A detached HEAD, with no upstream branch.
+    self_review.print_self_review_results('my-charm', path=str(tmp_path))
+    mock_evaluate_path.assert_called_once()
+    assert mock_evaluate_path.call_args.args[4:] == ()
+    mock_remote.assert_not_called()
+
+
+@mock.patch('charmhub_listing_review.self_review.evaluate', return_value=[])
+@mock.patch('charmhub_listing_review.self_review.get_default_branch', return_value='develop')
+@mock.patch('charmhub_listing_review.self_review.resolve_commit', return_value='a' * 40)
+@mock.patch('charmhub_listing_review.self_review.remote_repository')
+def test_document_urls_use_shared_remote(mock_remote, mock_resolve, mock_branch, mock_evaluate):
+    url = 'https://github.com/org/repo'
+    mock_remote.return_value.default_branch = 'develop'
+    mock_remote.return_value.blob_url.side_effect = lambda path, branch: f'{branch}/{path}'
+    self_review.print_self_review_results('my-charm', project_repo=url, branch='')
+    assert mock_evaluate.call_args.args[3:6] == (
+        'develop/CONTRIBUTING.md',
+        'develop/LICENSE',
+        'develop/SECURITY.md',
+    )
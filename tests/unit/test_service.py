@@ -0,0 +1,200 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the long-running review service."""
+
+import hashlib
+import hmac
+import json
+import subprocess  # noqa: S404
+import threading
+import urllib.error
+import urllib.request
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.service as service
+
+WEBHOOK_SECRET = 'webhook-test-value'  # noqa: S105
+
+
+@pytest.fixture(autouse=True)
+def mock_review_commit():
+    with mock.patch(
+        'charmhub_listing_review.update_issue.review_commit', return_value=''
+    ) as patched:
+        yield patched
+
+
+@pytest.fixture
+def webhook_server():
+    review_service = service.ReviewService(workers=1)
+    server = service.make_webhook_server(review_service, port=0, secret=WEBHOOK_SECRET)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield review_service, f'http://127.0.0.1:{server.server_address[1]}/'
+    server.shutdown()
+    server.server_close()
+    review_service.stop()
+
+
+def _post(url, payload, event='issues', secret=WEBHOOK_SECRET):
+    body = json.dumps(payload).encode()
+    headers = {'X-GitHub-Event': event, 'Content-Type': 'application/json'}
+    if secret:
+        digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        headers['X-Hub-Signature-256'] = f'sha256={digest}'
+    request = urllib.request.Request(url, data=body, headers=headers, method='POST')  # noqa: S310
+    with urllib.request.urlopen(request, timeout=5) as response:  # noqa: S310
+        return response.status, json.loads(response.read())
+
+
+@pytest.mark.parametrize(
+    'event,payload,expected',
+    [
+        ('issues', {'action': 'labeled', 'label': {'name': 'listing-request'}}, True),
+        ('issues', {'action': 'labeled', 'label': {'name': 'bug'}}, False),
+        (
+            'issues',
+            {'action': 'opened', 'issue': {'labels': [{'name': 'listing-request'}]}},
+            True,
+        ),
+        ('issues', {'action': 'opened', 'issue': {'labels': []}}, False),
+        ('issues', {'action': 'closed', 'label': {'name': 'listing-request'}}, False),
+        ('issue_comment', {'action': 'labeled', 'label': {'name': 'listing-request'}}, False),
+    ],
+)
+def test_should_review(event, payload, expected):
+    assert service.should_review(event, payload) == expected
+
+
+def test_webhook_queues_review(webhook_server):
+    review_service, url = webhook_server
+    payload = {'action': 'labeled', 'label': {'name': 'listing-request'}, 'issue': {'number': 7}}
+    with mock.patch.object(review_service, 'submit', return_value=True) as mock_submit:
+        status, content = _post(url, payload)
+    assert status == 202
+    assert content == {'queued': True, 'issue': 7}
+    mock_submit.assert_called_once_with(7)
+
+
+def test_webhook_ignores_other_events(webhook_server):
+    review_service, url = webhook_server
+    payload = {'action': 'labeled', 'label': {'name': 'bug'}, 'issue': {'number': 7}}
+    with mock.patch.object(review_service, 'submit') as mock_submit:
+        status, content = _post(url, payload)
+    assert status == 200
+    assert content == {'queued': False}
+    mock_submit.assert_not_called()
+
+
+def test_webhook_rejects_bad_signature(webhook_server):
+    _, url = webhook_server
+    with pytest.raises(urllib.error.HTTPError) as exc_info:
+        _post(url, {'action': 'opened'}, secret='wrong')  # noqa: S106
+    assert exc_info.value.code == 401
+    exc_info.value.close()
+
+
+@mock.patch('charmhub_listing_review.update_issue.review_issue')
+def test_service_runs_queued_reviews(mock_review_issue):
+    review_service = service.ReviewService(workers=2, repo='org/repo', dry_run=True)
+    review_service.start()
+    review_service.submit(1)
+    review_service.submit(2)
+    review_service.join()
+    review_service.stop()
+    reviewed = sorted(call.args[0] for call in mock_review_issue.call_args_list)
+    assert reviewed == [1, 2]
+    assert mock_review_issue.call_args.kwargs['repo'] == 'org/repo'
+    assert mock_review_issue.call_args.kwargs['dry_run'] is True
+
+
+def test_service_drops_duplicate_pending_reviews():
+    review_service = service.ReviewService(workers=1)
+    # The workers are not started, so the first request stays pending.
+    assert review_service.submit(1)
+    assert not review_service.submit(1)
+    assert review_service.submit(2)
+    review_service.jobs.close()
+
+
+def test_service_queues_each_commit(mock_review_commit):
+    review_service = service.ReviewService(workers=1, repo='org/repo')
+    mock_review_commit.return_value = 'a' * 40
+    assert review_service.submit(1)
+    mock_review_commit.assert_called_once_with(1, repo='org/repo')
+    assert not review_service.submit(1)
+    # A push of a new commit isn't collapsed into the review of the old one.
+    mock_review_commit.return_value = 'b' * 40
+    assert review_service.submit(1)
+    assert not review_service.submit(1, 'a' * 40)
+    review_service.jobs.close()
+
+
+@mock.patch('charmhub_listing_review.update_issue.review_issue')
+def test_service_reviews_queued_commit(mock_review_issue, mock_review_commit):
+    mock_review_commit.side_effect = subprocess.CalledProcessError(1, 'gh')
+    review_service = service.ReviewService(workers=1)
+    review_service.start()
+    review_service.submit(1, 'a' * 40)
+    # If the commit can't be found yet, the review finds it itself.
+    review_service.submit(2)
+    review_service.join()
+    review_service.stop()
+    commits = {call.args[0]: call.kwargs['commit'] for call in mock_review_issue.call_args_list}
+    assert commits == {1: 'a' * 40, 2: ''}
+
+
+@mock.patch('charmhub_listing_review.update_issue.review_issue', side_effect=ValueError('bad'))
+def test_service_survives_failed_review(mock_review_issue):
+    review_service = service.ReviewService(workers=1)
+    review_service.start()
+    review_service.submit(1)
+    review_service.submit(2)
+    review_service.join()
+    review_service.stop()
+    assert mock_review_issue.call_count == 2
+
+
+def _post_raw(url, body, headers):
+    request = urllib.request.Request(url, data=body, headers=headers, method='POST')  # noqa: S310
+    with pytest.raises(urllib.error.HTTPError) as exc_info:
+        urllib.request.urlopen(request, timeout=5)  # noqa: S310
+    exc_info.value.close()
+    return exc_info.value.code
+
+
+@pytest.mark.parametrize(
+    'length,expected',
+    [('lots', 400), ('-1', 400), (str(service.MAX_WEBHOOK_BYTES + 1), 413)],
+)
+def test_webhook_rejects_bad_lengths(webhook_server, length, expected):
+    _, url = webhook_server
+    assert _post_raw(url, b'{}', {'Content-Length': length}) == expected
+
+
+@pytest.mark.parametrize('issue', [None, {}, {'number': 'seven'}, {'number': True}])
+def test_webhook_rejects_missing_issue_number(webhook_server, issue):
+    review_service, url = webhook_server
+    payload = {'action': 'labeled', 'label': {'name': 'listing-request'}}
+    if issue is not None:
+        payload['issue'] = issue
+    with mock.patch.object(review_service, 'submit') as mock_submit:
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            _post(url, payload)
+    assert exc_info.value.code == 400
+    exc_info.value.close()
+    mock_submit.assert_not_called()
@@ -0,0 +1,184 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the review latency report."""
+
+import datetime
+import json
+import re
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.sla as sla
+
+
+def _issue(number, state='CLOSED', updated='2026-03-20T00:00:00Z', timeline=()):
+    return {
+        'number': number,
+        'title': f'Review `charm-{number}` for public listing on Charmhub',
+        'state': state,
+        'stateReason': 'COMPLETED' if state == 'CLOSED' else None,
+        # A Monday.
+        'createdAt': '2026-03-02T09:00:00Z',
+        'closedAt': None,
+        'updatedAt': updated,
+        'author': {'login': 'author'},
+        'timelineItems': {'nodes': list(timeline)},
+    }
+
+
+_TIMELINE = [
+    {
+        '__typename': 'AssignedEvent',
+        'createdAt': '2026-03-02T10:00:00Z',
+        'assignee': {'login': 'Alice'},
+    },
+    {
+        '__typename': 'IssueComment',
+        'createdAt': '2026-03-02T10:05:00Z',
+        'author': {'login': 'github-actions'},
+    },
+    {
+        '__typename': 'IssueComment',
+        'createdAt': '2026-03-02T11:00:00Z',
+        'author': {'login': 'author'},
+    },
+    {
+        '__typename': 'IssueComment',
+        'createdAt': '2026-03-04T09:00:00Z',
+        'author': {'login': 'alice'},
+    },
+    {
+        '__typename': 'ClosedEvent',
+        'createdAt': '2026-03-10T09:00:00Z',
+        'stateReason': 'COMPLETED',
+    },
+]
+
+
+@pytest.mark.parametrize(
+    'start,end,expected',
+    [
+        ('2026-03-02T09:00:00Z', '2026-03-02T21:00:00Z', 0.5),
+        # Friday noon to Monday noon skips the weekend.
+        ('2026-03-06T12:00:00Z', '2026-03-09T12:00:00Z', 1.0),
+        ('2026-03-07T00:00:00Z', '2026-03-09T00:00:00Z', 0.0),
+        ('2026-03-02T00:00:00Z', '2026-03-16T00:00:00Z', 10.0),
+    ],
+)
+def test_working_days(start, end, expected):
+    assert sla.working_days(start, end) == pytest.approx(expected)
+
+
+def test_issue_times():
+    times = sla.issue_times(_issue(1, timeline=_TIMELINE))
+    assert times['assignee'] == 'Alice'
+    assert times['assigned_at'] == '2026-03-02T10:00:00Z'
+    # Bot comments and the author's own comments don't count as a review.
+    assert times['first_review_at'] == '2026-03-04T09:00:00Z'
+    assert times['listed_at'] == '2026-03-10T09:00:00Z'
+
+
+def test_build_report():
+    issues = [
+        sla.issue_times(_issue(1, timeline=_TIMELINE)),
+        sla.issue_times(_issue(2, state='OPEN', timeline=_TIMELINE[:1])),
+        sla.issue_times(_issue(3, state='OPEN')),
+    ]
+    now = datetime.datetime(2026, 3, 9, 9, tzinfo=datetime.UTC)
+    report = sla.build_report(issues, {'alice': 'Team A'}, now=now)
+    team = report['teams']['Team A']
+    assert team['issues'] == 2
+    assert team['time_to_assignment']['count'] == 2
+    assert team['time_to_first_review'] == {
+        'count': 1,
+        'p50': 2.0,
+        'p90': 2.0,
+        'max': 2.0,
+        'within_target': 1,
+    }
+    assert team['time_to_listing']['p50'] == pytest.approx(6.0)
+    assert report['teams']['Unassigned']['issues'] == 1
+    assert report['teams']['All teams']['issues'] == 3
+    assert list(report['teams'])[-1] == 'All teams'
+    assert [issue['number'] for issue in report['overdue']] == [2, 3]
+    markdown = sla.format_markdown(report)
+    assert '| Team A | 2 |' in markdown
+    assert '#3 Review `charm-3`' in markdown
+
+
+def _graphql_response(query_args):
+    query = query_args[query_args.index('-f') + 1]
+    if 'issues(labels' in query:
+        nodes = [
+            {'number': 1, 'state': 'CLOSED', 'updatedAt': '2026-03-20T00:00:00Z'},
+            {'number': 2, 'state': 'OPEN', 'updatedAt': '2026-03-20T00:00:00Z'},
+        ]
+        data = {
+            'repository': {
+                'issues': {'pageInfo': {'hasNextPage': False, 'endCursor': None}, 'nodes': nodes}
+            }
+        }
+    else:
+        numbers = [int(number) for number in re.findall(r'\bi(\d+):', query)]
+        data = {
+            'repository': {
+                f'i{number}': _issue(number, state='CLOSED' if number == 1 else 'OPEN')
+                for number in numbers
+            }
+        }
+    return json.dumps({'data': data})
+
+
+@mock.patch('charmhub_listing_review.github.api', side_effect=_graphql_response)
+def test_collect_caches_closed_issues(mock_api, tmp_path):
+    cache = tmp_path / 'cache.json'
+    issues = sla.collect('org', 'repo', cache)
+    assert [times['number'] for times in issues] == [1, 2]
+    assert [times['number'] for times in json.loads(cache.read_text())] == [1]
+    mock_api.reset_mock()
+    issues = sla.collect('org', 'repo', cache)
+    assert [times['number'] for times in issues] == [1, 2]
+    # Only the open issue is fetched again.
+    detail_query = mock_api.call_args_list[-1].args[0][2]
+    assert 'i2: issue(number: 2)' in detail_query
+    assert 'i1:' not in detail_query
+
+
+def test_fetch_issue_details_paginates_timeline():
+    first = _issue(1, timeline=_TIMELINE[1:2])
+    first['timelineItems']['pageInfo'] = {'hasNextPage': True, 'endCursor': 'page-1'}
+    pages = {
+        'page-1': {
+            'pageInfo': {'hasNextPage': True, 'endCursor': 'page-2'},
+            'nodes': [_TIMELINE[0]],
+        },
+        'page-2': {'pageInfo': {'hasNextPage': False, 'endCursor': None}, 'nodes': _TIMELINE[2:]},
+    }
+
+    def respond(query_args):
+        if 'i1:' in query_args[2]:
+            return json.dumps({'data': {'repository': {'i1': first}}})
+        cursor = next(arg for arg in query_args if arg.startswith('cursor=')).split('=', 1)[1]
+        issue = {'timelineItems': pages[cursor]}
+        return json.dumps({'data': {'repository': {'issue': issue}}})
+
+    with mock.patch('charmhub_listing_review.github.api', side_effect=respond) as mock_api:
+        (issue,) = sla.fetch_issue_details('org', 'repo', [1])
+    assert mock_api.call_count == 3
+    assert issue['timelineItems']['nodes'] == [_TIMELINE[1], _TIMELINE[0], *_TIMELINE[2:]]
+    times = sla.issue_times(issue)
+    assert times['assignee'] == 'Alice'
+    assert times['listed_at'] is not None
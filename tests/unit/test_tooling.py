@@ -0,0 +1,193 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the tooling command parsers and plans."""
+
+import shutil
+import subprocess  # noqa: S404
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.result_cache as result_cache
+import charmhub_listing_review.tooling as tooling
+
+TOX_INI = """\
+[tox]
+no_package = True
+env_list = format, lint, py{311,312}-unit
+
+[testenv]
+set_env =
+    PYTHONPATH = {tox_root}/lib:{[vars]src_path}
+commands =
+    pytest {posargs}
+
+[testenv:{format,lint}]
+description = Format or lint the code
+commands =
+    ruff format
+    ruff check
+
+[testenv:integration]
+commands = pytest tests/integration
+"""
+
+MAKEFILE = """\
+# lint: this is a comment, not a target
+SRC := src
+LINT_ARGS ::= --fix
+export PYTHONPATH = lib:src
+
+.PHONY: format lint unit integration
+
+format:
+\truff format $(SRC)
+
+lint: format
+\truff check $(SRC)
+\tpyright
+
+unit integration:
+\tpytest tests/$@
+"""
+
+JUSTFILE = """\
+set shell := ["bash", "-c"]
+export PYTHONPATH := "lib:src"
+# unit: not a recipe
+alias fmt := format
+alias unit := test
+
+[doc('Format the code')]
+format:
+    ruff format
+
+lint: format
+    ruff check
+    pyright
+
+test *args:
+    pytest tests/unit {{args}}
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = result_cache.ResultCache(tmp_path / 'cache')
+    monkeypatch.setattr(result_cache, '_cache', cache)
+    return cache
+
+
+@pytest.mark.parametrize(
+    'name,expected',
+    [
+        ('unit', ['unit']),
+        ('{format,lint}', ['format', 'lint']),
+        ('py{311,312}-{unit, lint}', ['py311-unit', 'py311-lint', 'py312-unit', 'py312-lint']),
+    ],
+)
+def test_expand_generative(name, expected):
+    assert tooling.expand_generative(name) == expected
+
+
+def test_parse_tox():
+    commands = tooling.parse_tox(TOX_INI)
+    # 'unit' is only in generative environments, which tox doesn't run with `-e unit`.
+    assert sorted(commands) == ['format', 'integration', 'lint']
+    assert commands['lint'].argv == ('tox', '-e', 'lint')
+    assert commands['lint'].env == {'PYTHONPATH': '{tox_root}/lib:{[vars]src_path}'}
+    assert commands['lint'].estimated_seconds == (
+        tooling.TOX_SETUP_SECONDS + 2 * tooling.SECONDS_PER_COMMAND
+    )
+
+    commands = tooling.parse_tox(TOX_INI.replace('py{311,312}-unit', 'unit'))
+    assert sorted(commands) == ['format', 'integration', 'lint', 'unit']
+    # The base environment's commands are used when there isn't a section.
+    assert commands['unit'].estimated_seconds == (
+        tooling.TOX_SETUP_SECONDS + tooling.SECONDS_PER_COMMAND
+    )
+
+    assert tooling.parse_tox('not [an ini file') == {}
+
+
+def test_parse_makefile():
+    commands = tooling.parse_makefile(MAKEFILE)
+    assert sorted(commands) == ['format', 'integration', 'lint', 'unit']
+    assert commands['unit'].argv == ('make', 'unit')
+    assert commands['unit'].env == {'PYTHONPATH': 'lib:src'}
+    # The lint target's two lines, and its format prerequisite.
+    assert commands['lint'].estimated_seconds == 3 * tooling.SECONDS_PER_COMMAND
+    assert tooling.parse_makefile('SRC := src\nLINT ::= x\n') == {}
+
+
+def test_parse_justfile():
+    commands = tooling.parse_justfile(JUSTFILE)
+    assert sorted(commands) == ['format', 'lint', 'unit']
+    assert commands['unit'].argv == ('just', 'unit')
+    assert commands['format'].env == {'PYTHONPATH': 'lib:src'}
+    assert commands['lint'].estimated_seconds == 3 * tooling.SECONDS_PER_COMMAND
+
+
+def test_plan(tmp_path):
+    (tmp_path / 'Justfile').write_text(JUSTFILE)
+    (tmp_path / 'tox.ini').write_text(TOX_INI)
+    plan = tooling.plan(tmp_path)
+    assert plan.sources == ('Justfile', 'tox.ini')
+    assert plan.missing == ()
+    # The Justfile is preferred, and tox provides the rest.
+    assert {name: command.source for name, command in plan.commands.items()} == {
+        'format': 'Justfile',
+        'lint': 'Justfile',
+        'unit': 'Justfile',
+        'integration': 'tox.ini',
+    }
+    assert [command.name for command in plan.to_run()] == ['format', 'unit', 'lint']
+
+    with mock.patch.object(tooling, '_build_plan') as build_plan:
+        assert tooling.plan(tmp_path) == plan
+    build_plan.assert_not_called()
+
+    (tmp_path / 'tox.ini').unlink()
+    plan = tooling.plan(tmp_path)
+    assert plan.missing == ('integration',)
+    assert plan.to_run() == []
+
+
+def test_run(tmp_path):
+    command = tooling.PlannedCommand('unit', 'Makefile', ('make', 'unit'), env={'FOO': 'bar'})
+    with mock.patch.object(subprocess, 'run') as run:
+        assert tooling.run(command, tmp_path) is None
+    assert run.call_args.args[0] == ('make', 'unit')
+    assert run.call_args.kwargs['cwd'] == tmp_path / '.'
+    # The tool sets its own variables, so the process's environment is inherited.
+    assert 'env' not in run.call_args.kwargs
+
+    with mock.patch.object(
+        subprocess, 'run', side_effect=subprocess.CalledProcessError(2, 'make')
+    ):
+        assert tooling.run(command, tmp_path) == '`make unit` failed, with exit status 2.'
+    with mock.patch.object(subprocess, 'run', side_effect=FileNotFoundError):
+        assert "isn't installed" in tooling.run(command, tmp_path)
+
+
+@pytest.mark.skipif(shutil.which('make') is None, reason='make is not installed')
+def test_run_with_exported_path(tmp_path):
+    (tmp_path / 'Makefile').write_text(
+        'export PATH := $(HOME)/bin:$(PATH)\n'
+        'format:\n\ttrue\nlint:\n\ttrue\nunit:\n\ttrue\nintegration:\n\ttrue\n'
+    )
+    plan = tooling.plan(tmp_path)
+    assert plan.commands['unit'].env == {'PATH': '$(HOME)/bin:$(PATH)'}
+    assert tooling.run(plan.commands['unit'], tmp_path) is None
@@ -16,18 +16,24 @@
 
 import json
 import pathlib
+import subprocess  # noqa: S404
 from unittest import mock
 
+import pytest
+
+import charmhub_listing_review.github as github
 import charmhub_listing_review.update_issue as update_issue
 
 
+@pytest.fixture(autouse=True)
+def unlimited_github_calls(monkeypatch):
+    monkeypatch.setattr(github, 'bucket', github.TokenBucket(float('inf'), 1))
+
+
 @mock.patch('random.choice')
 @mock.patch('subprocess.run')
-@mock.patch('yaml.safe_load')
-@mock.patch('pathlib.Path.open')
-def test_assign_review_multiple_teams(
-    mock_open, mock_yaml_load, mock_subprocess_run, mock_random_choice
-):
+@mock.patch('charmhub_listing_review.yaml_loader.load_file')
+def test_assign_review_multiple_teams(mock_yaml_load, mock_subprocess_run, mock_random_choice):
     reviewers_yaml = {
         'reviewers': {
             '@alice': {'team': 'team1'},
@@ -36,8 +42,7 @@ def test_assign_review_multiple_teams(
         }
     }
     mock_yaml_load.return_value = reviewers_yaml
-    mock_open.return_value.__enter__.return_value = mock.Mock()
-    mock_subprocess_run.return_value = mock.Mock()
+    mock_subprocess_run.return_value = mock.Mock(stderr='')
     mock_random_choice.return_value = '@bob'
     reviewer = update_issue.assign_review(42, pathlib.Path('reviewers.yaml'))
     assert reviewer == '@bob'
@@ -51,21 +56,22 @@ def test_assign_review_multiple_teams(
             'bob',
         ],
         check=True,
+        text=True,
+        env=mock.ANY,
+        stderr=subprocess.PIPE,
     )
 
 
 @mock.patch('subprocess.run')
-@mock.patch('yaml.safe_load')
-@mock.patch('pathlib.Path.open')
-def test_assign_review_single_team(mock_open, mock_yaml_load, mock_subprocess_run):
+@mock.patch('charmhub_listing_review.yaml_loader.load_file')
+def test_assign_review_single_team(mock_yaml_load, mock_subprocess_run):
     reviewers_yaml = {
         'reviewers': {
             '@alice': {'team': 'team1'},
         }
     }
     mock_yaml_load.return_value = reviewers_yaml
-    mock_open.return_value.__enter__.return_value = mock.Mock()
-    mock_subprocess_run.return_value = mock.Mock()
+    mock_subprocess_run.return_value = mock.Mock(stderr='')
     reviewer = update_issue.assign_review(99, pathlib.Path('reviewers.yaml'))
     assert reviewer == '@alice'
     mock_subprocess_run.assert_called_once_with(
@@ -78,13 +84,96 @@ def test_assign_review_single_team(mock_open, mock_yaml_load, mock_subprocess_ru
             'alice',
         ],
         check=True,
+        text=True,
+        env=mock.ANY,
+        stderr=subprocess.PIPE,
+    )
+
+
+@pytest.fixture
+def reviewers_file(tmp_path):
+    path = tmp_path / 'reviewers.yaml'
+    path.write_text(
+        'reviewers:\n'
+        '    "@alice": {team: team1}\n'
+        '    "@Bob": {team: team2}\n'
+        '    "@carol": {team: team3}\n'
+        '    "@dave": {team: team3}\n'
+        'teams:\n'
+        '    team2: {weight: 2}\n'
+        '    team3: {capacity: 1}\n'
+    )
+    return path
+
+
+@pytest.fixture(autouse=True)
+def clear_open_assignments_cache():
+    update_issue._open_assignments_cache.clear()
+
+
+def _open_issues(*assignees):
+    return json.dumps([
+        {'assignees': [{'login': login} for login in issue]} for issue in assignees
+    ])
+
+
+@mock.patch('subprocess.run')
+def test_assign_review_least_loaded(mock_subprocess_run, reviewers_file):
+    # team1 has 2 open reviews, team2 has 3 (but double weight), team3 is at capacity.
+    mock_subprocess_run.return_value = mock.Mock(
+        stderr='', stdout=_open_issues(['alice'], ['alice'], ['bob'], ['BOB'], ['bob'], ['dave'])
+    )
+    reviewer = update_issue.assign_review(
+        42, reviewers_file, repo='org/repo', strategy='least-loaded'
+    )
+    assert reviewer == '@Bob'
+    list_cmd = mock_subprocess_run.call_args_list[0].args[0]
+    assert list_cmd[:3] == ['gh', 'issue', 'list']
+    assert list_cmd[-2:] == ['--repo', 'org/repo']
+    mock_subprocess_run.assert_called_with(
+        ['gh', 'issue', 'edit', '42', '--add-assignee', 'Bob', '--repo', 'org/repo'],
+        check=True,
+        text=True,
+        env=mock.ANY,
+        stderr=subprocess.PIPE,
+    )
+
+
+@mock.patch('subprocess.run')
+def test_assign_review_least_loaded_picks_least_loaded_member(mock_subprocess_run, reviewers_file):
+    mock_subprocess_run.return_value = mock.Mock(
+        stderr='', stdout=_open_issues(['alice'], ['bob'], ['bob'], ['bob'], ['carol'])
     )
+    reviewer = update_issue.assign_review(
+        42, reviewers_file, dry_run=True, strategy='least-loaded'
+    )
+    # team3 is at capacity with carol's review, so team1 (load 1) beats team2 (load 3/2).
+    assert reviewer == '@alice'
+
+
+@mock.patch('subprocess.run')
+def test_assign_review_least_loaded_caches_for_sweep(mock_subprocess_run, reviewers_file):
+    mock_subprocess_run.return_value = mock.Mock(stderr='', stdout=_open_issues())
+    assigned = [
+        update_issue.assign_review(issue, reviewers_file, strategy='least-loaded')
+        for issue in (1, 2, 3)
+    ]
+    list_calls = [call for call in mock_subprocess_run.call_args_list if call.args[0][2] == 'list']
+    assert len(list_calls) == 1
+    # Each assignment counts towards the next, so the work is spread across teams.
+    teams = {'@alice': 'team1', '@Bob': 'team2', '@carol': 'team3', '@dave': 'team3'}
+    assert len({teams[reviewer] for reviewer in assigned}) == 3
+
+
+def test_assign_review_unknown_strategy(reviewers_file):
+    with pytest.raises(ValueError, match='strategy'):
+        update_issue.assign_review(42, reviewers_file, strategy='round-robin')
 
 
 @mock.patch('subprocess.run')
 def test_assign_to_overrides_automatic_assignment(mock_subprocess_run):
     empty_comments = json.dumps({'comments': []})
-    mock_subprocess_run.return_value = mock.Mock(returncode=0, stdout=empty_comments)
+    mock_subprocess_run.return_value = mock.Mock(stderr='', returncode=0, stdout=empty_comments)
     update_issue.update_gh_issue(
         issue_number=42,
         summary='Review `my-charm` for public listing on Charmhub',
@@ -96,13 +185,16 @@ def test_assign_to_overrides_automatic_assignment(mock_subprocess_run):
     mock_subprocess_run.assert_any_call(
         ['gh', 'issue', 'edit', '42', '--add-assignee', 'tonyandrewmeyer'],
         check=True,
+        text=True,
+        env=mock.ANY,
+        stderr=subprocess.PIPE,
     )
 
 
 @mock.patch('subprocess.run')
 def test_assign_to_strips_at_prefix(mock_subprocess_run):
     empty_comments = json.dumps({'comments': []})
-    mock_subprocess_run.return_value = mock.Mock(returncode=0, stdout=empty_comments)
+    mock_subprocess_run.return_value = mock.Mock(stderr='', returncode=0, stdout=empty_comments)
     update_issue.update_gh_issue(
         issue_number=42,
         summary='Review `my-charm` for public listing on Charmhub',
@@ -113,13 +205,16 @@ def test_assign_to_strips_at_prefix(mock_subprocess_run):
     mock_subprocess_run.assert_any_call(
         ['gh', 'issue', 'edit', '42', '--add-assignee', 'tonyandrewmeyer'],
         check=True,
+        text=True,
+        env=mock.ANY,
+        stderr=subprocess.PIPE,
     )
 
 
 @mock.patch('subprocess.run')
 def test_assign_to_dry_run_does_not_call_gh(mock_subprocess_run):
     empty_comments = json.dumps({'comments': []})
-    mock_subprocess_run.return_value = mock.Mock(returncode=0, stdout=empty_comments)
+    mock_subprocess_run.return_value = mock.Mock(stderr='', returncode=0, stdout=empty_comments)
     update_issue.update_gh_issue(
         issue_number=42,
         summary='Review `my-charm` for public listing on Charmhub',
@@ -163,7 +258,9 @@ https://ci.example.com/integration
 ### Documentation Link
 https://docs.example.com
 """
-    mock_subprocess_run.return_value = mock.Mock(stdout=json.dumps({'body': issue_body}))
+    mock_subprocess_run.return_value = mock.Mock(
+        stderr='', stdout=json.dumps({'body': issue_body})
+    )
     details = update_issue.get_details_from_issue(123)
     assert details['name'] == 'my-charm'
     assert details['demo_url'] == 'https://demo.example.com'
@@ -213,7 +310,9 @@ https://docs.example.com
 ### Review Branch
 26.04
 """
-    mock_subprocess_run.return_value = mock.Mock(stdout=json.dumps({'body': issue_body}))
+    mock_subprocess_run.return_value = mock.Mock(
+        stderr='', stdout=json.dumps({'body': issue_body})
+    )
     details = update_issue.get_details_from_issue(123)
     assert details['default_branch'] == '26.04'
     assert (
@@ -254,12 +353,133 @@ https://ci.example.com/integration
 ### Documentation Link
 https://docs.example.com
 """
-    mock_subprocess_run.return_value = mock.Mock(stdout=json.dumps({'body': issue_body}))
+    mock_subprocess_run.return_value = mock.Mock(
+        stderr='', stdout=json.dumps({'body': issue_body})
+    )
     details = update_issue.get_details_from_issue(123)
     assert details['charm_dir'] == 'charms/my-charm'
 
 
+@mock.patch('charmhub_listing_review.update_issue.get_default_branch', return_value='main')
+@mock.patch('subprocess.run')
+def test_get_details_from_issue_with_commit(mock_subprocess_run, mock_get_default_branch):
+    issue_body = """
+### Charm name
+my-charm
+
+### Project Repository
+https://github.com/canonical/my-charm
+
+### Review Commit
+0123456789abcdef0123456789abcdef01234567
+"""
+    mock_subprocess_run.return_value = mock.Mock(
+        stderr='', stdout=json.dumps({'body': issue_body})
+    )
+    details = update_issue.get_details_from_issue(123)
+    assert details['commit'] == '0123456789abcdef0123456789abcdef01234567'
+    mock_subprocess_run.return_value = mock.Mock(
+        stderr='',
+        stdout=json.dumps({'body': issue_body.replace(details['commit'], '_No response_')}),
+    )
+    assert update_issue.get_details_from_issue(123)['commit'] is None
+    mock_subprocess_run.return_value = mock.Mock(
+        stderr='',
+        stdout=json.dumps({'body': issue_body.replace(details['commit'], f' {"ABCDEF01" * 5}  ')}),
+    )
+    assert update_issue.get_details_from_issue(123)['commit'] == 'abcdef01' * 5
+
+
+@mock.patch('charmhub_listing_review.update_issue.evaluate', return_value=[])
+@mock.patch('charmhub_listing_review.update_issue.resolve_commit', return_value='f' * 40)
+def test_apply_automated_checks_records_commit(mock_resolve_commit, mock_evaluate):
+    issue_data = {
+        'name': 'my-charm',
+        'project_repo': 'https://github.com/canonical/my-charm',
+        'ci_linting': '',
+        'contribution_link': '',
+        'license_link': '',
+        'security_link': '',
+        'default_branch': 'main',
+        'charm_dir': '.',
+        'commit': None,
+    }
+    comment = update_issue.apply_automated_checks(issue_data, 'Intro\n\n<details>\nList')  # type: ignore
+    assert f'Automated checks ran against commit `{"f" * 40}`.\n\n<details>' in comment
+    mock_resolve_commit.assert_called_once_with('https://github.com/canonical/my-charm', 'main')
+    assert mock_evaluate.call_args.kwargs['commit'] == 'f' * 40
+
+
+@mock.patch('charmhub_listing_review.update_issue.resolve_commit', return_value='f' * 40)
+@mock.patch('charmhub_listing_review.update_issue.get_details_from_issue')
+def test_review_commit(mock_get_details, mock_resolve_commit):
+    mock_get_details.return_value = {
+        'project_repo': 'https://github.com/canonical/my-charm',
+        'default_branch': 'main',
+        'commit': None,
+    }
+    assert update_issue.review_commit(123, repo='org/repo') == 'f' * 40
+    mock_get_details.assert_called_once_with(123, repo='org/repo')
+    mock_get_details.return_value['commit'] = 'a' * 40
+    assert update_issue.review_commit(123) == 'a' * 40
+    mock_resolve_commit.assert_called_once()
+
+
+@mock.patch('charmhub_listing_review.update_issue.evaluate')
+@mock.patch('charmhub_listing_review.update_issue.resolve_commit')
+def test_apply_automated_checks_invalid_commit(mock_resolve_commit, mock_evaluate):
+    issue_data = {
+        'name': 'my-charm',
+        'project_repo': 'https://github.com/canonical/my-charm',
+        'default_branch': 'main',
+        'commit': 'abc123',
+    }
+    comment = update_issue.apply_automated_checks(issue_data, 'Intro\n\n<details>\nList')  # type: ignore
+    assert 'review commit `abc123` is not a full commit SHA.\n\n<details>' in comment
+    mock_resolve_commit.assert_not_called()
+    mock_evaluate.assert_not_called()
+
+
+@mock.patch('charmhub_listing_review.update_issue.resolve_commit', return_value='')
+def test_apply_automated_checks_with_details(mock_resolve_commit):
+    issue_data = {
+        'name': 'my-charm',
+        'project_repo': 'https://github.com/canonical/my-charm',
+        'ci_linting': '',
+        'contribution_link': '',
+        'license_link': '',
+        'security_link': '',
+        'default_branch': 'main',
+        'commit': None,
+    }
+    result = '* [x] The charm has a license.\n  * Identified as MIT (100% match).'
+    with mock.patch('charmhub_listing_review.update_issue.evaluate', return_value=[result]):
+        comment = update_issue.apply_automated_checks(
+            issue_data,  # type: ignore
+            '* [ ] The charm has a license.\n* [ ] Another item.',
+        )
+    assert comment == f'{result}\n* [ ] Another item.'
+
+
+def test_add_checklist_section():
+    comment = update_issue.issue_comment('my-charm', '', '', '', '')
+    section = 'The library must:\n* [ ] be documented'
+    updated = update_issue.add_checklist_section(comment, section)
+    assert updated.endswith(f'\n\n{section}\n```\n</details>\n')
+    assert update_issue.add_checklist_section('No list', section) == f'No list\n\n{section}\n'
+
+
 def test_issue_summary():
     name = 'my-charm'
     summary = update_issue.issue_summary(name)
     assert summary == 'Review `my-charm` for public listing on Charmhub'
+
+
+@mock.patch('urllib.request.urlopen')
+def test_best_practices_are_cached(mock_urlopen, monkeypatch):
+    monkeypatch.setattr(update_issue, '_best_practices_cache', None)
+    response = mock_urlopen.return_value.__enter__.return_value
+    response.read.return_value = b'# Heading\n\n- Do the thing.\n'
+    assert update_issue.get_best_practices() == ['- Do the thing.']
+    assert update_issue.get_best_practices() == ['- Do the thing.']
+    mock_urlopen.assert_called_once()
@@ -0,0 +1,153 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the evaluation workspace manager."""
+
+import concurrent.futures
+import errno
+import os
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+import charmhub_listing_review.workspace as workspace
+
+
+def test_release_deletes_in_background(tmp_path):
+    manager = workspace.WorkspaceManager(tmp_path)
+    path = manager.create()
+    assert path.parent == tmp_path
+    (path / 'file.txt').write_text('content')
+    manager.release(path)
+    assert not path.exists()
+    manager.wait()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_collects_abandoned_workspaces(tmp_path):
+    dead = tmp_path / 'ws-999999999-abc'
+    dead.mkdir()
+    trash = tmp_path / 'trash-ws-1-abc'
+    trash.mkdir()
+    stale = tmp_path / f'ws-{os.getpid()}-old'
+    stale.mkdir()
+    old = time.time() - workspace.STALE_AFTER_SECONDS - 60
+    os.utime(stale, (old, old))
+    live = tmp_path / f'ws-{os.getpid()}-new'
+    live.mkdir()
+    unrelated = tmp_path / 'something-else'
+    unrelated.mkdir()
+    manager = workspace.WorkspaceManager(tmp_path)
+    manager.wait()
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([live.name, unrelated.name])
+
+
+def test_quota(tmp_path):
+    manager = workspace.WorkspaceManager(tmp_path, quota=100)
+    path = manager.create(60)
+    assert manager.available() == 40
+    # A workspace can grow into the space that no workspace has reserved.
+    assert manager.budget(path) == 100
+    # Only what is left is reserved, however much is estimated.
+    rest = manager.create(60)
+    assert manager.available() == 0
+    assert manager.budget(rest) == 40
+    with pytest.raises(OSError) as exc_info:
+        manager.create(timeout=0)
+    assert exc_info.value.errno == errno.ENOSPC
+    manager.release(path)
+    # Creating waits for the released workspace to be deleted.
+    path = manager.create(10)
+    assert path.is_dir()
+    assert manager.usage() == 50
+
+
+def test_quota_charges_actual_usage(tmp_path):
+    manager = workspace.WorkspaceManager(tmp_path, quota=100)
+    small = manager.create(60)
+    (small / 'file').write_bytes(b'x' * 5)
+    # Measuring a workspace replaces its estimate, freeing the rest.
+    assert manager.charge(small) == 5
+    assert manager.available() == 95
+    big = manager.create(10)
+    (big / 'sub').mkdir()
+    (big / 'sub' / 'file').write_bytes(b'x' * 200)
+    with pytest.raises(OSError) as exc_info:
+        # Any path in the workspace will do.
+        manager.charge(big / 'sub')
+    assert exc_info.value.errno == errno.ENOSPC
+    assert manager.usage() == 205
+    manager.release(big)
+    manager.wait()
+    assert manager.usage() == 5
+    assert manager.charge(tmp_path.parent) is None
+
+
+def test_quota_concurrent_creates(tmp_path):
+    manager = workspace.WorkspaceManager(tmp_path, quota=100)
+    paths = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(manager.create, 30, timeout=0) for _ in range(8)]
+        for future in futures:
+            try:
+                paths.append(future.result())
+            except OSError as e:
+                assert e.errno == errno.ENOSPC
+    # The free space is shared out, never counted twice.
+    assert len(paths) == 4
+    assert manager.usage() == 100
+    assert manager.available() == 0
+
+
+def test_quota_counts_abandoned_workspaces(tmp_path):
+    dead = tmp_path / 'ws-999999999-abc'
+    dead.mkdir()
+    (dead / 'big').write_bytes(b'x' * 100)
+    deleting = threading.Event()
+    with mock.patch('shutil.rmtree', side_effect=lambda *args, **kwargs: deleting.wait()):
+        manager = workspace.WorkspaceManager(tmp_path, quota=150)
+        # The abandoned workspace takes up space until it has been deleted.
+        assert manager.available() == 50
+        deleting.set()
+        manager.wait()
+    assert manager.available() == 150
+
+
+def test_no_quota(tmp_path):
+    manager = workspace.WorkspaceManager(tmp_path)
+    path = manager.create(10)
+    assert manager.budget(path) is None
+    assert manager.available() is None
+    (path / 'file').write_bytes(b'x' * 5)
+    assert manager.charge(path) == 5
+
+
+def test_manager_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(workspace.WORKSPACE_DIR_ENV, str(tmp_path / 'scratch'))
+    monkeypatch.setenv(workspace.WORKSPACE_QUOTA_ENV, '1000')
+    monkeypatch.setattr(workspace, '_manager', None)
+    manager = workspace.manager()
+    assert manager is workspace.manager()
+    assert manager.base_dir == tmp_path / 'scratch'
+    assert manager.quota == 1000
+
+
+@mock.patch('shutil.rmtree')
+def test_release_outside_base_dir(mock_rmtree, tmp_path):
+    manager = workspace.WorkspaceManager(tmp_path / 'base')
+    manager.release(tmp_path / 'elsewhere')
+    manager.wait()
+    mock_rmtree.assert_called_once_with(tmp_path / 'elsewhere', ignore_errors=True)
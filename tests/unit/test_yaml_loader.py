@@ -0,0 +1,83 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the YAML loader."""
+
+import pathlib
+
+import pytest
+import yaml
+
+import charmhub_listing_review.yaml_loader as yaml_loader
+
+CHARMS_DIR = pathlib.Path(__file__).parent.parent / 'spread' / 'lib' / 'charms'
+
+LOADERS = [yaml.SafeLoader]
+if hasattr(yaml, 'CSafeLoader'):
+    LOADERS.append(yaml.CSafeLoader)
+
+
+def _billion_laughs(levels: int) -> str:
+    lines = ['a0: &a0 [lol, lol, lol, lol, lol, lol, lol, lol, lol]']
+    for i in range(1, levels):
+        previous = ', '.join([f'*a{i - 1}'] * 9)
+        lines.append(f'a{i}: &a{i} [{previous}]')
+    return '\n'.join(lines) + '\n'
+
+
+@pytest.mark.parametrize('loader', LOADERS)
+@pytest.mark.parametrize('path', sorted(CHARMS_DIR.glob('*/charmcraft.yaml')), ids=str)
+def test_load_matches_safe_load(path, loader):
+    content = path.read_text()
+    assert yaml_loader.load(content, loader=loader) == yaml.safe_load(content)
+
+
+@pytest.mark.parametrize('loader', LOADERS)
+def test_load(loader):
+    assert yaml_loader.load('', loader=loader) is None
+    assert yaml_loader.load(b'defaults: &d {a: 1}\nx: *d\n', loader=loader) == {
+        'defaults': {'a': 1},
+        'x': {'a': 1},
+    }
+    with pytest.raises(yaml.constructor.ConstructorError):
+        yaml_loader.load('!!python/object/apply:os.system [true]', loader=loader)
+    with pytest.raises(yaml.YAMLError):
+        yaml_loader.load('a: [', loader=loader)
+
+
+@pytest.mark.parametrize('loader', LOADERS)
+def test_load_limits(loader):
+    with pytest.raises(yaml_loader.YAMLLimitError, match='larger than'):
+        yaml_loader.load('a: ' + 'x' * 100, max_bytes=50, loader=loader)
+    with pytest.raises(yaml_loader.YAMLLimitError, match='expands to more than'):
+        yaml_loader.load(_billion_laughs(9), loader=loader)
+    # A few levels is fine.
+    assert len(yaml_loader.load(_billion_laughs(3), loader=loader)['a2']) == 9
+    # A recursive structure doesn't expand forever.
+    data = yaml_loader.load('a: &a [*a]', loader=loader)
+    assert data['a'][0] is data['a']
+
+
+def test_load_file(tmp_path):
+    path = tmp_path / 'charmcraft.yaml'
+    path.write_bytes(b'name: foo\n' + b'#' * yaml_loader.MAX_YAML_BYTES)
+    with pytest.raises(yaml_loader.YAMLLimitError):
+        yaml_loader.load_file(path)
+    path.write_text('name: foo\n')
+    assert yaml_loader.load_file(path) == {'name': 'foo'}
+
+
+def test_benchmark():
+    timings = yaml_loader.benchmark(sorted(CHARMS_DIR.glob('*/charmcraft.yaml')), repeat=1)
+    assert set(timings) == {loader.__name__ for loader in LOADERS}